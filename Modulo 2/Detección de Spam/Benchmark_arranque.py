@@ -0,0 +1,97 @@
+
+# Benchmark del tiempo de arranque (python -X importtime) del CLI, la interfaz y el servidor
+#
+# Para cada script toma sus imports de nivel superior (con ast, sin ejecutar el script: la
+# interfaz abriría una ventana) y los ejecuta en un proceso nuevo con -X importtime.
+# Reporta el total de importación, los módulos más pesados y si se cargó algún módulo que
+# ese script no debería necesitar (scikit-learn, pandas o nltk). Con --modelo mide además la
+# carga del modelo (.npz con Puntuador, .pkl con EmailSpamClassifier).
+# Como referencia se incluye el camino de entrenamiento (DeteccionDeSpam + scikit-learn).
+#
+# Sale con código 1 si algún script supera su objetivo o importa un módulo prohibido.
+#
+# Uso:
+#   python Benchmark_arranque.py [--repetir 5] [--objetivo-cli-ms 600] [--objetivo-gui-ms 250]
+#                                [--objetivo-servidor-ms 250] [--modelo modelo/modelo_spam.npz]
+
+import argparse, ast, os, subprocess, sys    # CLI, lectura de imports, procesos y salida
+from pathlib import Path                     # Manejo de rutas de archivos
+
+BASE = Path(__file__).resolve().parent
+
+# script → (archivo, módulos que no debe importar al arrancar)
+SCRIPTS = {
+    "cli": ("Clasificar_CSV.py", ("sklearn", "nltk")),              # El CLI sí lee CSV con pandas
+    "gui": ("Interfaz_Grafica.py", ("sklearn", "pandas", "nltk")),
+    "servidor": ("Servidor_Spam.py", ("sklearn", "pandas", "nltk")),
+}
+MARCA = "--- carga del modelo ---"           # Separa en stderr los imports del script de los de la carga
+REFERENCIA = "import DeteccionDeSpam, pandas, sklearn.feature_extraction.text"  # Lo que carga entrenar
+
+def imports_de(archivo: Path) -> str:
+    """Imports de nivel superior del script (los de dentro de funciones se cargan solo al usarse)."""
+    arbol = ast.parse(archivo.read_text(encoding="utf-8"))
+    return "\n".join(ast.unparse(n) for n in arbol.body if isinstance(n, (ast.Import, ast.ImportFrom)))
+
+def medir(codigo: str, modelo: str | None = None) -> tuple[float, list[tuple[str, int, bool]], float | None]:
+    """
+    Ejecuta `codigo` en un proceso nuevo con -X importtime. Devuelve el total de importación
+    (ms), los (módulo, µs acumulados, ¿import directo?) de cada import y la carga del modelo
+    en ms, con los imports que dispare (si se pidió).
+    """
+    if modelo:
+        codigo += (f"\nimport sys as _s, time as _t\n_s.stderr.write({MARCA!r} + '\\n')\n_t0 = _t.perf_counter()\n"
+                   "from Puntuador import cargar_modelo\n"
+                   f"cargar_modelo({modelo!r})\nprint((_t.perf_counter() - _t0) * 1000)")
+    r = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=BASE,
+                       capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"})
+    if r.returncode != 0:
+        raise RuntimeError(r.stderr.strip().splitlines()[-1] if r.stderr.strip() else "falló el proceso")
+    modulos, total_us, cargando = [], 0, False
+    for linea in r.stderr.splitlines():          # "import time: self [us] | cumulative | imported package"
+        cargando = cargando or linea == MARCA     # Lo importado al cargar el modelo cuenta en la carga
+        if not linea.startswith("import time:") or "imported package" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        total_us += 0 if cargando else int(propio)
+        directo = len(nombre) - len(nombre.lstrip()) == 1  # Sin sangría: importado por el propio código
+        modulos.append((nombre.strip(), int(acumulado), directo))
+    carga = float(r.stdout.strip().splitlines()[-1]) if modelo else None
+    return total_us / 1000, modulos, carga
+
+def main():
+    ap = argparse.ArgumentParser(description="Tiempo de importación al arrancar el CLI, la interfaz y el servidor.")
+    ap.add_argument("--repetir", type=int, default=5, help="Procesos por script (se toma el más rápido).")
+    ap.add_argument("--top", type=int, default=5, help="Módulos más pesados que se muestran por script.")
+    ap.add_argument("--objetivo-cli-ms", type=float, default=600.0)
+    ap.add_argument("--objetivo-gui-ms", type=float, default=250.0)
+    ap.add_argument("--objetivo-servidor-ms", type=float, default=250.0)
+    ap.add_argument("--modelo", default=None, help="Modelo a cargar además de los imports (.npz o .pkl).")
+    args = ap.parse_args()
+    modelo = str(Path(args.modelo).resolve()) if args.modelo else None
+
+    casos = {nombre: (imports_de(BASE / archivo), prohibidos, getattr(args, f"objetivo_{nombre}_ms"))
+             for nombre, (archivo, prohibidos) in SCRIPTS.items()}
+    casos["entrenamiento (ref.)"] = (REFERENCIA, (), None)
+
+    fallos = []
+    print(f"{'script':<22}{'imports (ms)':>14}{'objetivo':>10}{'modelo (ms)':>13}  módulos más pesados")
+    for nombre, (codigo, prohibidos, objetivo) in casos.items():
+        total, modulos, carga = min((medir(codigo, modelo) for _ in range(max(1, args.repetir))),
+                                    key=lambda r: r[0])
+        cargados = {m.split(".")[0] for m, _, _ in modulos}
+        directos = sorted(((m, us) for m, us, directo in modulos if directo), key=lambda x: -x[1])
+        pesados = ", ".join(f"{m} {us / 1000:.0f}" for m, us in directos[:args.top])
+        print(f"{nombre:<22}{total:>14.0f}{'' if objetivo is None else f'{objetivo:.0f}':>10}"
+              f"{'' if carga is None else f'{carga:.0f}':>13}  {pesados}")
+        if objetivo is not None and total + (carga or 0) > objetivo:
+            fallos.append(f"{nombre}: {total + (carga or 0):.0f} ms > {objetivo:.0f} ms")
+        fallos += [f"{nombre}: importa {m} al arrancar" for m in prohibidos if m in cargados]
+
+    if fallos:
+        print("\n✘ " + "\n✘ ".join(fallos))
+        sys.exit(1)
+    print("\n✔ Todos los scripts cumplen su objetivo de arranque.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+
+# Benchmark de la caché de campañas (Cache_campanas.py)
+#
+# Genera un flujo de correos con forma de campaña a partir del dataset: cada campaña es un
+# correo base (varios mensajes de la misma etiqueta unidos) que se repite con cambios
+# mínimos (nombre del destinatario, números, parámetros del enlace, usuario del remitente),
+# mezclado con correos únicos. Compara el clasificador solo contra el mismo clasificador
+# detrás de CacheCampanas para varios max_hamming:
+#   - correos/seg, tasa de aciertos (exactos y por similitud)
+#   - discrepancias: correos cuya etiqueta con caché difiere de la del clasificador solo
+#   - discrepancias sobre el dataset original (sin campañas: cada acierto por similitud une
+#     mensajes que el clasificador puntuaría por separado)
+#
+# Uso:
+#   python Benchmark_cache.py [--modelo modelo/modelo_spam.npz] [--campanas 200] [--copias 100]
+#                             [--hamming 0,2,4] [--lote 256]
+
+import argparse, random, time                   # CLI, variantes aleatorias y medición de tiempo
+from pathlib import Path                        # Manejo de rutas de archivos
+import numpy as np                              # Comparación de probabilidades
+import pandas as pd                             # Lectura del dataset
+from Cache_campanas import CacheCampanas
+from Puntuador import cargar_modelo
+
+BASE = Path(__file__).resolve().parent
+NOMBRES = ["Ana", "Luis", "María", "José", "Carmen", "Jorge", "Lucía", "Pedro", "Sofía", "Diego"]
+
+def variante(rng: random.Random, remitente: str, asunto: str, cuerpo: str, url: str) -> tuple[str, str, str]:
+    """Una copia de la campaña: cambia lo que suele personalizar quien envía spam masivo."""
+    usuario, dominio = remitente.split("@", 1)
+    return (f"{usuario}{rng.randrange(1000)}@{dominio}",
+            f"{asunto} #{rng.randrange(100000)}",
+            f"Hola {rng.choice(NOMBRES)}: {cuerpo} Código {rng.randrange(10**6)}. "
+            f"{url}?id={rng.randrange(10**8)}")
+
+def flujo_campanas(df: pd.DataFrame, campanas: int, copias: int, unicos: float, semilla: int):
+    """Correos de campaña y únicos intercalados al azar."""
+    rng = random.Random(semilla)
+    filas = df.to_dict("records")
+    por_etiqueta = {e: [f for f in filas if f["etiqueta"] == e] for e in ("spam", "ham")}
+    correos = []
+    for c in range(campanas):
+        grupo = por_etiqueta["spam" if c % 2 == 0 else "ham"]
+        partes = rng.sample(grupo, k=min(4, len(grupo)))          # Cuerpo base más largo que un mensaje
+        cuerpo = " ".join(str(p["mensaje"]) for p in partes)
+        url = f"https://ofertas{c}.example.com/promo"
+        correos += [variante(rng, partes[0]["remitente"], partes[0]["asunto"], cuerpo, url) for _ in range(copias)]
+    n_unicos = int(len(correos) * unicos)
+    for _ in range(n_unicos):                                     # Correos sin campaña (cuerpos al azar)
+        partes = rng.sample(filas, k=3)
+        correos.append((partes[0]["remitente"], partes[1]["asunto"], " ".join(str(p["mensaje"]) for p in partes)))
+    rng.shuffle(correos)
+    return correos
+
+def puntuar_por_lotes(clf, correos, lote: int) -> tuple[np.ndarray, float]:
+    t0 = time.perf_counter()
+    probs = np.concatenate([clf.prob_spam_lote(correos[i:i + lote]) for i in range(0, len(correos), lote)])
+    return probs, time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="Aciertos, velocidad y discrepancias de la caché de campañas.")
+    ap.add_argument("--modelo", default=str(BASE / "modelo" / "modelo_spam.npz"), help="Modelo .npz o .pkl (se entrena si falta).")
+    ap.add_argument("--csv", default=str(BASE / "datasets" / "spam_ham_dataset2.csv"))
+    ap.add_argument("--campanas", type=int, default=200)
+    ap.add_argument("--copias", type=int, default=100, help="Correos por campaña.")
+    ap.add_argument("--unicos", type=float, default=0.2, help="Correos únicos como fracción de los de campaña.")
+    ap.add_argument("--hamming", default="0,2,4", help="Valores de max_hamming a comparar.")
+    ap.add_argument("--capacidad", type=int, default=50000)
+    ap.add_argument("--lote", type=int, default=256, help="Correos por llamada a prob_spam_lote.")
+    ap.add_argument("--semilla", type=int, default=0)
+    args = ap.parse_args()
+
+    ruta = Path(args.modelo)
+    if not ruta.exists():
+        from Clasificar_CSV import asegurar_modelo
+        asegurar_modelo(ruta, Path(args.csv))
+    clf = cargar_modelo(ruta)
+    df = pd.read_csv(args.csv).fillna("")
+    correos = flujo_campanas(df, args.campanas, args.copias, args.unicos, args.semilla)
+    dataset = list(zip(df["remitente"].astype(str), df["asunto"].astype(str), df["mensaje"].astype(str)))
+
+    base, t_base = puntuar_por_lotes(clf, correos, args.lote)
+    base_dataset = clf.prob_spam_lote(dataset)
+    print(f"{len(correos):,} correos ({args.campanas} campañas × {args.copias} + únicos), lotes de {args.lote}")
+    print(f"{'variante':<16}{'correos/s':>11}{'aceleración':>13}{'aciertos':>10}{'exactos':>9}"
+          f"{'similares':>11}{'discrep.':>10}{'máx |Δp|':>10}{'discrep. dataset':>18}")
+    print(f"{'sin caché':<16}{len(correos) / t_base:>11,.0f}{1.0:>12.1f}x")
+    for h in (int(x) for x in args.hamming.split(",")):
+        cache = CacheCampanas(clf, capacidad=args.capacidad, max_hamming=h)
+        probs, t = puntuar_por_lotes(cache, correos, args.lote)
+        m = cache.metricas()
+        discrepancias = int(((probs > 0.5) != (base > 0.5)).sum())  # Contra el clasificador sin caché
+        control = CacheCampanas(clf, capacidad=args.capacidad, max_hamming=h).prob_spam_lote(dataset)
+        discrep_dataset = int(((control > 0.5) != (base_dataset > 0.5)).sum())
+        print(f"{f'max_hamming={h}':<16}{len(correos) / t:>11,.0f}{t_base / t:>12.1f}x{m['tasa_aciertos']:>10.1%}"
+              f"{m['aciertos_exactos']:>9,}{m['aciertos_similares']:>11,}{discrepancias:>10,}"
+              f"{np.abs(probs - base).max():>10.3f}{discrep_dataset:>18,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+
+# Benchmark de los motores de Bayes de EmailSpamClassifier
+#
+# Compara "tfidf" (original), "multinomial" y "complement" en:
+#   - tiempo de entrenamiento (solo el ajuste del vectorizador + Bayes)
+#   - tamaño del modelo guardado con guardar()
+#   - velocidad de puntuación por lotes (correos/seg)
+#   - exactitud y recall de SPAM sobre una partición de prueba
+#   - reparto de prob_spam en la prueba (percentiles 5/50/95) y log-pérdida: un motor cuyas
+#     probabilidades quedan todas cerca de 0.5 acierta igual pero su "confianza" no informa
+#
+# Uso:
+#   python Benchmark_nb.py [--repetir 20] [--prueba 0.25]
+
+import argparse, os, tempfile, time          # CLI, archivos temporales y medición de tiempo
+from pathlib import Path                     # Manejo de rutas de archivos
+import numpy as np, pandas as pd             # Partición del dataset y métricas
+from DeteccionDeSpam import EmailSpamClassifier  # Clasificador del backend
+
+CSV_DEFAULT = Path(__file__).resolve().parent / "datasets" / "spam_ham_dataset2.csv"
+
+def main():
+    ap = argparse.ArgumentParser(description="Compara los motores de Bayes del clasificador de spam.")
+    ap.add_argument("--csv", default=str(CSV_DEFAULT), help="Dataset con columna 'etiqueta'.")
+    ap.add_argument("--repetir", type=int, default=20, help="Veces que se replica el dataset para medir a mayor escala.")
+    ap.add_argument("--prueba", type=float, default=0.25, help="Fracción del dataset reservada para prueba.")
+    ap.add_argument("--semilla", type=int, default=0)
+    args = ap.parse_args()
+
+    df = pd.read_csv(args.csv)
+    orden = np.random.default_rng(args.semilla).permutation(len(df))  # Partición aleatoria reproducible
+    n_prueba = int(len(df) * args.prueba)
+    prueba = df.iloc[orden[:n_prueba]]
+    entrenamiento = pd.concat([df.iloc[orden[n_prueba:]]] * max(1, args.repetir), ignore_index=True)
+
+    correos = list(zip(prueba["remitente"].astype(str), prueba["asunto"].astype(str), prueba["mensaje"].astype(str)))
+    correos_grandes = correos * max(1, 20000 // max(len(correos), 1))  # Lote grande para medir la puntuación
+    reales = prueba["etiqueta"].astype(str).str.lower().str.strip().to_numpy()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta_csv = Path(tmp) / "entrenamiento.csv"
+        entrenamiento.to_csv(ruta_csv, index=False)
+        print(f"Entrenamiento: {len(entrenamiento):,} filas | Prueba: {len(prueba):,} filas\n")
+        print(f"{'motor':<13}{'ajuste (s)':>12}{'modelo (KB)':>13}{'correos/s':>12}{'exactitud':>11}{'recall spam':>13}"
+              f"{'p5':>8}{'p50':>8}{'p95':>8}{'log-pérdida':>13}")
+
+        for motor in EmailSpamClassifier.MOTORES:
+            clf = EmailSpamClassifier(csv_path=ruta_csv, motor=motor)  # Limpieza + ajuste + evaluación interna
+
+            t0 = time.perf_counter()
+            clf._ajustar()                            # Solo el ajuste: vectorizador + probabilidades
+            t_ajuste = time.perf_counter() - t0
+
+            ruta_modelo = clf.guardar(Path(tmp) / f"{motor}.pkl")
+            kb = os.path.getsize(ruta_modelo) / 1024
+
+            t0 = time.perf_counter()
+            clf.prob_spam_lote(correos_grandes)
+            vel = len(correos_grandes) / (time.perf_counter() - t0)
+
+            probs = clf.prob_spam_lote(correos)
+            pred = np.where(probs > 0.5, "spam", "ham")
+            exactitud = float(np.mean(pred == reales)) if len(reales) else 0.0
+            n_spam = int(np.sum(reales == "spam")) or 1
+            recall = float(np.sum((pred == "spam") & (reales == "spam")) / n_spam)
+            p5, p50, p95 = np.percentile(probs, [5, 50, 95]) if len(probs) else (0.0, 0.0, 0.0)
+            p_real = np.clip(np.where(reales == "spam", probs, 1 - probs), 1e-15, 1.0)  # Prob. de la clase real
+            perdida = float(-np.mean(np.log(p_real))) if len(p_real) else 0.0
+
+            print(f"{motor:<13}{t_ajuste:>12.3f}{kb:>13.1f}{vel:>12,.0f}{exactitud:>11.3f}{recall:>13.3f}"
+                  f"{p5:>8.3f}{p50:>8.3f}{p95:>8.3f}{perdida:>13.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+
+# Benchmark de la normalización de texto (limpiar_texto)
+#
+# Compara la versión anterior (NFKD + ASCII + regex en cada llamada) con Normalizacion.py
+# (camino rápido ASCII + una pasada de str.translate, y limpiar_lote para muchos textos)
+# sobre entradas reales (asuntos, cuerpos, segmentos de dominio y nombres de adjuntos del
+# dataset) y entradas Unicode adversarias, y verifica que den exactamente lo mismo.
+# Con --exhaustivo compara además cada punto de código Unicode (solo y entre letras).
+#
+# Uso:
+#   python Benchmark_normalizacion.py [--csv datasets/spam_ham_dataset2.csv] [--repetir 20] [--exhaustivo]
+
+import argparse, random, re, time, unicodedata   # CLI, datos aleatorios, regex, medición y NFKD
+from pathlib import Path                         # Ruta del dataset por defecto
+import pandas as pd                              # Lectura del dataset
+from Config_regex import extraer_enlaces_y_adjuntos  # Nombres de adjuntos reales
+from Normalizacion import limpiar_texto, limpiar_lote
+
+# Implementación anterior, copiada tal cual para la comparación
+PALABRA_RE = re.compile(r"[a-z0-9]+")
+
+def quitar_acentos_anterior(t: str) -> str:
+    t = unicodedata.normalize('NFKD', t)
+    return t.encode('ascii', 'ignore').decode('utf-8')
+
+def limpiar_anterior(t: str) -> str:
+    t = quitar_acentos_anterior((t or "").lower())
+    return " ".join(PALABRA_RE.findall(t))
+
+def casos_reales(csv: Path, repetir: int) -> dict[str, list[str]]:
+    """Los mismos campos que limpia el clasificador, tomados del dataset (repetidos `repetir` veces)."""
+    df = pd.read_csv(csv).fillna("")
+    dominios = [seg for r in df["remitente"].astype(str) for seg in r.split("@")[-1].replace("-", " ").split(".")]
+    adjuntos = [re.sub(r"\.[a-z0-9]{1,6}$", "", nombre, flags=re.I)
+                for m in df["mensaje"].astype(str) for nombre, _ in extraer_enlaces_y_adjuntos(m)[1]]
+    return {
+        "asuntos": df["asunto"].astype(str).tolist() * repetir,
+        "cuerpos": df["mensaje"].astype(str).tolist() * repetir,
+        "segmentos de dominio": dominios * repetir,
+        "nombres de adjuntos": (adjuntos or ["reporte final"]) * repetir,
+    }
+
+def casos_adversarios(n: int, semilla: int = 0) -> dict[str, list[str]]:
+    """Entradas Unicode difíciles: marcas combinantes, compatibilidad, otros alfabetos, emoji."""
+    rng = random.Random(semilla)
+    zalgo = "".join(chr(0x300 + i % 0x70) for i in range(40))               # Muchas marcas combinantes por letra
+    return {
+        "BMP aleatorio": ["".join(chr(rng.randrange(0x80, 0xD800)) for _ in range(200)) for _ in range(n)],
+        "zalgo": [" ".join(f"spam{zalgo}gratis{zalgo}" for _ in range(10)) for _ in range(n)],
+        "compatibilidad": ["ｆｒｅｅ ﬁnanzas ℌola Ⅻ ¹²³ ㎏ İstanbul ÆØÅ ß ﬀ" * 5 for _ in range(n)],
+        "emoji y CJK": ["¡Gánate 💰💰 hoy! 免费 получите 🎁 prémio " * 5 for _ in range(n)],
+    }
+
+def medir(fn, datos, repeticiones: int = 3) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):                # Se queda con la mejor de varias corridas
+        t0 = time.perf_counter()
+        fn(datos)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+def exhaustivo():
+    """Compara cada punto de código (solo, entre letras y repetido) con la versión anterior."""
+    for cp in range(0x110000):
+        c = chr(cp)
+        for t in (c, "a" + c + "b", "A" + c + c):
+            if limpiar_texto(t) != limpiar_anterior(t):
+                raise AssertionError(f"Resultado distinto para U+{cp:04X}: {t!r}")
+    print("Todos los puntos de código dan el mismo resultado.")
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de limpiar_texto (anterior vs. actual).")
+    ap.add_argument("--csv", default=Path(__file__).resolve().parent / "datasets" / "spam_ham_dataset2.csv")
+    ap.add_argument("--repetir", type=int, default=20, help="Veces que se repiten los textos del dataset.")
+    ap.add_argument("--adversarios", type=int, default=2000, help="Textos por caso adversario.")
+    ap.add_argument("--exhaustivo", action="store_true", help="Comparar también todos los puntos de código.")
+    args = ap.parse_args()
+
+    casos = {**casos_reales(Path(args.csv), args.repetir), **casos_adversarios(args.adversarios)}
+    anterior = lambda datos: [limpiar_anterior(t) for t in datos]
+    actual = lambda datos: [limpiar_texto(t) for t in datos]
+
+    print(f"{'caso':<24}{'textos':>8}{'anterior (ms)':>15}{'actual (ms)':>13}{'lote (ms)':>11}{'aceleración':>13}")
+    for nombre, datos in casos.items():
+        esperado = anterior(datos)
+        if actual(datos) != esperado or limpiar_lote(datos) != esperado:   # Deben coincidir exactamente
+            raise AssertionError(f"Resultados distintos en el caso '{nombre}'")
+        t_ant, t_act, t_lote = medir(anterior, datos), medir(actual, datos), medir(limpiar_lote, datos)
+        print(f"{nombre:<24}{len(datos):>8}{t_ant * 1000:>15.2f}{t_act * 1000:>13.2f}{t_lote * 1000:>11.2f}"
+              f"{t_ant / max(min(t_act, t_lote), 1e-9):>12.1f}x")
+
+    if args.exhaustivo:
+        exhaustivo()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+
+# Benchmark del extractor de enlaces/adjuntos
+#
+# Compara la ADJUNTO_RE anterior (nombre completo con backtracking) contra el
+# recorrido combinado actual (TOKENS_RE + inicio_nombre_adjunto) sobre entradas
+# patológicas y normales, y verifica que ambos devuelvan exactamente lo mismo.
+#
+# Uso:
+#   python Benchmark_regex.py [--max-palabras 16000]
+
+import argparse, re, time                     # CLI, regex y medición de tiempo
+from Config_regex import URL_RE, extraer_enlaces_y_adjuntos  # Implementación actual
+
+# Patrón original, copiado tal cual para la comparación
+ADJUNTO_RE_ANTERIOR = re.compile(
+    r"(?<!\S)"
+    r"(?P<name>(?:[\w\-\(\)\[\]&]+(?:[ \t]+[\w\-\(\)\[\]&]+)*)\."
+    r"(?P<ext>[A-Za-z0-9]{1,6}))"
+    r"(?=$|[\s\)\]\.,;:!?])",
+    re.UNICODE
+)
+
+def extraer_anterior(texto: str):
+    """Extracción previa: URL_RE y ADJUNTO_RE en dos recorridos separados."""
+    adjuntos = []
+    for m in ADJUNTO_RE_ANTERIOR.finditer(texto):
+        nombre = (m.group("name") or "").strip()
+        ext = (m.group("ext") or "").lower().strip()
+        if nombre and ext:
+            adjuntos.append((nombre, ext))
+    return URL_RE.findall(texto), adjuntos
+
+def casos(n: int) -> dict[str, str]:
+    """Entradas de prueba con n palabras."""
+    return {
+        "palabras sin extensión": " ".join(["palabra"] * n),                 # Peor caso del patrón anterior
+        "tabs + punto final": "\t".join(["archivo"] * n) + ". fin",          # El punto llega tarde y sin extensión
+        "extensión demasiado larga": " ".join(["doc"] * n) + ".extensionlarga",
+        "una palabra gigante": "a" * (n * 8),                                # Sin espacios
+        "correo normal": " ".join(
+            ["Hola, revisa", "https://ejemplo.com/factura", "y el reporte final.pdf", "gracias."] * (n // 8 or 1)
+        ),
+    }
+
+def medir(fn, texto: str, repeticiones: int = 3) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):                # Se queda con la mejor de varias corridas
+        t0 = time.perf_counter()
+        fn(texto)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de extracción de enlaces y adjuntos.")
+    ap.add_argument("--max-palabras", type=int, default=16000, help="Tamaño máximo de las entradas patológicas.")
+    args = ap.parse_args()
+
+    tamanos = []
+    n = 1000
+    while n <= args.max_palabras:                # 1000, 2000, 4000, ... para ver el crecimiento
+        tamanos.append(n)
+        n *= 2
+
+    print(f"{'caso':<28}{'palabras':>10}{'anterior (ms)':>16}{'actual (ms)':>14}{'aceleración':>14}")
+    for n in tamanos:
+        for nombre, texto in casos(n).items():
+            if extraer_anterior(texto) != extraer_enlaces_y_adjuntos(texto):  # Deben coincidir exactamente
+                raise AssertionError(f"Resultados distintos en el caso '{nombre}' con {n} palabras")
+            t_ant = medir(extraer_anterior, texto)
+            t_act = medir(extraer_enlaces_y_adjuntos, texto)
+            print(f"{nombre:<28}{n:>10}{t_ant * 1000:>16.2f}{t_act * 1000:>14.2f}{t_ant / max(t_act, 1e-9):>13.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+
+# Caché de campañas: respuestas para correos casi idénticos a otros ya puntuados
+#
+# El spam llega en campañas de miles de copias con cambios mínimos (nombre, número, enlace).
+# CacheCampanas se pone delante del clasificador (EmailSpamClassifier o Puntuador):
+#   1. Copias exactas (mismo remitente, asunto y contenido): se responden sin limpiar nada.
+#   2. Casi idénticos: huella SimHash de 64 bits de las palabras del correo (dominio del
+#      remitente, asunto y contenido, sin números sueltos); si una huella reciente está a
+#      distancia de Hamming <= max_hamming, se reutiliza su probabilidad. La búsqueda es por
+#      bandas: la huella se parte en max_hamming + 1 bandas y dos huellas a esa distancia
+#      comparten al menos una banda completa, así que solo se comparan las de esas cubetas.
+#   3. El resto se enriquece y se puntúa en un solo lote con el clasificador y entra a la caché.
+# La huella sale de las mismas palabras que el texto enriquecido (los enlaces y adjuntos
+# están en el contenido) pero con un solo translate + split: calcularla sobre el texto
+# enriquecido costaría casi lo mismo que puntuar, y un acierto no ahorraría nada.
+# Las dos capas son LRU acotadas (capacidad); correos con menos de min_tokens palabras no
+# se guardan (su huella es poco fiable). Con verificar > 0 se vuelve a puntuar esa fracción
+# de los aciertos por similitud para medir cuántos habrían cambiado de etiqueta.
+#
+# Uso:
+#   clf = CacheCampanas(cargar_modelo("modelo/modelo_spam.npz"), capacidad=50000, max_hamming=2)
+#   clf.prob_spam_lote([(remitente, asunto, contenido), ...]);  clf.metricas()
+
+import random, threading                        # Muestreo de verificación y candado entre hilos
+from collections import OrderedDict             # LRU: orden de uso reciente
+import numpy as np                              # Huellas SimHash por lotes
+from Caracteristicas import dominio_de_email, texto_enriquecido  # Dominio y texto que recibe el vectorizador
+from Normalizacion import TABLA_ASCII           # Signos ASCII → espacio (una pasada)
+
+BITS = 64
+
+def texto_huella(remitente: str, asunto: str, contenido: str) -> str:
+    """Lo que entra a la huella: dominio del remitente (el usuario suele variar), asunto y contenido."""
+    return f"{dominio_de_email(remitente)} {asunto or ''} {contenido or ''}"
+
+def huellas_simhash(textos: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Huella SimHash de 64 bits de cada texto y su número de palabras. Omite los números
+    sueltos (códigos, montos, IDs de rastreo: lo que cambia entre copias de una campaña).
+    Usa hash() de Python: las huellas solo se comparan dentro del proceso.
+    """
+    hashes, largos = [], np.zeros(len(textos), dtype=np.int64)
+    for i, t in enumerate(textos):
+        palabras = [w for w in t.lower().translate(TABLA_ASCII).split() if not w.isdigit()]
+        hashes += map(hash, palabras)
+        largos[i] = len(palabras)
+    if not hashes:
+        return np.zeros(len(textos), dtype=np.uint64), largos
+    H = np.array(hashes, dtype=np.int64).view(np.uint8).reshape(-1, 8)
+    bits = np.unpackbits(H, axis=1)                  # (n_palabras, 64): un bit por columna
+    inicios = np.concatenate(([0], np.cumsum(largos)[:-1]))
+    con_palabras = largos > 0                        # reduceat no admite tramos vacíos
+    unos = np.zeros((len(textos), BITS), dtype=np.int32)
+    unos[con_palabras] = np.add.reduceat(bits, inicios[con_palabras], axis=0, dtype=np.int32)
+    mayoria = (2 * unos > largos[:, None]).astype(np.uint8)  # Bit = 1 si la mayoría de palabras lo tiene
+    return np.packbits(mayoria, axis=1).view(np.uint64).ravel(), largos
+
+
+class CacheCampanas:
+    """Envuelve un clasificador y responde desde caché los correos repetidos o casi repetidos."""
+
+    def __init__(self, clf, capacidad: int = 50000, max_hamming: int = 2, min_tokens: int = 8,
+                 verificar: float = 0.0, semilla: int = 0):
+        if not 0 <= max_hamming < BITS // 4:
+            raise ValueError(f"max_hamming debe estar entre 0 y {BITS // 4 - 1}.")
+        self.clf = clf
+        self.capacidad = max(1, int(capacidad))
+        self.max_hamming = int(max_hamming)
+        self.min_tokens = int(min_tokens)
+        self.verificar = float(verificar)
+        self._rng = random.Random(semilla)
+        self._lock = threading.Lock()                # El servidor y la interfaz puntúan desde otros hilos
+
+        # Bandas: (desplazamiento, máscara); max_hamming + 1 bandas de ~64 / (max_hamming + 1) bits
+        n = self.max_hamming + 1
+        cortes = [BITS * i // n for i in range(n + 1)]
+        self._bandas = [(a, (1 << (b - a)) - 1) for a, b in zip(cortes, cortes[1:])]
+
+        self._exactos: OrderedDict = OrderedDict()   # hash(remitente, asunto, contenido) → probabilidad
+        self._huellas: OrderedDict = OrderedDict()   # huella → probabilidad (None mientras se puntúa)
+        self._indice = [dict() for _ in self._bandas]  # Por banda: valor de la banda → huellas
+
+        self.consultas = self.aciertos_exactos = self.aciertos_similares = 0
+        self.no_cacheables = self.desalojos = 0
+        self.verificados = self.discrepancias = 0
+
+    def __getattr__(self, nombre):                   # El resto de la interfaz es la del clasificador
+        return getattr(self.clf, nombre)
+
+    # ============ ÍNDICE POR BANDAS ============
+
+    def _buscar(self, h: int):
+        """Huella guardada más cercana a h con distancia <= max_hamming (o None)."""
+        if h in self._huellas:                       # Lo más común en una campaña: la misma huella
+            return h
+        mejor, dist = None, self.max_hamming + 1
+        for indice, (desp, mascara) in zip(self._indice, self._bandas):
+            for otra in indice.get((h >> desp) & mascara, ()):
+                d = (h ^ otra).bit_count()
+                if d < dist:
+                    mejor, dist = otra, d
+        return mejor
+
+    def _agregar_huella(self, h: int, prob):
+        self._huellas[h] = prob
+        for indice, (desp, mascara) in zip(self._indice, self._bandas):
+            indice.setdefault((h >> desp) & mascara, set()).add(h)
+        if len(self._huellas) > self.capacidad:      # Desaloja la menos usada recientemente
+            self._quitar_huella(next(iter(self._huellas)))
+            self.desalojos += 1
+
+    def _quitar_huella(self, h: int):
+        del self._huellas[h]
+        for indice, (desp, mascara) in zip(self._indice, self._bandas):
+            cubeta = indice[(h >> desp) & mascara]
+            cubeta.discard(h)
+            if not cubeta:
+                del indice[(h >> desp) & mascara]
+
+    def _agregar_exacto(self, clave: int, prob: float):
+        self._exactos[clave] = prob
+        if len(self._exactos) > self.capacidad:
+            self._exactos.popitem(last=False)
+
+    # ============ PUNTUACIÓN ============
+
+    def _puntuar(self, correos: list[tuple[str, str, str]], enriquecer) -> np.ndarray:
+        """
+        Probabilidad de SPAM de cada correo usando y llenando la caché de huellas;
+        enriquecer(i) da el texto enriquecido del correo i (solo se pide para los que se puntúan).
+        """
+        probs = np.empty(len(correos))
+        huellas, largos = huellas_simhash([texto_huella(*c) for c in correos])
+        pendientes: dict[int, list[int]] = {}       # Huella nueva → posiciones que esperan su resultado
+        a_puntuar, verificar = [], []               # Índices que van al clasificador
+        for i, (h, largo) in enumerate(zip(huellas.tolist(), largos.tolist())):
+            if largo < self.min_tokens:
+                self.no_cacheables += 1
+                a_puntuar.append(i)
+                continue
+            cercana = self._buscar(h)
+            if cercana is None:                      # Primera de su campaña: se puntúa y se indexa
+                pendientes.setdefault(h, []).append(i)  # (ya estaba si el lote desalojó su huella)
+                self._agregar_huella(h, None)
+                a_puntuar.append(i)
+            elif cercana in pendientes:              # Casi igual a otra de este mismo lote
+                pendientes[cercana].append(i)
+                self.aciertos_similares += 1
+            else:
+                self._huellas.move_to_end(cercana)
+                probs[i] = self._huellas[cercana]
+                self.aciertos_similares += 1
+                if self.verificar and self._rng.random() < self.verificar:
+                    verificar.append(i)
+
+        puntuar = a_puntuar + verificar
+        if puntuar:
+            try:
+                ls, lh = self.clf._log_post_lote([enriquecer(i) for i in puntuar])
+            except BaseException:                    # Sin resultado: las huellas nuevas no quedan a medias
+                for h in pendientes:
+                    if h in self._huellas:
+                        self._quitar_huella(h)
+                raise
+            calculadas = 1.0 / (1.0 + np.exp(lh - ls))
+            probs[a_puntuar] = calculadas[:len(a_puntuar)]
+            for i, p in zip(verificar, calculadas[len(a_puntuar):]):
+                self.verificados += 1
+                self.discrepancias += int((p > 0.5) != (probs[i] > 0.5))
+        for h, posiciones in pendientes.items():
+            probs[posiciones] = probs[posiciones[0]]  # Las casi iguales del lote reciben la misma respuesta
+            if h in self._huellas:                   # Pudo desalojarse si el lote supera la capacidad
+                self._huellas[h] = float(probs[posiciones[0]])
+        return probs
+
+    def prob_spam_lote(self, correos: list[tuple[str, str, str]]) -> np.ndarray:
+        """Igual que prob_spam_lote del clasificador, respondiendo desde caché lo repetido."""
+        probs = np.empty(len(correos))
+        with self._lock:
+            self.consultas += len(correos)
+            faltan, claves = [], []
+            for i, correo in enumerate(correos):
+                clave = hash(tuple(correo))
+                p = self._exactos.get(clave)
+                if p is not None:                    # Copia exacta: ni siquiera se limpia el texto
+                    self._exactos.move_to_end(clave)
+                    probs[i] = p
+                    self.aciertos_exactos += 1
+                else:
+                    faltan.append(i)
+                    claves.append(clave)
+            if faltan:
+                resto = [correos[i] for i in faltan]
+                calculadas = self._puntuar(resto, lambda j: texto_enriquecido(*resto[j], None, None))
+                probs[faltan] = calculadas
+                for clave, p in zip(claves, calculadas.tolist()):
+                    self._agregar_exacto(clave, p)
+        return probs
+
+    def analizar_correo_ext(self, remitente: str, asunto: str, contenido: str,
+                            enlaces: list[str] | None = None,
+                            adjuntos: list[tuple[str,str]] | None = None,
+                            palabras: str | None = None) -> tuple[str, float]:
+        """Etiqueta y probabilidad de SPAM; si hay que puntuar, usa lo ya extraído por la UI."""
+        with self._lock:
+            self.consultas += 1
+            p = float(self._puntuar([(remitente, asunto, contenido)], lambda _: texto_enriquecido(
+                remitente, asunto, contenido, enlaces, adjuntos, palabras))[0])
+        return ("spam" if p > 0.5 else "ham"), p
+
+    def prob_spam_correo(self, remitente: str, asunto: str, contenido: str) -> float:
+        return float(self.prob_spam_lote([(remitente, asunto, contenido)])[0])
+
+    def clasificar_correo(self, remitente: str, asunto: str, contenido: str) -> str:
+        return "spam" if self.prob_spam_correo(remitente, asunto, contenido) > 0.5 else "ham"
+
+    # ============ MÉTRICAS ============
+
+    def metricas(self) -> dict:
+        with self._lock:
+            aciertos = self.aciertos_exactos + self.aciertos_similares
+            return {
+                "consultas": self.consultas,
+                "aciertos_exactos": self.aciertos_exactos,
+                "aciertos_similares": self.aciertos_similares,
+                "tasa_aciertos": aciertos / self.consultas if self.consultas else 0.0,
+                "no_cacheables": self.no_cacheables,
+                "huellas": len(self._huellas),
+                "exactos": len(self._exactos),
+                "desalojos": self.desalojos,
+                "verificados": self.verificados,
+                "discrepancias": self.discrepancias,
+                "tasa_discrepancias": self.discrepancias / self.verificados if self.verificados else 0.0,
+            }
@@ -0,0 +1,121 @@
+
+# Extracción de características de un correo (remitente, asunto, contenido, enlaces, adjuntos)
+#
+# Solo usa la biblioteca estándar, Config_regex y Normalizacion: la interfaz gráfica y el
+# puntuador ligero (Puntuador.py) la importan sin cargar pandas, scikit-learn ni el
+# clasificador completo. DeteccionDeSpam.py reexporta todas estas funciones.
+
+import re                                          # Regex de dominios de URL y extensiones
+from Config_regex import URL_RE, EXT_PELIGROSAS, extraer_enlaces_y_adjuntos  # Expresiones y auxiliares
+from Normalizacion import limpiar_texto            # Minúsculas, sin acentos, palabras [a-z0-9]+
+
+# ------------------- FUNCIONES DE EXTRACCIÓN -------------------
+
+def dominio_de_email(remitente: str) -> str:       # Extrae el dominio del correo (después del @)
+    r = (remitente or "").strip().lower()          # Limpia y pone en minúsculas el remitente
+    if "@" in r:                                   # Verifica que contenga "@"
+        return r.split("@", 1)[-1]                 # Retorna el dominio (parte después del @)
+    return ""                                      # Si no, retorna cadena vacía
+
+def tokens_dominio(dom: str) -> list[str]:         # Convierte dominio en tokens útiles
+    if not dom:                                    # Si está vacío, devuelve lista vacía
+        return []                                  
+    dom = dom.replace("-", " ")                    # Reemplaza guiones por espacios
+    partes = dom.split(".")                        # Separa dominio por puntos
+    toks = []                                      # Inicializa lista de tokens
+    if len(partes) >= 1:                           # Si hay al menos un segmento
+        toks.append(f"from_dom_{limpiar_texto(partes[-2] if len(partes)>=2 else partes[0])}")  # Token dominio
+    if len(partes) >= 2:                           # Si hay TLD
+        toks.append(f"from_tld_{limpiar_texto(partes[-1])}")   # Token del TLD (.com, .org)
+    if len(partes) >= 3:                           # Si hay subdominio
+        toks.append(f"from_sub_{limpiar_texto(partes[0])}")    # Token subdominio
+    return toks                                    # Retorna la lista de tokens
+
+def extraer_enlaces(texto: str) -> list[str]:      # Extrae URLs del texto
+    return URL_RE.findall(texto or "")             # Aplica expresión regular definida en Config_regex
+
+def tokenizar(texto: str) -> tuple[str, list[str], list[tuple[str,str]]]:  # Palabras, enlaces y adjuntos juntos
+    """
+    Devuelve (palabras_limpias, enlaces, adjuntos) de un texto.
+    Enlaces y adjuntos salen de un único recorrido con TOKENS_RE; las palabras
+    son exactamente las de limpiar_texto(texto).
+    """
+    enlaces, adjuntos = extraer_enlaces_y_adjuntos(texto)  # Un solo recorrido para URLs y adjuntos
+    return limpiar_texto(texto), enlaces, adjuntos
+
+def tokens_enlace(url: str) -> list[str]:          # Convierte una URL en tokens
+    toks = ["has_url"]                             # Token que indica presencia de URL
+    try:                                           # Control de errores
+        m = re.search(r"https?://([^/\s:]+)", url, re.I)  # Busca el dominio dentro de la URL
+        if not m:                                  # Si no encuentra, retorna token base
+            return toks
+        host = m.group(1).lower()                  # Obtiene dominio principal
+        host = host.replace("www.", "")            # Elimina "www."
+        partes = host.split(".")                   # Separa por puntos
+        if len(partes) >= 1:                       # Token de dominio
+            toks.append(f"url_dom_{limpiar_texto(partes[-2] if len(partes)>=2 else partes[0])}")
+        if len(partes) >= 2:                       # Token de TLD
+            toks.append(f"url_tld_{limpiar_texto(partes[-1])}")
+        if len(partes) >= 3:                       # Token de subdominio
+            toks.append(f"url_sub_{limpiar_texto(partes[0])}")
+    except Exception:                              # Si ocurre error, ignora
+        pass
+    return toks                                    # Devuelve lista de tokens
+
+def extraer_adjuntos(texto: str) -> list[tuple[str,str]]:  # Extrae nombres y extensiones de adjuntos
+    return extraer_enlaces_y_adjuntos(texto)[1]    # Reutiliza el recorrido combinado (sin backtracking cuadrático)
+
+def tokens_adjuntos(adjuntos: list[tuple[str,str]]) -> list[str]:  # Convierte adjuntos a tokens
+    toks = []                                      # Lista vacía
+    if adjuntos:                                   # Si hay adjuntos
+        toks.append("has_attachment")              # Marca que hay adjuntos
+    for nombre, ext in adjuntos:                   # Recorre cada adjunto
+        toks.append(f"att_ext_{ext}")              # Token con la extensión
+        if ext in EXT_PELIGROSAS:                  # Si la extensión es peligrosa
+            toks.append("att_ext_dangerous")       # Añade token de peligro
+        base = limpiar_texto(re.sub(r"\.[a-z0-9]{1,6}$", "", nombre, flags=re.I))  # Limpia nombre base
+        if base:                                   # Si hay texto
+            for w in base.split():                 # Divide en palabras
+                if len(w) >= 3:                    # Evita palabras cortas
+                    toks.append(f"att_name_{w}")   # Añade token con nombre del adjunto
+    return toks                                    # Retorna lista final
+
+# ------------------- TEXTO ENRIQUECIDO -------------------
+
+def texto_enriquecido(remitente: str, asunto: str, contenido: str,
+                      enlaces: list[str] | None, adjuntos: list[tuple[str,str]] | None,
+                      palabras: str | None = None) -> str:
+    """Texto que recibe el vectorizador: asunto y contenido limpios + tokens de dominio, enlaces y adjuntos."""
+    parts: list[str] = []                        # Lista donde se irán acumulando las partes del texto enriquecido
+
+    # Lo que no venga ya extraído se obtiene del contenido en una sola pasada
+    if palabras is None or adjuntos is None:
+        t_palabras, t_enlaces, t_adjuntos = tokenizar(contenido)
+        palabras = t_palabras if palabras is None else palabras
+        enlaces = enlaces or t_enlaces           # Igual que antes: si no se pasan enlaces, se usan los del cuerpo
+        adjuntos = t_adjuntos if adjuntos is None else adjuntos
+    elif not enlaces:                            # Palabras y adjuntos ya vienen: solo faltan los enlaces
+        enlaces = extraer_enlaces(contenido)
+
+    # Texto base (limpio)
+    parts.append(limpiar_texto(asunto))          # Limpia y añade el asunto
+    parts.append(palabras)                       # Añade el contenido del mensaje ya limpio
+
+    # Dominio remitente → tokens
+    dom = dominio_de_email(remitente)            # Obtiene el dominio del remitente
+    parts += tokens_dominio(dom)                 # Genera tokens del dominio y los agrega a la lista
+
+    # Enlaces → tokens
+    for u in enlaces:                            # Recorre cada enlace (explícito o encontrado en el cuerpo)
+        parts += tokens_enlace(u)                # Extrae tokens del enlace
+
+    # Adjuntos → tokens
+    adj_tokens = tokens_adjuntos(adjuntos)       # Convierte los adjuntos a tokens
+    parts += adj_tokens                          # Agrega los tokens de adjuntos a la lista
+
+    # Refuerzo para tokens peligrosos: Aumentar el peso (importancia)
+    if "att_ext_dangerous" in adj_tokens:        # Si hay un adjunto con extensión peligrosa
+        parts += ["att_ext_dangerous"] * 5       # Repite el token varias veces para aumentar su peso TF-IDF
+
+    # Unir todo
+    return " ".join([p for p in parts if p])     # Une todos los tokens en una sola cadena separada por espacios
@@ -0,0 +1,141 @@
+
+# Clasificación masiva de correos desde un CSV usando varios procesos
+#
+# Uso:
+#   python Clasificar_CSV.py entrada.csv salida.csv [--modelo modelo/modelo_spam.npz]
+#                            [--chunksize 50000] [--procesos N] [--cache 50000]
+#
+# El CSV se lee por bloques con pd.read_csv(chunksize=...). Cada bloque se envía a
+# un pool de procesos; cada proceso carga el modelo persistido una sola vez (en su
+# initializer) y puntúa su bloque con prob_spam_lote. Con un modelo .npz (por defecto) se
+# usa Puntuador (solo NumPy): ni el proceso principal ni los trabajadores importan
+# scikit-learn; un .pkl se sigue cargando con EmailSpamClassifier. Con --cache N cada
+# trabajador responde los correos repetidos o casi idénticos desde su CacheCampanas.
+# La salida conserva el orden original y agrega las columnas 'prediccion' y 'prob_spam'.
+
+import argparse, os, sys, time               # CLI, sistema, salida de progreso y medición de tiempo
+from collections import deque                 # Bloques en vuelo, en orden de lectura
+from concurrent.futures import ProcessPoolExecutor  # Pool de procesos (uno por núcleo)
+from pathlib import Path                      # Manejo de rutas de archivos
+import pandas as pd                           # Lectura/escritura del CSV por bloques
+from Puntuador import cargar_modelo, modelo_desactualizado  # .npz → Puntuador (NumPy); .pkl → EmailSpamClassifier
+from Cache_campanas import CacheCampanas       # Caché de correos casi idénticos (opcional)
+
+BASE = Path(__file__).resolve().parent        # Carpeta de este script
+MODELO_DEFAULT = BASE / "modelo" / "modelo_spam.npz"  # Modelo exportado por defecto
+CSV_ENTRENAMIENTO = BASE / "datasets" / "spam_ham_dataset2.csv"  # Dataset para entrenar si falta el modelo
+
+_clf = None                                   # Modelo cargado en cada proceso trabajador
+
+def _iniciar_trabajador(ruta_modelo: str, cache: int = 0, cache_hamming: int = 2):
+    """Se ejecuta una vez por proceso: carga el modelo persistido (y su caché de campañas)."""
+    global _clf
+    _clf = cargar_modelo(ruta_modelo)
+    if cache > 0:
+        _clf = CacheCampanas(_clf, capacidad=cache, max_hamming=cache_hamming)
+
+def _puntuar_bloque(remitentes: list[str], asuntos: list[str], contenidos: list[str]):
+    """
+    Puntúa un bloque completo en una sola pasada vectorizada; devuelve las probabilidades de
+    SPAM y, con caché, (pid, métricas acumuladas del trabajador).
+    """
+    probs = _clf.prob_spam_lote(list(zip(remitentes, asuntos, contenidos)))
+    return probs, ((os.getpid(), _clf.metricas()) if isinstance(_clf, CacheCampanas) else None)
+
+def asegurar_modelo(ruta_modelo: Path, csv_entrenamiento: Path) -> Path:
+    """
+    Si el modelo no existe todavía o el dataset es más nuevo que él, lo entrena con el
+    dataset y lo guarda (.npz exportado o .pkl).
+    """
+    if modelo_desactualizado(ruta_modelo, csv_entrenamiento):
+        motivo = "desactualizado" if ruta_modelo.exists() else "no encontrado"
+        print(f"Modelo {motivo}; entrenando con {csv_entrenamiento}…", file=sys.stderr)
+        from DeteccionDeSpam import EmailSpamClassifier  # scikit-learn solo si hay que entrenar
+        clf = EmailSpamClassifier(csv_path=csv_entrenamiento)
+        if ruta_modelo.suffix == ".npz":
+            clf.exportar(ruta_modelo)                  # Solo arreglos: los trabajadores no importan scikit-learn
+        else:
+            clf.guardar(ruta_modelo)
+    return ruta_modelo
+
+def _columna(df: pd.DataFrame, nombre: str) -> list[str]:
+    return df[nombre].tolist() if nombre in df.columns else [""] * len(df)  # Columna faltante → vacía
+
+def clasificar_csv(entrada, salida, ruta_modelo, chunksize: int = 50000, procesos: int | None = None,
+                   col_remitente: str = "remitente", col_asunto: str = "asunto", col_contenido: str = "mensaje",
+                   cache: int = 0, cache_hamming: int = 2):
+    """
+    Puntúa todo el CSV `entrada` y escribe `salida` con las columnas originales
+    más 'prediccion' y 'prob_spam', en el mismo orden que la entrada.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    max_en_vuelo = 2 * procesos                       # Limita la memoria: pocos bloques pendientes a la vez
+    try:
+        lector = pd.read_csv(entrada, chunksize=chunksize, dtype=str, keep_default_na=False)  # Vacíos → ""
+    except pd.errors.EmptyDataError:                  # Archivo vacío (0 bytes): ni siquiera tiene encabezado
+        pd.DataFrame(columns=["prediccion", "prob_spam"]).to_csv(salida, index=False)
+        print(f"⚠ {entrada} está vacío (sin encabezado): {salida} solo tiene las columnas de la predicción.", file=sys.stderr)
+        return 0
+
+    filas, t0, primero = 0, time.perf_counter(), True
+    pendientes: deque = deque()                       # (bloque, future) en orden de lectura
+    metricas_cache: dict = {}                         # pid → últimas métricas de la caché de ese trabajador
+
+    def escribir_siguiente():
+        nonlocal filas, primero
+        bloque, fut = pendientes.popleft()            # El más antiguo: así la salida respeta el orden
+        probs, metricas = fut.result()
+        if metricas:
+            metricas_cache[metricas[0]] = metricas[1]
+        bloque["prediccion"] = ["spam" if p > 0.5 else "ham" for p in probs]  # Misma regla que ls > lh
+        bloque["prob_spam"] = probs
+        bloque.to_csv(salida, mode="w" if primero else "a", header=primero, index=False)
+        primero = False
+        filas += len(bloque)
+        dt = max(time.perf_counter() - t0, 1e-9)
+        print(f"\r{filas:,} filas | {filas / dt:,.0f} filas/s", end="", file=sys.stderr, flush=True)
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                             initargs=(str(ruta_modelo), cache, cache_hamming)) as pool:
+        for bloque in lector:
+            fut = pool.submit(_puntuar_bloque, _columna(bloque, col_remitente),
+                              _columna(bloque, col_asunto), _columna(bloque, col_contenido))
+            pendientes.append((bloque, fut))
+            if len(pendientes) >= max_en_vuelo:      # Escribe antes de leer más
+                escribir_siguiente()
+        while pendientes:                              # Vacía lo que queda
+            escribir_siguiente()
+
+    if primero:                                        # CSV sin filas: escribe solo el encabezado
+        pd.read_csv(entrada, nrows=0).assign(prediccion=[], prob_spam=[]).to_csv(salida, index=False)
+    dt = max(time.perf_counter() - t0, 1e-9)
+    print(f"\n✔ {filas:,} filas en {dt:.1f} s ({filas / dt:,.0f} filas/s) → {salida}", file=sys.stderr)
+    if metricas_cache:                                 # Suma de los trabajadores
+        total = {k: sum(m[k] for m in metricas_cache.values())
+                 for k in ("consultas", "aciertos_exactos", "aciertos_similares")}
+        aciertos = total["aciertos_exactos"] + total["aciertos_similares"]
+        print(f"  caché: {aciertos:,} aciertos de {total['consultas']:,} ({aciertos / max(total['consultas'], 1):.1%}; "
+              f"{total['aciertos_exactos']:,} exactos, {total['aciertos_similares']:,} por similitud)", file=sys.stderr)
+    return filas
+
+def main():
+    ap = argparse.ArgumentParser(description="Clasifica en paralelo todos los correos de un CSV.")
+    ap.add_argument("entrada", help="CSV con columnas remitente, asunto y mensaje.")
+    ap.add_argument("salida", help="CSV de salida (columnas originales + prediccion + prob_spam).")
+    ap.add_argument("--modelo", default=str(MODELO_DEFAULT), help="Modelo exportado (.npz) o persistido (.pkl); se entrena si no existe.")
+    ap.add_argument("--csv-entrenamiento", default=str(CSV_ENTRENAMIENTO), help="Dataset para entrenar si falta el modelo.")
+    ap.add_argument("--chunksize", type=int, default=50000, help="Filas por bloque.")
+    ap.add_argument("--procesos", type=int, default=None, help="Procesos trabajadores (por defecto, núcleos disponibles).")
+    ap.add_argument("--col-remitente", default="remitente")
+    ap.add_argument("--col-asunto", default="asunto")
+    ap.add_argument("--col-contenido", default="mensaje")
+    ap.add_argument("--cache", type=int, default=0, help="Capacidad de la caché de campañas por trabajador (0 = sin caché).")
+    ap.add_argument("--cache-hamming", type=int, default=2, help="Distancia de Hamming máxima entre huellas para reutilizar un resultado.")
+    args = ap.parse_args()
+
+    ruta_modelo = asegurar_modelo(Path(args.modelo), Path(args.csv_entrenamiento))
+    clasificar_csv(args.entrada, args.salida, ruta_modelo, args.chunksize, args.procesos,
+                   args.col_remitente, args.col_asunto, args.col_contenido, args.cache, args.cache_hamming)
+
+if __name__ == "__main__":
+    main()
@@ -4,19 +4,71 @@
 import re  # Importa el módulo estándar para trabajar con expresiones regulares en Python
 
 # --- Detecta URLs (enlaces) ---
+_URL = r"https?://[^\s]+"  # Cadenas que empiecen con http:// o https:// seguidas de cualquier carácter no espacio
 URL_RE = re.compile(
-    r"(https?://[^\s]+)",  # Busca cadenas que empiecen con http:// o https:// seguidas de cualquier carácter no espacio
+    r"(" + _URL + r")",  # Captura la URL completa
     re.IGNORECASE          # Ignora mayúsculas/minúsculas al comparar (por ejemplo, HTTP o http)
 )
 
 # --- Detecta nombres de archivos adjuntos en texto ---
-ADJUNTO_RE = re.compile(
-    r"(?<!\S)"  # Asegura que antes no haya un carácter no-espacio (inicio de palabra o después de un espacio)
-    r"(?P<name>(?:[\w\-\(\)\[\]&]+(?:[ \t]+[\w\-\(\)\[\]&]+)*)\."  # Captura el nombre del archivo antes del punto
-    r"(?P<ext>[A-Za-z0-9]{1,6}))"  # Captura la extensión (1 a 6 letras/números)
-    r"(?=$|[\s\)\]\.,;:!?])",  # Asegura que después venga un espacio, puntuación o final del texto
-    re.UNICODE  # Soporta caracteres Unicode en los nombres
+# Cada coincidencia es solo la ÚLTIMA palabra del nombre (la que va pegada a ".ext").
+# Las palabras anteriores del nombre (separadas por espacios o tabs) se recuperan
+# hacia atrás con inicio_nombre_adjunto(). La versión anterior intentaba el nombre
+# completo desde cada palabra de la línea, lo que en secuencias largas de palabras
+# sin extensión producía backtracking cuadrático.
+_CHAR_NOMBRE = r"[\w\-\(\)\[\]&]"  # Caracteres válidos dentro del nombre de un archivo
+_ADJUNTO = (
+    r"(?<!" + _CHAR_NOMBRE + r")"  # Empieza al inicio de una palabra (un solo intento por palabra)
+    r"(?P<base>" + _CHAR_NOMBRE + r"+)"  # Última palabra del nombre, justo antes del punto
+    r"(?=\.(?P<ext>[A-Za-z0-9]{1,6})"  # Punto y extensión (1 a 6 letras/números), sin consumirlos
+    r"(?:$|[\s\)\]\.,;:!?]))"  # Después viene un espacio, puntuación o final del texto
 )
+ADJUNTO_RE = re.compile(_ADJUNTO, re.UNICODE)  # Soporta caracteres Unicode en los nombres
+
+# --- Enlaces y adjuntos en una sola pasada ---
+# Sin IGNORECASE global: con él, [A-Za-z0-9] también acepta 'ſ' (U+017F) y 'K' (U+212A)
+# en la extensión y dejaría de coincidir con ADJUNTO_RE. Solo el esquema de la URL lo ignora.
+TOKENS_RE = re.compile(
+    r"(?P<url>(?i:https?://)[^\s]+)|" + _ADJUNTO,  # Alterna: primero URL, si no, candidato a adjunto
+    re.UNICODE
+)
+
+def _es_char_nombre(c: str) -> bool:
+    """Equivalente a _CHAR_NOMBRE para un solo carácter (\\w de re es str.isalnum() más '_')."""
+    return c.isalnum() or c in "_-()[]&"
+
+def inicio_nombre_adjunto(texto: str, i: int) -> int | None:
+    """
+    Dado el inicio `i` de la última palabra de un adjunto, retrocede sobre las palabras
+    previas unidas por espacios/tabs y devuelve dónde empieza el nombre completo.
+    El nombre debe empezar al inicio del texto o después de un espacio en blanco;
+    si ni siquiera la última palabra cumple esto, devuelve None.
+    """
+    inicio = None
+    while True:
+        if i > 0 and not texto[i - 1].isspace():   # Antes hay un carácter no-espacio: aquí no puede empezar
+            return inicio
+        inicio = i                                 # Candidato válido más a la izquierda hasta ahora
+        k = i
+        while k > 0 and texto[k - 1] in " \t":      # Salta los espacios/tabs que separan palabras
+            k -= 1
+        if k == i or k == 0 or not _es_char_nombre(texto[k - 1]):  # No hay palabra previa en la misma secuencia
+            return inicio
+        while k > 0 and _es_char_nombre(texto[k - 1]):  # Retrocede hasta el inicio de la palabra previa
+            k -= 1
+        i = k
+
+def extraer_enlaces_y_adjuntos(texto: str) -> tuple[list[str], list[tuple[str, str]]]:
+    """Recorre el texto una sola vez y devuelve (enlaces, adjuntos[(nombre.ext, ext)])."""
+    enlaces, adjuntos = [], []
+    for m in TOKENS_RE.finditer(texto or ""):
+        if m.group("url") is not None:             # Coincidió la alternativa de URL
+            enlaces.append(m.group("url"))
+            continue
+        inicio = inicio_nombre_adjunto(texto, m.start("base"))  # Recupera el nombre completo hacia atrás
+        if inicio is not None:
+            adjuntos.append((texto[inicio:m.end("ext")], m.group("ext").lower()))  # Nombre incluye ".ext"
+    return enlaces, adjuntos
 
 # --- Conjuntos de extensiones de archivos ---
 EXT_PELIGROSAS = {  # Extensiones asociadas a ejecutables o scripts peligrosos
@@ -1,102 +1,62 @@
 
-import os, re, unicodedata              # Importa módulos estándar: manejo de sistema, regex y normalización Unicode
+import os, pickle                       # Importa módulos estándar: sistema y serialización
 from pathlib import Path                # Permite manejar rutas de archivos de forma multiplataforma
-import numpy as np, pandas as pd, nltk  # Importa librerías: NumPy (matemática), pandas (dataframes), NLTK (texto)
-from sklearn.feature_extraction.text import TfidfVectorizer  # Convierte texto en vectores TF-IDF
-from Config_regex import URL_RE, ADJUNTO_RE, EXT_PELIGROSAS, EXT_COMUNES  # Importa expresiones y listas auxiliares
+import numpy as np                      # NumPy (matemática); pandas y scikit-learn se importan solo al entrenar
+from Config_regex import URL_RE, EXT_PELIGROSAS, EXT_COMUNES, extraer_enlaces_y_adjuntos  # Importa expresiones y auxiliares
 
 # ------------------- FUNCIONES DE LIMPIEZA -------------------
-
-def quitar_acentos(t: str) -> str:                 # Quita acentos de un texto dado
-    t = unicodedata.normalize('NFKD', t)           # Normaliza el texto separando letras y acentos
-    return t.encode('ascii', 'ignore').decode('utf-8')  # Convierte a ASCII eliminando acentos
-
-def limpiar_texto(t: str) -> str:                  # Limpia el texto para procesamiento
-    t = (t or "").lower().strip()                  # Convierte a minúsculas y elimina espacios extremos
-    t = quitar_acentos(t)                          # Llama a quitar_acentos()
-    t = re.sub(r"[^a-z0-9\s]", " ", t)             # Sustituye todo lo que no sea letra o número por espacio
-    return re.sub(r"\s+", " ", t).strip()          # Reemplaza múltiples espacios por uno solo
+# quitar_acentos / limpiar_texto viven en Normalizacion.py (camino rápido para texto ASCII);
+# limpiar_lote / limpiar_serie aplican lo mismo a muchos textos o a una Serie de pandas
+from Normalizacion import quitar_acentos, limpiar_texto, limpiar_lote, limpiar_serie
 
 # ------------------- FUNCIONES DE EXTRACCIÓN -------------------
-
-def dominio_de_email(remitente: str) -> str:       # Extrae el dominio del correo (después del @)
-    r = (remitente or "").strip().lower()          # Limpia y pone en minúsculas el remitente
-    if "@" in r:                                   # Verifica que contenga "@"
-        return r.split("@", 1)[-1]                 # Retorna el dominio (parte después del @)
-    return ""                                      # Si no, retorna cadena vacía
-
-def tokens_dominio(dom: str) -> list[str]:         # Convierte dominio en tokens útiles
-    if not dom:                                    # Si está vacío, devuelve lista vacía
-        return []                                  
-    dom = dom.replace("-", " ")                    # Reemplaza guiones por espacios
-    partes = dom.split(".")                        # Separa dominio por puntos
-    toks = []                                      # Inicializa lista de tokens
-    if len(partes) >= 1:                           # Si hay al menos un segmento
-        toks.append(f"from_dom_{limpiar_texto(partes[-2] if len(partes)>=2 else partes[0])}")  # Token dominio
-    if len(partes) >= 2:                           # Si hay TLD
-        toks.append(f"from_tld_{limpiar_texto(partes[-1])}")   # Token del TLD (.com, .org)
-    if len(partes) >= 3:                           # Si hay subdominio
-        toks.append(f"from_sub_{limpiar_texto(partes[0])}")    # Token subdominio
-    return toks                                    # Retorna la lista de tokens
-
-def extraer_enlaces(texto: str) -> list[str]:      # Extrae URLs del texto
-    return URL_RE.findall(texto or "")             # Aplica expresión regular definida en Config_regex
-
-def tokens_enlace(url: str) -> list[str]:          # Convierte una URL en tokens
-    toks = ["has_url"]                             # Token que indica presencia de URL
-    try:                                           # Control de errores
-        m = re.search(r"https?://([^/\s:]+)", url, re.I)  # Busca el dominio dentro de la URL
-        if not m:                                  # Si no encuentra, retorna token base
-            return toks
-        host = m.group(1).lower()                  # Obtiene dominio principal
-        host = host.replace("www.", "")            # Elimina "www."
-        partes = host.split(".")                   # Separa por puntos
-        if len(partes) >= 1:                       # Token de dominio
-            toks.append(f"url_dom_{limpiar_texto(partes[-2] if len(partes)>=2 else partes[0])}")
-        if len(partes) >= 2:                       # Token de TLD
-            toks.append(f"url_tld_{limpiar_texto(partes[-1])}")
-        if len(partes) >= 3:                       # Token de subdominio
-            toks.append(f"url_sub_{limpiar_texto(partes[0])}")
-    except Exception:                              # Si ocurre error, ignora
-        pass
-    return toks                                    # Devuelve lista de tokens
-
-def extraer_adjuntos(texto: str) -> list[tuple[str,str]]:  # Extrae nombres y extensiones de adjuntos
-    adjuntos = []                                  # Lista vacía
-    for m in ADJUNTO_RE.finditer(texto or ""):     # Busca coincidencias usando regex
-        nombre = (m.group("name") or "").strip()   # Obtiene nombre del archivo
-        ext = (m.group("ext") or "").lower().strip()  # Obtiene extensión
-        if nombre and ext:                         # Si ambos existen
-            adjuntos.append((nombre, ext))         # Añade como tupla (nombre, extensión)
-    return adjuntos                                # Devuelve lista de adjuntos
-
-def tokens_adjuntos(adjuntos: list[tuple[str,str]]) -> list[str]:  # Convierte adjuntos a tokens
-    toks = []                                      # Lista vacía
-    if adjuntos:                                   # Si hay adjuntos
-        toks.append("has_attachment")              # Marca que hay adjuntos
-    for nombre, ext in adjuntos:                   # Recorre cada adjunto
-        toks.append(f"att_ext_{ext}")              # Token con la extensión
-        if ext in EXT_PELIGROSAS:                  # Si la extensión es peligrosa
-            toks.append("att_ext_dangerous")       # Añade token de peligro
-        base = limpiar_texto(re.sub(r"\.[a-z0-9]{1,6}$", "", nombre, flags=re.I))  # Limpia nombre base
-        if base:                                   # Si hay texto
-            for w in base.split():                 # Divide en palabras
-                if len(w) >= 3:                    # Evita palabras cortas
-                    toks.append(f"att_name_{w}")   # Añade token con nombre del adjunto
-    return toks                                    # Retorna lista final
+# Viven en Caracteristicas.py (sin dependencias pesadas); se reexportan aquí
+from Caracteristicas import (dominio_de_email, tokens_dominio, extraer_enlaces, tokenizar, tokens_enlace,
+                             extraer_adjuntos, tokens_adjuntos, texto_enriquecido)
+
+# ------------------- CALIBRACIÓN (Complement NB) -------------------
+
+def _pesos_complement(n_spam: np.ndarray, n_ham: np.ndarray, alpha: float):
+    """Pesos CNB normalizados (w_spam, w_ham) a partir de los conteos por término de cada clase."""
+    V = len(n_spam)
+    w_spam = np.log((n_ham + alpha) / (n_ham.sum() + alpha * V))   # El complemento de SPAM es HAM (dos clases)
+    w_ham = np.log((n_spam + alpha) / (n_spam.sum() + alpha * V))
+    w_spam /= np.abs(w_spam).sum() or 1.0          # Normaliza los pesos de cada clase
+    w_ham /= np.abs(w_ham).sum() or 1.0
+    return w_spam, w_ham
+
+def _escala_platt(margenes: np.ndarray, spam_mask: np.ndarray) -> float:
+    """
+    Escala a > 0 tal que sigmoide(a · margen) sea una probabilidad calibrada (Platt, 1999, sin
+    término independiente para no mover el umbral ls > lh). Usa los objetivos suavizados de
+    Platt, así que a es finito aunque las clases estén perfectamente separadas.
+    """
+    n_pos, n_neg = int(spam_mask.sum()), int((~spam_mask).sum())
+    objetivo = np.where(spam_mask, (n_pos + 1) / (n_pos + 2), 1 / (n_neg + 2))
+    def gradiente(a):                                # Derivada de la log-pérdida; crece con a (convexa)
+        with np.errstate(over="ignore"):             # exp(+grande) → inf → probabilidad 0 (correcto)
+            return float(np.sum((1.0 / (1.0 + np.exp(-a * margenes)) - objetivo) * margenes))
+    if not np.any(margenes) or gradiente(0.0) >= 0:  # Márgenes nulos o en contra de las etiquetas
+        return 1.0
+    bajo, alto = 0.0, 1.0
+    while gradiente(alto) < 0 and alto < 1e9:        # Acota el mínimo
+        bajo, alto = alto, alto * 2
+    for _ in range(100):                             # Bisección sobre el gradiente
+        medio = (bajo + alto) / 2
+        bajo, alto = (medio, alto) if gradiente(medio) < 0 else (bajo, medio)
+    return (bajo + alto) / 2
 
 # ------------------- CLASE PRINCIPAL -------------------
 
 class EmailSpamClassifier:                         # Define clase principal del clasificador
-    def __init__(self, csv_path=None):              # Constructor con ruta opcional al dataset
-        try:
-            nltk.data.find("corpora/stopwords")     # Verifica corpus de stopwords
-        except LookupError:
-            nltk.download("stopwords")              # Descarga si no está
-        try:
-            nltk.data.find("tokenizers/punkt")      # Verifica tokenizer
-        except LookupError:
-            nltk.download("punkt")                  # Descarga si falta
+    MOTORES = ("tfidf", "multinomial", "complement")  # Motores de Bayes disponibles
+
+    def __init__(self, csv_path=None, motor: str = "tfidf"):  # Constructor con ruta opcional al dataset y motor
+        if motor not in self.MOTORES:               # Valida el motor antes de hacer cualquier trabajo
+            raise ValueError(f"Motor desconocido '{motor}'. Opciones: {', '.join(self.MOTORES)}.")
+        self.motor = motor                          # "tfidf" (original), "multinomial" o "complement"
+
+        import pandas as pd                         # Solo el entrenamiento lee el CSV (importar pandas tarda)
 
         self.precision = 0.0                        # Inicializa precisión
         self.recall_spam = 0.0                      # Inicializa recall para spam
@@ -160,25 +120,48 @@ class EmailSpamClassifier:                         # Define clase principal del
             enlaces_list = []                      # Inicializa lista de enlaces
             if isinstance(enlaces_col, str) and enlaces_col.strip():  # Si hay texto en columna enlaces
                 enlaces_list = [u for u in enlaces_col.split() if u.strip()]  # Separa por espacios
-            enlaces_list = list(set(enlaces_list + extraer_enlaces(mensaje)))  # Añade enlaces del mensaje
-
-            adjuntos = extraer_adjuntos(mensaje)   # Extrae adjuntos del mensaje
+            palabras, enlaces_msg, adjuntos = tokenizar(mensaje)  # Palabras, enlaces y adjuntos en una pasada
+            enlaces_list = list(set(enlaces_list + enlaces_msg))  # Añade enlaces del mensaje
 
-            enriched = self._make_feature_text(remitente, asunto, mensaje, enlaces_list, adjuntos)  # Genera texto
+            enriched = self._make_feature_text(remitente, asunto, mensaje, enlaces_list, adjuntos, palabras)  # Genera texto
             rows.append(enriched)                  # Añade texto enriquecido
 
         df["mensaje_limpio"] = rows                # Añade columna procesada
         self.df = df                               # Guarda DataFrame
 
+        self._ajustar()                               # Ajusta el motor elegido sobre mensaje_limpio
+
+        try:                                          # Calcula precisión y recall
+            self.df["prediccion"] = self.df["mensaje_limpio"].apply(self.clasificar_texto)
+            self.precision = float(np.mean(self.df["prediccion"] == self.df["etiqueta"]))
+            denom = self.df["etiqueta"].value_counts().get("spam", 1)
+            self.recall_spam = float(
+                np.sum((self.df["prediccion"] == "spam") & (self.df["etiqueta"] == "spam")) / denom
+            )
+        except Exception:                             # Ignora errores
+            pass
+
+    # ============ AJUSTE DE LOS MOTORES ============
+
+    def _ajustar(self):                               # Ajusta vectorizador y probabilidades según self.motor
+        spam_mask = (self.df["etiqueta"] == "spam").to_numpy()  # Filas SPAM
+        ham_mask  = (self.df["etiqueta"] == "ham").to_numpy()   # Filas HAM
+        n = len(self.df) or 1                          # Número total de muestras
+        self.P_spam = spam_mask.sum() / n              # Probabilidad a priori de spam
+        self.P_no_spam = ham_mask.sum() / n            # Probabilidad a priori de ham
+        if self.motor == "tfidf":
+            self._ajustar_tfidf()
+        else:
+            self._ajustar_conteos(spam_mask, ham_mask)
+
+    def _ajustar_tfidf(self):                         # Motor original: suma de pesos TF-IDF por clase
+        from sklearn.feature_extraction.text import TfidfVectorizer  # scikit-learn solo al entrenar (más de 1 s)
         self.vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=1)  # Crea vectorizador TF-IDF
         X = self.vectorizer.fit_transform(self.df["mensaje_limpio"])     # Ajusta y transforma corpus
         self.palabras = self.vectorizer.get_feature_names_out()          # Guarda vocabulario
 
         spam = self.df[self.df["etiqueta"] == "spam"]  # Filtra spam
         ham  = self.df[self.df["etiqueta"] == "ham"]   # Filtra ham
-        n = len(self.df) or 1                          # Número total de muestras
-        self.P_spam = len(spam) / n                    # Probabilidad a priori de spam
-        self.P_no_spam = len(ham) / n                  # Probabilidad a priori de ham
 
         X_spam = self.vectorizer.transform(spam["mensaje_limpio"]) if len(spam) else X[:0]  # Vectoriza spam
         X_ham  = self.vectorizer.transform(ham["mensaje_limpio"])  if len(ham)  else X[:0]  # Vectoriza ham
@@ -191,61 +174,137 @@ class EmailSpamClassifier:                         # Define clase principal del
         denom_ham  = (np.sum(s_ham)  + alpha * len(self.palabras)) or 1.0  # Denominador ham
         self.P_feat_spam = (s_spam + alpha) / denom_spam                   # Probabilidades condicionales spam
         self.P_feat_ham  = (s_ham  + alpha) / denom_ham                    # Probabilidades condicionales ham
+        self._precalcular_logs()                                           # Deja listos los logaritmos para puntuar
 
-        try:                                          # Calcula precisión y recall
-            self.df["prediccion"] = self.df["mensaje_limpio"].apply(self.clasificar_texto)
-            self.precision = float(np.mean(self.df["prediccion"] == self.df["etiqueta"]))
-            denom = self.df["etiqueta"].value_counts().get("spam", 1)
-            self.recall_spam = float(
-                np.sum((self.df["prediccion"] == "spam") & (self.df["etiqueta"] == "spam")) / denom
-            )
-        except Exception:                             # Ignora errores
-            pass
+    def _ajustar_conteos(self, spam_mask, ham_mask, alpha: float = 1.0):
+        """
+        Motores "multinomial" y "complement": Naive Bayes sobre conteos crudos de tokens.
+        No calcula IDF ni normaliza; las sumas por clase se hacen sobre la matriz dispersa
+        y las log-probabilidades se guardan en float32. En "complement" los pesos se escalan
+        (escala_prob, Platt con validación cruzada) para que prob_spam_* sea una probabilidad útil.
+        """
+        from sklearn.feature_extraction.text import CountVectorizer  # scikit-learn solo al entrenar (más de 1 s)
+        self.vectorizer = CountVectorizer(ngram_range=(1, 2), min_df=1, dtype=np.float32)  # Conteos (mismos n-gramas)
+        X = self.vectorizer.fit_transform(self.df["mensaje_limpio"]).tocsr()  # Matriz dispersa de conteos
+        self.palabras = self.vectorizer.get_feature_names_out()               # Guarda vocabulario
+        V = len(self.palabras)                                                 # Tamaño del vocabulario
+
+        n_spam = np.asarray(X[spam_mask].sum(axis=0), dtype=np.float64).ravel()  # Conteo por término en SPAM (disperso)
+        n_ham  = np.asarray(X[ham_mask].sum(axis=0),  dtype=np.float64).ravel()  # Conteo por término en HAM
+        self.P_feat_spam = (n_spam + alpha) / (n_spam.sum() + alpha * V)       # θ de cada término dado SPAM
+        self.P_feat_ham  = (n_ham  + alpha) / (n_ham.sum()  + alpha * V)       # θ de cada término dado HAM
+
+        eps = 1e-12                                   # Valor pequeño para evitar log(0)
+        if self.motor == "multinomial":               # log P(c) + Σ conteo · log θ_c
+            self.log_P_spam = np.float32(np.log(self.P_spam + eps))
+            self.log_P_no_spam = np.float32(np.log(self.P_no_spam + eps))
+            self.log_feat_spam = np.log(self.P_feat_spam).astype(np.float32)
+            self.log_feat_ham = np.log(self.P_feat_ham).astype(np.float32)
+        else:                                         # Complement NB (Rennie et al., 2003) con pesos normalizados
+            w_spam, w_ham = _pesos_complement(n_spam, n_ham, alpha)
+            # Con pesos normalizados el margen ls - lh es diminuto (todas las probabilidades ≈ 0.5):
+            # se escala para que la sigmoide dé probabilidades calibradas (la etiqueta no cambia)
+            self.escala_prob = _escala_platt(self._margenes_cv_complement(X, spam_mask, ham_mask, alpha), spam_mask)
+            self.log_P_spam = np.float32(0.0)         # CNB ignora los priors
+            self.log_P_no_spam = np.float32(0.0)
+            self.log_feat_spam = (-self.escala_prob * w_spam).astype(np.float32)  # Puntuación de c = -Σ conteo · w_c
+            self.log_feat_ham = (-self.escala_prob * w_ham).astype(np.float32)
+
+    @staticmethod
+    def _margenes_cv_complement(X, spam_mask, ham_mask, alpha: float, pliegues: int = 5, semilla: int = 0):
+        """
+        Margen CNB (ls - lh sin escalar) de cada correo de entrenamiento, calculado con pesos
+        ajustados sin su pliegue (validación cruzada): los márgenes sobre los propios datos
+        de ajuste serían demasiado optimistas para calibrar.
+        """
+        n = X.shape[0]
+        n_spam = np.asarray(X[spam_mask].sum(axis=0), dtype=np.float64).ravel()
+        n_ham  = np.asarray(X[ham_mask].sum(axis=0),  dtype=np.float64).ravel()
+        margenes = np.zeros(n)
+        pliego = np.random.default_rng(semilla).permutation(n) % max(1, min(pliegues, n))  # Pliegue de cada fila
+        for k in np.unique(pliego):
+            dentro = pliego == k
+            X_k = X[dentro]
+            s_k = np.asarray(X[dentro & spam_mask].sum(axis=0), dtype=np.float64).ravel()  # Conteos del pliegue
+            h_k = np.asarray(X[dentro & ham_mask].sum(axis=0),  dtype=np.float64).ravel()
+            w_spam, w_ham = _pesos_complement(n_spam - s_k, n_ham - h_k, alpha)
+            margenes[dentro] = X_k @ (w_ham - w_spam)  # ls - lh = -X·w_spam + X·w_ham
+        return margenes
+
+    # ============ PERSISTENCIA ============
+
+    def guardar(self, ruta) -> Path:
+        """
+        Guarda el modelo entrenado (vectorizador, priors y verosimilitudes) en un .pkl.
+        El DataFrame de entrenamiento no se incluye para que el archivo sea pequeño.
+        """
+        ruta = Path(ruta)                             # Normaliza la ruta
+        ruta.parent.mkdir(parents=True, exist_ok=True)  # Crea la carpeta destino si hace falta
+        estado = {k: v for k, v in self.__dict__.items() if k != "df"}  # Todo menos el dataset
+        with open(ruta, "wb") as f:
+            pickle.dump(estado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return ruta
+
+    @classmethod
+    def cargar(cls, ruta) -> "EmailSpamClassifier":
+        """Reconstruye un clasificador guardado con guardar() sin volver a entrenar."""
+        with open(ruta, "rb") as f:
+            estado = pickle.load(f)                   # Diccionario con el estado del modelo
+        clf = cls.__new__(cls)                        # Evita __init__ (no relee ni reentrena el CSV)
+        clf.__dict__.update(estado)
+        clf.df = None                                 # El dataset de entrenamiento no se persiste
+        return clf
+
+    def exportar(self, ruta) -> Path:
+        """
+        Exporta lo necesario para puntuar (vocabulario, IDF y log-probabilidades) a un .npz sin
+        objetos de scikit-learn: Puntuador.py lo carga solo con NumPy (arranque rápido).
+        """
+        ruta = Path(ruta)                             # Normaliza la ruta
+        ruta.parent.mkdir(parents=True, exist_ok=True)  # Crea la carpeta destino si hace falta
+        v = self.vectorizer
+        if v.analyzer != "word" or v.binary or v.stop_words or getattr(v, "sublinear_tf", False):
+            raise ValueError("Puntuador.py solo reproduce el vectorizador por palabras (sin binary, stop_words ni sublinear_tf).")
+        terminos = "\n".join(v.get_feature_names_out().tolist())  # Los términos no contienen saltos de línea
+        idf = getattr(v, "idf_", None) if getattr(v, "use_idf", False) else None
+        with open(ruta, "wb") as f:                   # Con archivo abierto: np.savez no agrega ".npz" al nombre
+            np.savez(f,
+                     motor=np.array(self.motor),
+                     terminos=np.frombuffer(terminos.encode("utf-8"), dtype=np.uint8),
+                     idf=np.zeros(0) if idf is None else np.asarray(idf, dtype=np.float64),
+                     log_P_spam=np.float64(self.log_P_spam), log_P_no_spam=np.float64(self.log_P_no_spam),
+                     log_feat_spam=np.asarray(self.log_feat_spam, dtype=np.float64).ravel(),
+                     log_feat_ham=np.asarray(self.log_feat_ham, dtype=np.float64).ravel(),
+                     ngramas=np.array(v.ngram_range), patron=np.array(v.token_pattern),
+                     minusculas=np.array(bool(v.lowercase)), norma=np.array(getattr(v, "norm", None) or ""))
+        return ruta
 
     # ============ FEATURE TEXT =============
     # ========== TEXTO ENRIQUECIDO ==========
     def _make_feature_text(self, remitente: str, asunto: str, contenido: str,
-                           enlaces: list[str] | None, adjuntos: list[tuple[str,str]] | None) -> str:
-        parts: list[str] = []                        # Lista donde se irán acumulando las partes del texto enriquecido
-        is_dangerous = False                         # Bandera opcional (no usada directamente aquí)
-
-        # Texto base (limpio)
-        parts.append(limpiar_texto(asunto))          # Limpia y añade el asunto
-        parts.append(limpiar_texto(contenido))       # Limpia y añade el contenido del mensaje
-
-        # Dominio remitente → tokens
-        dom = dominio_de_email(remitente)            # Obtiene el dominio del remitente
-        parts += tokens_dominio(dom)                 # Genera tokens del dominio y los agrega a la lista
-
-        # Enlaces → tokens
-        if enlaces:                                  # Si se proporcionan enlaces explícitamente
-            for u in enlaces:                        # Recorre cada enlace
-                parts += tokens_enlace(u)            # Extrae tokens del enlace
-        else:                                        # Si no se pasaron enlaces, los busca dentro del contenido
-            for u in extraer_enlaces(contenido):     # Extrae enlaces encontrados en el cuerpo del mensaje
-                parts += tokens_enlace(u)            # Los convierte a tokens
-
-        # Adjuntos → tokens
-        if adjuntos is None:                         # Si no se pasaron adjuntos explícitamente
-            adjuntos = extraer_adjuntos(contenido)   # Los extrae del contenido
-        adj_tokens = tokens_adjuntos(adjuntos)       # Convierte los adjuntos a tokens
-        parts += adj_tokens                          # Agrega los tokens de adjuntos a la lista
-
-        # Refuerzo para tokens peligrosos: Aumentar el peso (importancia)
-        if "att_ext_dangerous" in adj_tokens:        # Si hay un adjunto con extensión peligrosa
-            parts += ["att_ext_dangerous"] * 5       # Repite el token varias veces para aumentar su peso TF-IDF
-        
-        # Unir todo
-        return " ".join([p for p in parts if p])     # Une todos los tokens en una sola cadena separada por espacios
+                           enlaces: list[str] | None, adjuntos: list[tuple[str,str]] | None,
+                           palabras: str | None = None) -> str:
+        return texto_enriquecido(remitente, asunto, contenido, enlaces, adjuntos, palabras)  # Ver Caracteristicas.py
 
     # ============ NÚCLEO BAYES ============
 
-    def _log_post(self, txt_clean: str):             # Calcula las probabilidades logarítmicas de SPAM y HAM
-        v = self.vectorizer.transform([txt_clean]).toarray()[0]  # Convierte el texto en vector TF-IDF
+    def _precalcular_logs(self):                     # Calcula una sola vez los logaritmos usados al puntuar
         eps = 1e-12                                  # Valor pequeño para evitar log(0)
-        ls = np.log(self.P_spam + eps)    + np.sum(np.log(self.P_feat_spam + eps) * v)  # Log probabilidad de SPAM
-        lh = np.log(self.P_no_spam + eps) + np.sum(np.log(self.P_feat_ham  + eps) * v)  # Log probabilidad de HAM
-        return ls, lh                                # Devuelve ambas probabilidades logarítmicas
+        self.log_P_spam = np.log(self.P_spam + eps)            # Log prior de SPAM
+        self.log_P_no_spam = np.log(self.P_no_spam + eps)      # Log prior de HAM
+        self.log_feat_spam = np.log(self.P_feat_spam + eps)    # Log verosimilitud por término (SPAM)
+        self.log_feat_ham = np.log(self.P_feat_ham + eps)      # Log verosimilitud por término (HAM)
+
+    def _log_post_lote(self, textos: list[str]):     # Log-probabilidades de SPAM y HAM para varios textos a la vez
+        X = self.vectorizer.transform(textos)        # Matriz dispersa TF-IDF (n_textos × vocabulario), sin densificar
+        ls = self.log_P_spam    + X @ self.log_feat_spam   # Producto disperso: una fila por texto (SPAM)
+        lh = self.log_P_no_spam + X @ self.log_feat_ham    # Producto disperso: una fila por texto (HAM)
+        return (np.asarray(ls, dtype=np.float64).ravel(),      # Devuelve dos vectores 1-D en float64
+                np.asarray(lh, dtype=np.float64).ravel())      # (los motores de conteo guardan float32)
+
+    def _log_post(self, txt_clean: str):             # Calcula las probabilidades logarítmicas de SPAM y HAM
+        ls, lh = self._log_post_lote([txt_clean])    # Reutiliza la versión por lotes con un solo texto
+        return ls[0], lh[0]                          # Devuelve ambas probabilidades logarítmicas
 
     def clasificar_texto(self, txt: str) -> str:     # Clasifica un texto cualquiera (sin formato de correo)
         t = limpiar_texto(txt)                       # Limpia el texto
@@ -274,18 +333,43 @@ class EmailSpamClassifier:                         # Define clase principal del
         d = lh - ls                                       # Diferencia logarítmica
         return float(1.0 / (1.0 + np.exp(d)))             # Devuelve probabilidad de ser SPAM
 
-    # Versión extendida (puedes pasar enlaces y adjuntos ya extraídos desde la UI)
+    # Versión extendida (puedes pasar enlaces, adjuntos y palabras ya extraídos desde la UI con tokenizar())
     def clasificar_correo_ext(self, remitente: str, asunto: str, contenido: str,
                               enlaces: list[str] | None = None,
-                              adjuntos: list[tuple[str,str]] | None = None) -> str:
-        enriched = self._make_feature_text(remitente, asunto, contenido, enlaces, adjuntos)  # Texto enriquecido con todo
+                              adjuntos: list[tuple[str,str]] | None = None,
+                              palabras: str | None = None) -> str:
+        enriched = self._make_feature_text(remitente, asunto, contenido, enlaces, adjuntos, palabras)  # Texto enriquecido con todo
         ls, lh = self._log_post(enriched)                 # Calcula probabilidades logarítmicas
         return "spam" if ls > lh else "ham"              # Clasifica como SPAM o HAM
 
     def prob_spam_correo_ext(self, remitente: str, asunto: str, contenido: str,
                              enlaces: list[str] | None = None,
-                             adjuntos: list[tuple[str,str]] | None = None) -> float:
-        enriched = self._make_feature_text(remitente, asunto, contenido, enlaces, adjuntos)  # Texto enriquecido completo
+                             adjuntos: list[tuple[str,str]] | None = None,
+                             palabras: str | None = None) -> float:
+        enriched = self._make_feature_text(remitente, asunto, contenido, enlaces, adjuntos, palabras)  # Texto enriquecido completo
         ls, lh = self._log_post(enriched)                 # Calcula probabilidades
         d = lh - ls                                       # Diferencia entre HAM y SPAM
         return float(1.0 / (1.0 + np.exp(d)))             # Retorna probabilidad entre 0 y 1 de ser SPAM
+
+    def analizar_correo_ext(self, remitente: str, asunto: str, contenido: str,
+                            enlaces: list[str] | None = None,
+                            adjuntos: list[tuple[str,str]] | None = None,
+                            palabras: str | None = None) -> tuple[str, float]:
+        """Etiqueta y probabilidad de SPAM con una sola pasada del clasificador."""
+        enriched = self._make_feature_text(remitente, asunto, contenido, enlaces, adjuntos, palabras)  # Texto enriquecido
+        ls, lh = self._log_post(enriched)                 # Una sola transformación TF-IDF
+        etiqueta = "spam" if ls > lh else "ham"          # Misma regla que clasificar_correo_ext
+        return etiqueta, float(1.0 / (1.0 + np.exp(lh - ls)))  # Misma probabilidad que prob_spam_correo_ext
+
+    # ============ PUNTUACIÓN POR LOTES ============
+
+    def prob_spam_lote(self, correos: list[tuple[str, str, str]]) -> np.ndarray:
+        """
+        Puntúa varios correos (remitente, asunto, contenido) en una sola pasada vectorizada.
+        Devuelve un arreglo con la probabilidad de SPAM de cada correo, en el mismo orden.
+        """
+        textos = [self._make_feature_text(r, a, c, None, None) for r, a, c in correos]  # Texto enriquecido por correo
+        if not textos:                                    # Lote vacío: nada que puntuar
+            return np.zeros(0)
+        ls, lh = self._log_post_lote(textos)              # Una sola transformación TF-IDF para todo el lote
+        return 1.0 / (1.0 + np.exp(lh - ls))              # Sigmoide elemento a elemento
@@ -1,10 +1,12 @@
 
-import re, threading  # re: expresiones regulares; threading: ejecutar carga del modelo en segundo plano
+import re, threading, queue  # re: expresiones regulares; threading/queue: trabajo en segundo plano
+from concurrent.futures import ThreadPoolExecutor  # Ejecutor para el análisis fuera del hilo de Tk
 from pathlib import Path  # Manejo de rutas de archivos de forma multiplataforma
 import tkinter as tk  # Tkinter base
-from tkinter import filedialog, messagebox  # Diálogos para abrir archivos y mostrar mensajes
-from DeteccionDeSpam import EmailSpamClassifier  # backend  # Importa el clasificador del backend
-from Config_regex import URL_RE, ADJUNTO_RE, EXT_PELIGROSAS, EXT_COMUNES, es_email_valido  # Carga regex/sets/validador
+from tkinter import filedialog, messagebox, ttk  # Diálogos, mensajes y widgets ttk (barra de progreso, tabla)
+from Caracteristicas import tokenizar  # Tokenizador (sin pandas ni scikit-learn: la ventana abre al instante)
+from Puntuador import Puntuador, modelo_desactualizado  # backend ligero  # Puntúa con el modelo exportado usando solo NumPy
+from Config_regex import EXT_PELIGROSAS, EXT_COMUNES, es_email_valido  # Carga sets/validador
 
 # ======= Colores UI =======  # Paleta de colores para la interfaz
 COLOR_BG = "#9ebbc0"  # Color de fondo general
@@ -19,6 +21,8 @@ root.configure(bg=COLOR_BG)  # Aplica color de fondo
 
 status_var = tk.StringVar(value="Modelo: cargando…")  # Variable de estado para mostrar progreso de modelo
 clf = None  # se asignará al cargar modelo  # Inicializa el clasificador como None (se cargará asincrónico)
+ejecutor = ThreadPoolExecutor(max_workers=1)  # Un solo hilo trabajador: los análisis se ejecutan en orden
+POLL_MS = 30  # Cada cuánto revisa el hilo de Tk si terminó un trabajo en segundo plano
 
 # ======= Layout principal =======  # Contenedor superior para todo el contenido
 main = tk.Frame(root, bg=COLOR_BG)  # Frame principal con mismo fondo
@@ -52,6 +56,8 @@ btn_abrir = tk.Button(btns, text="Abrir archivo (.txt/.eml)", bg="#d1d5db")  # B
 btn_abrir.pack(side="left", padx=4)  # Coloca a la izquierda con separación
 btn_limpiar = tk.Button(btns, text="Limpiar", bg="#d1d5db")  # Botón para limpiar campos/salida
 btn_limpiar.pack(side="left", padx=4)  # Posiciona a la izquierda con padding
+btn_carpeta = tk.Button(btns, text="Escanear carpeta", bg="#d1d5db")  # Botón para clasificar una carpeta completa
+btn_carpeta.pack(side="left", padx=4)  # Posiciona a la izquierda con padding
 
 tk.Label(main, textvariable=status_var, bg=COLOR_BG).pack(anchor="w", pady=(0, 6))  # Muestra estado del modelo (StringVar)
 
@@ -76,33 +82,52 @@ def analizar():  # Función que se ejecuta al presionar "Analizar"
     asunto = entry_asunto.get().strip()  # Obtiene asunto
     contenido = text_contenido.get("1.0", "end").strip()  # Obtiene contenido del Text
 
-    enlaces = URL_RE.findall(contenido or "")  # Busca URLs en el contenido usando regex
+    estado_previo = status_var.get()  # Para restaurarlo al terminar (Listo o fallback)
+    btn_analizar.config(state="disabled")  # Evita lanzar otro análisis mientras corre este
+    status_var.set("Analizando…")  # Informa que el trabajo sigue en segundo plano
+    futuro = ejecutor.submit(_analizar_en_fondo, remitente, asunto, contenido)  # La ventana no se congela
+    esperar_resultado(futuro, lambda f: mostrar_resultado(f, estado_previo))  # El resultado vuelve al hilo de Tk con root.after
+
+def _analizar_en_fondo(remitente, asunto, contenido):  # Corre en el hilo trabajador (sin tocar widgets)
+    # Una sola pasada: palabras limpias, URLs y adjuntos mencionados (nombre, ext)
+    # El clasificador recibe lo ya extraído y no vuelve a recorrer el contenido
+    palabras, enlaces, adjuntos = tokenizar(contenido)
+
+    # Si tanto el asunto como el contenido del correo están vacíos, asigna "(sin contenido)" y confianza 0.0.
+    # De lo contrario, obtiene etiqueta y probabilidad de SPAM con una sola pasada del clasificador.
+    if not asunto and not contenido:
+        clasificacion, confianza = "(sin contenido)", 0.0
+    else:
+        etiqueta, confianza = clf.analizar_correo_ext(remitente, asunto, contenido, enlaces, adjuntos, palabras)
+        clasificacion = etiqueta.upper()
 
-    # Extrae adjuntos mencionados  # Itera coincidencias y extrae nombre/extensión
-    adjuntos = []
-    for m in ADJUNTO_RE.finditer(contenido or ""):
-        nombre = m.group("name").strip()  # Nombre completo del archivo
-        ext = m.group("ext").lower()  # Extensión en minúscula
-        adjuntos.append((nombre, ext))  # Agrega tupla (nombre, ext)
+    return {"remitente": remitente, "asunto": asunto, "enlaces": enlaces, "adjuntos": adjuntos,
+            "clasificacion": clasificacion, "confianza": confianza}
 
-    adj_peligrosos = [n for (n, ext) in adjuntos if ext in EXT_PELIGROSAS]  # Filtra adjuntos peligrosos por extensión
-    adj_listables = [n for (n, ext) in adjuntos if ext in (EXT_PELIGROSAS | EXT_COMUNES)]  # Adjuntos a listar (comunes+peligrosos)
+def esperar_resultado(futuro, al_terminar):  # Revisa el futuro desde el hilo de Tk sin bloquearlo
+    if not futuro.done():  # Aún trabajando: vuelve a revisar en unos milisegundos
+        root.after(POLL_MS, esperar_resultado, futuro, al_terminar)
+        return
+    al_terminar(futuro)  # Ya terminó: se procesa en el hilo de Tk
 
-    # Si tanto el asunto como el contenido del correo están vacíos,asigna "(sin contenido)" como resultado.
-    # De lo contrario, llama al método 'clasificar_correo_ext' del clasificador 'clf' para determinar si el correo es SPAM o HAM, y convierte el resultado a mayúsculas.
-    clasificacion = "(sin contenido)" if (not asunto and not contenido) else clf.clasificar_correo_ext(
-        remitente, asunto, contenido, enlaces, adjuntos).upper()
+def mostrar_resultado(futuro, estado_previo):  # Pinta el resultado del análisis (hilo de Tk)
+    btn_analizar.config(state="normal")  # Reactiva el botón
+    status_var.set(estado_previo)  # Restaura el estado del modelo
+    try:
+        r = futuro.result()  # Resultado calculado en segundo plano
+    except Exception as e:  # Error durante el análisis
+        messagebox.showerror("Error", f"No se pudo analizar el correo.\n\n{e}")
+        return
 
-    # Si el correo no tiene asunto ni contenido, la confianza se establece en 0.0 (ya que no hay información para evaluar).
-    # De lo contrario, se obtiene la probabilidad de que el correo sea SPAM utilizando el método 'prob_spam_correo_ext' del clasificador.
-    confianza = 0.0 if (not asunto and not contenido) else clf.prob_spam_correo_ext(
-        remitente, asunto, contenido, enlaces, adjuntos)
+    enlaces, adjuntos = r["enlaces"], r["adjuntos"]
+    adj_peligrosos = [n for (n, ext) in adjuntos if ext in EXT_PELIGROSAS]  # Filtra adjuntos peligrosos por extensión
+    adj_listables = [n for (n, ext) in adjuntos if ext in (EXT_PELIGROSAS | EXT_COMUNES)]  # Adjuntos a listar (comunes+peligrosos)
 
     out.config(state="normal")  # Habilita edición para escribir resultados
     out.delete("1.0", "end")  # Limpia salida previa
     out.insert("end", "=== Características extraídas ===\n")  # Encabezado
-    out.insert("end", f"Remitente: {remitente or '(vacío)'}\n")  # Muestra remitente
-    out.insert("end", f"Asunto: {asunto or '(vacío)'}\n")  # Muestra asunto
+    out.insert("end", f"Remitente: {r['remitente'] or '(vacío)'}\n")  # Muestra remitente
+    out.insert("end", f"Asunto: {r['asunto'] or '(vacío)'}\n")  # Muestra asunto
     out.insert("end", f"Enlaces ({len(enlaces)}):\n")  # Muestra cantidad de URLs encontradas
     for u in enlaces:  # Lista cada URL
         out.insert("end", f"  - {u}\n")  # Escribe URL
@@ -115,31 +140,37 @@ def analizar():  # Función que se ejecuta al presionar "Analizar"
         out.insert("end", "Adjuntos mencionados: ninguno\n")  # Indica ausencia de adjuntos
 
     out.insert("end", "\n=== Clasificación ===\n")  # Encabezado de clasificación
-    out.insert("end", f"Resultado: {clasificacion}\n")  # Muestra etiqueta (SPAM/HAM o sin contenido)
-    out.insert("end", f"Confianza SPAM (mensaje): {confianza:.2%}\n")  # Muestra probabilidad en porcentaje
+    out.insert("end", f"Resultado: {r['clasificacion']}\n")  # Muestra etiqueta (SPAM/HAM o sin contenido)
+    out.insert("end", f"Confianza SPAM (mensaje): {r['confianza']:.2%}\n")  # Muestra probabilidad en porcentaje
 
     if adj_peligrosos:  # Si hubo adjuntos peligrosos
         out.insert("end", "\n⚠ Adjuntos potencialmente peligrosos detectados.\n")  # Anota advertencia en el reporte
         messagebox.showwarning("Advertencia", "Se detectaron adjuntos potencialmente peligrosos.")  # Popup de advertencia
     out.config(state="disabled")  # Vuelve a modo solo lectura
 
+def leer_correo(ruta):  # Lee un .txt/.eml y devuelve (remitente, asunto, cuerpo)
+    txt = Path(ruta).read_text(encoding="utf-8", errors="ignore")  # Lee el archivo como texto
+    m = re.search(r"^(From|Remitente)\s*:\s*(.+)$", txt, re.IGNORECASE | re.MULTILINE)  # Busca línea de remitente
+    remitente = m.group(2).strip() if m else ""  # Remitente encontrado (o vacío)
+    m = re.search(r"^(Subject|Asunto)\s*:\s*(.+)$", txt, re.IGNORECASE | re.MULTILINE)  # Busca línea de asunto
+    asunto = m.group(2).strip() if m else ""  # Asunto encontrado (o vacío)
+    partes = re.split(r"\r?\n\r?\n", txt, maxsplit=1)  # Separa encabezados y cuerpo por línea en blanco
+    cuerpo = partes[1] if len(partes) == 2 else txt  # Toma el cuerpo si existe; si no, todo el texto
+    return remitente, asunto, cuerpo.strip()
+
 def abrir_archivo():  # Función para cargar contenido desde archivo .txt/.eml
     f = filedialog.askopenfilename(filetypes=[("Texto/EML", "*.txt *.eml"), ("Todos", "*.*")])  # Diálogo de selección
     if not f:  # Si el usuario cancela
         return  # Sale
-    txt = Path(f).read_text(encoding="utf-8", errors="ignore")  # Lee el archivo como texto
-    m = re.search(r"^(From|Remitente)\s*:\s*(.+)$", txt, re.IGNORECASE | re.MULTILINE)  # Busca línea de remitente
-    if m:  # Si encontró remitente
+    remitente, asunto, cuerpo = leer_correo(f)  # Extrae remitente, asunto y cuerpo
+    if remitente:  # Si encontró remitente
         entry_remitente.delete(0, "end")  # Limpia campo
-        entry_remitente.insert(0, m.group(2).strip())  # Inserta remitente encontrado
-    m = re.search(r"^(Subject|Asunto)\s*:\s*(.+)$", txt, re.IGNORECASE | re.MULTILINE)  # Busca línea de asunto
-    if m:  # Si encontró asunto
+        entry_remitente.insert(0, remitente)  # Inserta remitente encontrado
+    if asunto:  # Si encontró asunto
         entry_asunto.delete(0, "end")  # Limpia campo
-        entry_asunto.insert(0, m.group(2).strip())  # Inserta asunto encontrado
-    partes = re.split(r"\r?\n\r?\n", txt, maxsplit=1)  # Separa encabezados y cuerpo por línea en blanco
-    cuerpo = partes[1] if len(partes) == 2 else txt  # Toma el cuerpo si existe; si no, todo el texto
+        entry_asunto.insert(0, asunto)  # Inserta asunto encontrado
     text_contenido.delete("1.0", "end")  # Limpia el Text
-    text_contenido.insert("1.0", cuerpo.strip())  # Inserta el cuerpo del mensaje
+    text_contenido.insert("1.0", cuerpo)  # Inserta el cuerpo del mensaje
 
 def limpiar():  # Limpia todos los campos y la salida
     entry_remitente.delete(0, "end")  # Limpia remitente
@@ -158,19 +189,141 @@ def validar_remitente_evento(_evt=None):  # Validación al perder foco en el cam
 
 entry_remitente.bind("<FocusOut>", validar_remitente_evento)  # Vincula la validación al evento de perder foco
 
+# ======= Escaneo de carpeta (segundo plano) =======  # Clasifica muchos .eml/.txt sin congelar la ventana
+TAM_LOTE_CARPETA = 32  # Correos por llamada vectorizada al clasificador
+
+def _escanear_en_fondo(archivos, cola, cancelado):  # Corre en un hilo aparte; solo se comunica por la cola
+    try:
+        for i in range(0, len(archivos), TAM_LOTE_CARPETA):
+            if cancelado.is_set():  # La ventana de resultados se cerró
+                return
+            lote = archivos[i:i + TAM_LOTE_CARPETA]
+            correos, nombres = [], []
+            for ruta in lote:
+                try:
+                    correos.append(leer_correo(ruta))  # (remitente, asunto, cuerpo)
+                    nombres.append(ruta)
+                except OSError as e:  # Archivo ilegible: se reporta y se sigue
+                    cola.put(("fila", (ruta.name, "", "", "ERROR", "", str(e))))
+            try:
+                probs = clf.prob_spam_lote(correos) if correos else []  # Un solo paso vectorizado por lote
+            except Exception as e:  # El clasificador falló: todo el lote queda como ERROR y se sigue
+                for ruta, (remitente, asunto, _) in zip(nombres, correos):
+                    cola.put(("fila", (ruta.name, remitente, asunto, "ERROR", "", str(e))))
+                probs = []
+            for ruta, (remitente, asunto, _), p in zip(nombres, correos, probs):
+                etiqueta = "SPAM" if p > 0.5 else "HAM"  # Misma regla que clasificar_correo
+                cola.put(("fila", (ruta.name, remitente, asunto, etiqueta, f"{p:.2%}", str(ruta))))
+            cola.put(("progreso", min(i + TAM_LOTE_CARPETA, len(archivos))))
+    finally:  # La ventana siempre sale de "escaneando", pase lo que pase en el hilo
+        cola.put(("fin", None))
+
+def ordenar_tabla(tabla, columna, descendente):  # Ordena la tabla al hacer clic en un encabezado
+    filas = [(tabla.set(iid, columna), iid) for iid in tabla.get_children("")]
+    def clave(par):  # Ordena numéricamente la probabilidad y alfabéticamente lo demás
+        v = par[0]
+        if columna == "prob":
+            try:
+                return (0, float(v.rstrip("%")))
+            except ValueError:
+                return (1, 0.0)
+        return (0, v.lower())
+    filas.sort(key=clave, reverse=descendente)
+    for pos, (_, iid) in enumerate(filas):
+        tabla.move(iid, "", pos)
+    tabla.heading(columna, command=lambda: ordenar_tabla(tabla, columna, not descendente))  # Alterna el sentido
+
+def escanear_carpeta():  # Abre una carpeta y clasifica todos sus .eml/.txt en segundo plano
+    if clf is None:  # Si el modelo aún no está cargado
+        messagebox.showinfo("Espérame tantito", "El modelo sigue cargando.")
+        return
+    carpeta = filedialog.askdirectory()  # Diálogo de selección de carpeta
+    if not carpeta:  # Si el usuario cancela
+        return
+    archivos = sorted(p for p in Path(carpeta).rglob("*") if p.is_file() and p.suffix.lower() in (".eml", ".txt"))
+    if not archivos:
+        messagebox.showinfo("Sin archivos", "La carpeta no contiene archivos .eml ni .txt.")
+        return
+
+    ventana = tk.Toplevel(root)  # Ventana de resultados del escaneo
+    ventana.title(f"Escaneo: {carpeta}")
+    ventana.geometry("1000x450")
+    ventana.configure(bg=COLOR_BG)
+
+    estado = tk.StringVar(value=f"0 / {len(archivos)} archivos")
+    tk.Label(ventana, textvariable=estado, bg=COLOR_BG).pack(anchor="w", padx=8, pady=(8, 2))
+    barra = ttk.Progressbar(ventana, maximum=len(archivos), mode="determinate")  # Barra de progreso
+    barra.pack(fill="x", padx=8, pady=(0, 8))
+
+    columnas = ("archivo", "remitente", "asunto", "resultado", "prob", "detalle")
+    marco = tk.Frame(ventana, bg=COLOR_BG)
+    marco.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+    tabla = ttk.Treeview(marco, columns=columnas, show="headings")  # Tabla de resultados
+    titulos = {"archivo": "Archivo", "remitente": "Remitente", "asunto": "Asunto",
+               "resultado": "Resultado", "prob": "Prob. SPAM", "detalle": "Ruta / error"}
+    for c in columnas:
+        tabla.heading(c, text=titulos[c], command=lambda c=c: ordenar_tabla(tabla, c, False))  # Clic → ordenar
+        tabla.column(c, width=90 if c in ("resultado", "prob") else 180, anchor="w")
+    scroll = ttk.Scrollbar(marco, orient="vertical", command=tabla.yview)
+    tabla.configure(yscrollcommand=scroll.set)
+    tabla.pack(side="left", fill="both", expand=True)
+    scroll.pack(side="right", fill="y")
+
+    cola = queue.Queue()  # Mensajes del hilo de escaneo hacia la interfaz
+    cancelado = threading.Event()  # Se activa al cerrar la ventana
+    def cerrar():
+        cancelado.set()
+        ventana.destroy()
+    ventana.protocol("WM_DELETE_WINDOW", cerrar)
+
+    def revisar_cola():  # Vacía la cola en el hilo de Tk (la tabla solo se toca aquí)
+        if cancelado.is_set():
+            return
+        try:
+            while True:
+                tipo, dato = cola.get_nowait()
+                if tipo == "fila":
+                    tabla.insert("", "end", values=dato)  # La última columna: ruta, o el motivo del ERROR
+                elif tipo == "progreso":
+                    barra["value"] = dato
+                    estado.set(f"{dato} / {len(archivos)} archivos")
+                elif tipo == "fin":
+                    estado.set(f"Listo: {len(archivos)} archivos clasificados")
+                    return
+        except queue.Empty:
+            pass
+        root.after(POLL_MS * 3, revisar_cola)  # Vuelve a revisar más tarde
+
+    threading.Thread(target=_escanear_en_fondo, args=(archivos, cola, cancelado), daemon=True).start()
+    revisar_cola()
+
 btn_analizar.config(command=analizar)  # Asigna función analizar al botón
 btn_abrir.config(command=abrir_archivo)  # Asigna función abrir_archivo al botón
 btn_limpiar.config(command=limpiar)  # Asigna función limpiar al botón
+btn_carpeta.config(command=escanear_carpeta)  # Asigna función escanear_carpeta al botón
 
 # ======= Carga del modelo (hilo en segundo plano) =======  # Evita bloquear la UI mientras se carga el modelo
 def cargar_modelo():  # Función que inicializa el clasificador
     global clf  # Usará la variable global clf
     status_var.set("Modelo: Cargando…")  # Actualiza estado en la UI
+    base = Path(__file__).resolve().parent  # Directorio del archivo actual
+    modelo = base / "modelo" / "modelo_spam.npz"  # Modelo exportado (EmailSpamClassifier.exportar)
+    csv_default = base / "datasets" / "spam_ham_dataset2.csv"  # Ruta por defecto del CSV
+    if not modelo_desactualizado(modelo, csv_default):  # Camino rápido: sin entrenar y sin importar scikit-learn
+        try:
+            clf = Puntuador(modelo)  # Carga vocabulario y log-probabilidades
+            status_var.set("Modelo: Listo ✅")
+            return
+        except Exception:  # Archivo dañado o de otra versión: se vuelve a entrenar
+            pass
+    from DeteccionDeSpam import EmailSpamClassifier  # Entrenar sí necesita pandas y scikit-learn (se importan aquí)
     try:
-        base = Path(__file__).resolve().parent  # Directorio del archivo actual
-        csv_default = base / "datasets" / "spam_ham_dataset2.csv"  # Ruta por defecto del CSV
         clf = EmailSpamClassifier(csv_path=csv_default)  # Crea el clasificador con ruta al CSV
         status_var.set("Modelo: Listo ✅")  # Actualiza estado a listo
+        try:
+            clf.exportar(modelo)  # La próxima vez arranca con Puntuador
+        except OSError:  # Carpeta sin permisos de escritura: solo se pierde el arranque rápido
+            pass
     except Exception as e:  # Si falla la carga del CSV, usa fallback
         clf = EmailSpamClassifier(csv_path="__FALTA__")  # Inicializa con dataset mínimo interno
         status_var.set("Modelo: fallback ⚠ (sin CSV)")  # Indica modo fallback en la UI
@@ -0,0 +1,55 @@
+
+# Normalización de texto para las características del clasificador
+#
+# limpiar_texto(t) = minúsculas + sin acentos (NFKD → ASCII) + palabras [a-z0-9]+ separadas
+# por un espacio. Se aplica al asunto, al cuerpo, a cada segmento de dominio y de URL y al
+# nombre de cada adjunto, así que casi todas las entradas son ASCII puro:
+#   - ASCII: una sola pasada de str.translate (letras y números quedan, todo lo demás pasa
+#     a ser espacio) y split/join; sin NFKD, sin codificar/decodificar y sin regex.
+#   - Con caracteres no ASCII: NFKD + ASCII como antes (en C es más rápido que resolver
+#     carácter por carácter) y la misma pasada de translate en lugar de la regex.
+# El resultado es idéntico al de la versión anterior (ver Benchmark_normalizacion.py).
+
+import unicodedata                       # Normalización NFKD (separa letras y acentos)
+
+# Tras minúsculas + NFKD + ASCII, solo [a-z0-9] forma palabras; cualquier otro carácter
+# (incluidas mayúsculas que aparezcan después de NFKD, p. ej. "ℌ" → "H") separa palabras
+_PALABRA = set("abcdefghijklmnopqrstuvwxyz0123456789")
+TABLA_ASCII = str.maketrans({i: (chr(i) if chr(i) in _PALABRA else " ") for i in range(128)})
+
+# Separador de textos en limpiar_lote (se conserva en la traducción para volver a dividir)
+_SEP = "\x00"
+_TABLA_LOTE = str.maketrans({**TABLA_ASCII, ord(_SEP): _SEP})
+
+
+def quitar_acentos(t: str) -> str:                 # Quita acentos de un texto dado
+    t = unicodedata.normalize('NFKD', t)           # Normaliza el texto separando letras y acentos
+    return t.encode('ascii', 'ignore').decode('utf-8')  # Convierte a ASCII eliminando acentos
+
+
+def limpiar_texto(t: str) -> str:                  # Limpia el texto para procesamiento
+    t = (t or "").lower()                          # Minúsculas (igual que antes: antes de NFKD)
+    if not t.isascii():                            # Camino lento solo si hay caracteres no ASCII
+        t = quitar_acentos(t)
+    return " ".join(t.translate(TABLA_ASCII).split())  # Una pasada: palabras separadas por un espacio
+
+
+def limpiar_lote(textos) -> list[str]:
+    """
+    limpiar_texto sobre muchos textos con una sola llamada de cada paso (minúsculas, NFKD,
+    translate) sobre todos los textos unidos; rinde más con textos cortos (dominios, asuntos).
+    """
+    textos = [t or "" for t in textos]
+    unido = _SEP.join(textos).lower()
+    if unido.count(_SEP) != len(textos) - 1:       # Algún texto ya trae el separador: uno por uno
+        return [limpiar_texto(t) for t in textos]
+    if not unido.isascii():
+        unido = quitar_acentos(unido)              # NFKD no mezcla caracteres a ambos lados del separador
+    return [" ".join(p.split()) for p in unido.translate(_TABLA_LOTE).split(_SEP)]
+
+
+def limpiar_serie(serie):
+    """limpiar_lote sobre una Serie de pandas (mismo índice; los NaN quedan como texto vacío)."""
+    import pandas as pd                            # Solo quien limpia Series necesita pandas
+    valores = [t if isinstance(t, str) else "" for t in serie.tolist()]
+    return pd.Series(limpiar_lote(valores), index=serie.index, dtype=object)
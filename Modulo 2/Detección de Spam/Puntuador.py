@@ -0,0 +1,145 @@
+
+# Puntuador ligero: clasifica correos con un modelo exportado (EmailSpamClassifier.exportar)
+#
+# Solo importa NumPy, re y Caracteristicas/Normalizacion: no carga pandas ni scikit-learn,
+# así que la interfaz gráfica, el CLI y el servidor arrancan rápido (ver Benchmark_arranque.py)
+# y nunca descargan nada. Reproduce el vectorizador de scikit-learn por palabras
+# (minúsculas, token_pattern, n-gramas, conteos × IDF y norma L2) y la misma regla ls > lh.
+#
+# Uso:
+#   EmailSpamClassifier(...).exportar("modelo/modelo_spam.npz")   # una vez, con scikit-learn
+#   clf = cargar_modelo("modelo/modelo_spam.npz")                 # después, solo NumPy
+#   clf.prob_spam_lote([(remitente, asunto, contenido), ...])
+
+import re                                          # token_pattern del vectorizador
+from pathlib import Path                           # Manejo de rutas de archivos
+import numpy as np                                 # Conteos, IDF y productos por lotes
+from Caracteristicas import texto_enriquecido      # Mismo texto enriquecido que el clasificador
+from Normalizacion import limpiar_texto            # Limpieza de textos sueltos
+
+class Puntuador:
+    """Misma interfaz de puntuación que EmailSpamClassifier, a partir de un .npz exportado."""
+
+    def __init__(self, ruta):
+        with np.load(ruta, allow_pickle=False) as z:  # Sin pickle: el archivo solo trae arreglos
+            self.motor = str(z["motor"])
+            terminos = z["terminos"].tobytes().decode("utf-8")
+            self.vocabulario = {t: i for i, t in enumerate(terminos.split("\n"))} if terminos else {}
+            self.idf = z["idf"] if z["idf"].size else None  # Solo el motor "tfidf" tiene IDF
+            self.log_P_spam = float(z["log_P_spam"])
+            self.log_P_no_spam = float(z["log_P_no_spam"])
+            self.log_feat_spam = z["log_feat_spam"]
+            self.log_feat_ham = z["log_feat_ham"]
+            self.ngramas = tuple(int(n) for n in z["ngramas"])
+            self.token_re = re.compile(str(z["patron"]))
+            self.minusculas = bool(z["minusculas"])
+            self.norma = str(z["norma"]) or None
+        if self.norma not in (None, "l2"):
+            raise ValueError(f"Norma no soportada: {self.norma}")
+        self.ruta = Path(ruta)
+
+    # ============ VECTORIZACIÓN (igual que scikit-learn, analyzer="word") ============
+
+    def _terminos(self, texto: str) -> list[str]:  # Tokens y n-gramas en el orden de scikit-learn
+        if self.minusculas:
+            texto = texto.lower()
+        tokens = self.token_re.findall(texto)
+        min_n, max_n = self.ngramas
+        if max_n == 1:
+            return tokens
+        salida = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            salida += [" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+        return salida
+
+    def _log_post_lote(self, textos: list[str]):     # Log-probabilidades de SPAM y HAM para varios textos
+        n, V = len(textos), max(len(self.vocabulario), 1)
+        vocab = self.vocabulario
+        filas, cols = [], []
+        for i, t in enumerate(textos):               # Índices del vocabulario de cada texto (los demás se ignoran)
+            idx = [j for j in map(vocab.get, self._terminos(t)) if j is not None]
+            cols += idx
+            filas += [i] * len(idx)
+        claves, conteo = np.unique(np.asarray(filas, dtype=np.int64) * V + np.asarray(cols, dtype=np.int64),
+                                   return_counts=True)  # Conteo por (texto, término)
+        f, c = claves // V, claves % V
+        x = conteo.astype(np.float64)
+        if self.idf is not None:                     # TF-IDF: conteo × IDF
+            x *= self.idf[c]
+        if self.norma == "l2":                       # Cada fila con norma euclidiana 1
+            norma = np.sqrt(np.bincount(f, weights=x * x, minlength=n))
+            norma[norma == 0] = 1.0
+            x /= norma[f]
+        ls = self.log_P_spam + np.bincount(f, weights=x * self.log_feat_spam[c], minlength=n)
+        lh = self.log_P_no_spam + np.bincount(f, weights=x * self.log_feat_ham[c], minlength=n)
+        return ls, lh
+
+    def _log_post(self, txt_clean: str):
+        ls, lh = self._log_post_lote([txt_clean])
+        return ls[0], lh[0]
+
+    # ============ MISMAS FUNCIONES QUE EmailSpamClassifier ============
+
+    def clasificar_texto(self, txt: str) -> str:
+        ls, lh = self._log_post(limpiar_texto(txt))
+        return "spam" if ls > lh else "ham"
+
+    def prob_spam_texto(self, txt: str) -> float:
+        ls, lh = self._log_post(limpiar_texto(txt))
+        return float(1.0 / (1.0 + np.exp(lh - ls)))
+
+    def clasificar_correo(self, remitente: str, asunto: str, contenido: str) -> str:
+        return self.clasificar_correo_ext(remitente, asunto, contenido)
+
+    def prob_spam_correo(self, remitente: str, asunto: str, contenido: str) -> float:
+        return self.prob_spam_correo_ext(remitente, asunto, contenido)
+
+    def clasificar_correo_ext(self, remitente: str, asunto: str, contenido: str,
+                              enlaces: list[str] | None = None,
+                              adjuntos: list[tuple[str,str]] | None = None,
+                              palabras: str | None = None) -> str:
+        return self.analizar_correo_ext(remitente, asunto, contenido, enlaces, adjuntos, palabras)[0]
+
+    def prob_spam_correo_ext(self, remitente: str, asunto: str, contenido: str,
+                             enlaces: list[str] | None = None,
+                             adjuntos: list[tuple[str,str]] | None = None,
+                             palabras: str | None = None) -> float:
+        return self.analizar_correo_ext(remitente, asunto, contenido, enlaces, adjuntos, palabras)[1]
+
+    def analizar_correo_ext(self, remitente: str, asunto: str, contenido: str,
+                            enlaces: list[str] | None = None,
+                            adjuntos: list[tuple[str,str]] | None = None,
+                            palabras: str | None = None) -> tuple[str, float]:
+        """Etiqueta y probabilidad de SPAM con una sola pasada."""
+        ls, lh = self._log_post(texto_enriquecido(remitente, asunto, contenido, enlaces, adjuntos, palabras))
+        return ("spam" if ls > lh else "ham"), float(1.0 / (1.0 + np.exp(lh - ls)))
+
+    def prob_spam_lote(self, correos: list[tuple[str, str, str]]) -> np.ndarray:
+        """Probabilidad de SPAM de cada correo (remitente, asunto, contenido), en el mismo orden."""
+        textos = [texto_enriquecido(r, a, c, None, None) for r, a, c in correos]
+        if not textos:
+            return np.zeros(0)
+        ls, lh = self._log_post_lote(textos)
+        return 1.0 / (1.0 + np.exp(lh - ls))
+
+
+def cargar_modelo(ruta):
+    """
+    Carga un modelo persistido: .npz (exportar) → Puntuador, solo NumPy;
+    cualquier otro (.pkl de guardar) → EmailSpamClassifier, que necesita scikit-learn.
+    """
+    if Path(ruta).suffix == ".npz":
+        return Puntuador(ruta)
+    from DeteccionDeSpam import EmailSpamClassifier  # Solo para modelos .pkl
+    return EmailSpamClassifier.cargar(ruta)
+
+
+def modelo_desactualizado(ruta_modelo, csv_entrenamiento) -> bool:
+    """
+    True si falta el modelo o si el CSV de entrenamiento se modificó después de guardarlo
+    (compara fechas de modificación: no hay que leer ni el CSV ni el modelo).
+    """
+    ruta_modelo, csv_entrenamiento = Path(ruta_modelo), Path(csv_entrenamiento)
+    if not ruta_modelo.exists():
+        return True
+    return csv_entrenamiento.exists() and csv_entrenamiento.stat().st_mtime > ruta_modelo.stat().st_mtime
@@ -0,0 +1,283 @@
+
+# Servicio HTTP/JSON local para puntuar correos con EmailSpamClassifier
+#
+# Uso:
+#   python Servidor_Spam.py --puerto 8765 --max-lote 64 --max-espera-ms 5 [--cache 50000 --cache-hamming 2]
+#
+# Rutas:
+#   POST /score        {"remitente": ..., "asunto": ..., "contenido": ...}
+#   POST /score_batch  {"correos": [{"remitente": ..., "asunto": ..., "contenido": ...}, ...]}
+#   GET  /metrics      Latencias p50/p99 y contadores de rendimiento
+#   GET  /health       Estado del servicio
+#
+# Las peticiones concurrentes se agrupan en micro-lotes (por tamaño máximo o por
+# tiempo máximo de espera) y cada micro-lote se puntúa con una sola llamada
+# vectorizada a prob_spam_lote. Con --modelo .npz (EmailSpamClassifier.exportar) el servicio
+# puntúa con Puntuador y no importa scikit-learn ni pandas. Con --cache N, los correos
+# repetidos o casi idénticos (campañas) se responden desde CacheCampanas y /metrics
+# incluye sus aciertos. Cuerpos de más de MAX_CUERPO bytes se rechazan con 413.
+
+import argparse, json, queue, threading, time  # CLI, JSON, cola entre hilos, hilos y medición de tiempo
+from collections import deque                   # Ventana acotada de latencias recientes
+from concurrent.futures import Future           # Resultado diferido que recibe cada petición
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Servidor HTTP de la biblioteca estándar
+from pathlib import Path                        # Manejo de rutas de archivos
+from Puntuador import cargar_modelo             # .npz → Puntuador (NumPy); .pkl → EmailSpamClassifier
+from Cache_campanas import CacheCampanas         # Caché de correos casi idénticos (opcional)
+
+MAX_CUERPO = 8 << 20                            # Bytes máximos de un cuerpo JSON (8 MiB)
+
+# ------------------- MÉTRICAS -------------------
+
+class MetricasServicio:
+    """Acumula latencias (ventana acotada) y contadores de mensajes, peticiones y lotes."""
+
+    def __init__(self, ventana: int = 10000):
+        self._lock = threading.Lock()                # Protege los contadores (los escriben varios hilos)
+        self._latencias = deque(maxlen=ventana)      # Latencias recientes en segundos
+        self._recientes = deque(maxlen=ventana)      # (instante, n_mensajes) para el rendimiento reciente
+        self.inicio = time.perf_counter()            # Momento de arranque del servicio
+        self.peticiones = 0                          # Peticiones HTTP atendidas
+        self.mensajes = 0                            # Correos puntuados
+        self.lotes = 0                               # Micro-lotes ejecutados
+        self.errores = 0                             # Peticiones que terminaron en error
+
+    def registrar_peticion(self, latencia: float, n_mensajes: int):
+        with self._lock:
+            self._latencias.append(latencia)         # Guarda la latencia de extremo a extremo
+            self._recientes.append((time.perf_counter(), n_mensajes))
+            self.peticiones += 1
+            self.mensajes += n_mensajes
+
+    def registrar_lote(self):
+        with self._lock:
+            self.lotes += 1
+
+    def registrar_error(self):
+        with self._lock:
+            self.errores += 1
+
+    @staticmethod
+    def _percentil(ordenadas: list[float], p: float) -> float:
+        if not ordenadas:                            # Sin datos todavía
+            return 0.0
+        i = min(len(ordenadas) - 1, int(round(p / 100.0 * (len(ordenadas) - 1))))  # Índice del percentil
+        return ordenadas[i]
+
+    def resumen(self) -> dict:
+        with self._lock:                             # Copia consistente de los datos
+            lat = sorted(self._latencias)
+            recientes = list(self._recientes)
+            peticiones, mensajes, lotes, errores = self.peticiones, self.mensajes, self.lotes, self.errores
+        ahora = time.perf_counter()
+        transcurrido = max(ahora - self.inicio, 1e-9)
+        ultimos = [n for (t, n) in recientes if ahora - t <= 10.0]  # Mensajes de los últimos 10 segundos
+        return {
+            "peticiones": peticiones,
+            "mensajes": mensajes,
+            "lotes": lotes,
+            "errores": errores,
+            "mensajes_por_lote": (mensajes / lotes) if lotes else 0.0,
+            "latencia_p50_ms": self._percentil(lat, 50) * 1000.0,
+            "latencia_p99_ms": self._percentil(lat, 99) * 1000.0,
+            "mensajes_por_seg": mensajes / transcurrido,          # Promedio desde el arranque
+            "mensajes_por_seg_10s": sum(ultimos) / min(10.0, transcurrido),  # Ventana reciente
+            "uptime_s": transcurrido,
+        }
+
+# ------------------- MICRO-LOTES -------------------
+
+class MicroLotes:
+    """
+    Agrupa peticiones concurrentes en micro-lotes antes de puntuarlas.
+
+    Un único hilo consume la cola: toma la primera petición pendiente y sigue
+    juntando más hasta llenar `max_lote` correos o agotar `max_espera_ms`.
+    Después puntúa todo el lote con una sola llamada y reparte los resultados.
+    """
+
+    def __init__(self, clf, metricas: MetricasServicio,
+                 max_lote: int = 64, max_espera_ms: float = 5.0):
+        self.clf = clf                               # Modelo ya entrenado (se carga una sola vez)
+        self.metricas = metricas
+        self.max_lote = max(1, int(max_lote))        # Máximo de correos por micro-lote
+        self.max_espera = max(0.0, max_espera_ms) / 1000.0  # Espera máxima en segundos
+        self._cola: queue.Queue = queue.Queue()      # Peticiones pendientes: (correos, Future)
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+
+    def enviar(self, correos: list[tuple[str, str, str]]) -> Future:
+        """Encola una lista de correos y devuelve un Future con sus probabilidades."""
+        fut: Future = Future()
+        self._cola.put((correos, fut))
+        return fut
+
+    def _bucle(self):
+        while True:
+            pendientes = [self._cola.get()]          # Bloquea hasta que llegue la primera petición
+            total = len(pendientes[0][0])
+            limite = time.perf_counter() + self.max_espera
+            while total < self.max_lote:             # Junta más peticiones mientras quepan en el lote
+                restante = limite - time.perf_counter()
+                try:
+                    item = self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait()
+                except queue.Empty:                  # Se agotó el tiempo de espera
+                    break
+                pendientes.append(item)
+                total += len(item[0])
+            self._puntuar(pendientes)
+
+    def _puntuar(self, pendientes):
+        correos = [c for (cs, _) in pendientes for c in cs]  # Aplana todas las peticiones en un solo lote
+        try:
+            probs = self.clf.prob_spam_lote(correos)  # Una sola pasada vectorizada
+        except Exception as e:                        # Propaga el error a cada petición del lote
+            for _, fut in pendientes:
+                fut.set_exception(e)
+            return
+        self.metricas.registrar_lote()
+        i = 0
+        for cs, fut in pendientes:                    # Reparte los resultados en orden
+            fut.set_result(probs[i:i + len(cs)])
+            i += len(cs)
+
+# ------------------- HTTP -------------------
+
+class CuerpoDemasiadoGrande(ValueError):
+    """Content-Length mayor que MAX_CUERPO (respuesta 413)."""
+
+def _correo_de_json(d) -> tuple[str, str, str]:
+    if not isinstance(d, dict):
+        raise ValueError("Cada correo debe ser un objeto JSON.")
+    return (str(d.get("remitente") or ""), str(d.get("asunto") or ""), str(d.get("contenido") or ""))
+
+def _resultado(p: float) -> dict:
+    return {"etiqueta": "spam" if p > 0.5 else "ham", "prob_spam": float(p)}  # Misma regla que ls > lh
+
+class ManejadorSpam(BaseHTTPRequestHandler):
+    """Atiende /score, /score_batch, /metrics y /health."""
+
+    lotes: MicroLotes = None                          # Se asignan al crear el servidor
+    metricas: MetricasServicio = None
+    protocol_version = "HTTP/1.1"                     # Conexiones persistentes (keep-alive)
+    disable_nagle_algorithm = True                    # TCP_NODELAY: sin él, cada respuesta keep-alive espera ~40 ms al ACK
+
+    def log_message(self, fmt, *args):                # Silencia el log por petición (miles por segundo)
+        pass
+
+    def _responder(self, codigo: int, cuerpo: dict):
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def _leer_cuerpo(self) -> bytes:
+        """Cuerpo de la petición; un Content-Length inválido o excesivo cierra la conexión."""
+        largo = self.headers.get("Content-Length") or "0"
+        if not largo.strip().isdigit():              # No numérico o negativo: read() no sabría cuánto leer
+            self.close_connection = True             # El cuerpo queda sin leer: no se reutiliza la conexión
+            raise ValueError("Content-Length inválido.")
+        largo = int(largo)
+        if largo > MAX_CUERPO:
+            self.close_connection = True
+            raise CuerpoDemasiadoGrande(f"El cuerpo supera {MAX_CUERPO} bytes.")
+        return self.rfile.read(largo)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            resumen = self.metricas.resumen()
+            clf = self.lotes.clf
+            if isinstance(clf, CacheCampanas):        # Aciertos de la caché de campañas
+                resumen["cache"] = clf.metricas()
+            self._responder(200, resumen)
+        elif self.path == "/health":
+            self._responder(200, {"estado": "ok"})
+        else:
+            self._responder(404, {"error": "Ruta no encontrada."})
+
+    def do_POST(self):
+        t0 = time.perf_counter()
+        try:
+            datos = json.loads(self._leer_cuerpo() or b"{}")
+            if self.path == "/score":
+                correos = [_correo_de_json(datos)]
+            elif self.path == "/score_batch":
+                lista = datos.get("correos") if isinstance(datos, dict) else None
+                if not isinstance(lista, list):
+                    raise ValueError("Se esperaba {'correos': [...]}.")
+                correos = [_correo_de_json(d) for d in lista]
+            else:
+                self._responder(404, {"error": "Ruta no encontrada."})
+                return
+        except CuerpoDemasiadoGrande as e:
+            self.metricas.registrar_error()
+            self._responder(413, {"error": str(e)})
+            return
+        except (ValueError, json.JSONDecodeError) as e:  # JSON inválido o forma incorrecta
+            self.metricas.registrar_error()
+            self._responder(400, {"error": str(e)})
+            return
+
+        try:
+            probs = self.lotes.enviar(correos).result() if correos else []  # Espera al micro-lote
+        except Exception as e:
+            self.metricas.registrar_error()
+            self._responder(500, {"error": str(e)})
+            return
+
+        self.metricas.registrar_peticion(time.perf_counter() - t0, len(correos))
+        if self.path == "/score":
+            self._responder(200, _resultado(probs[0]))
+        else:
+            self._responder(200, {"resultados": [_resultado(p) for p in probs]})
+
+class ServidorSpam(ThreadingHTTPServer):
+    """Servidor con un hilo por conexión y una cola de conexiones amplia para ráfagas de peticiones."""
+    daemon_threads = True                             # Los hilos no impiden cerrar el proceso
+    request_queue_size = 1024                         # Backlog de listen(); el valor por defecto (5) se desborda
+
+def crear_servidor(clf, host: str = "127.0.0.1", puerto: int = 8765,
+                   max_lote: int = 64, max_espera_ms: float = 5.0) -> ServidorSpam:
+    """Crea (sin arrancar) el servidor HTTP con su propio agrupador de micro-lotes."""
+    metricas = MetricasServicio()
+    manejador = type("ManejadorSpamConfigurado", (ManejadorSpam,), {
+        "lotes": MicroLotes(clf, metricas, max_lote, max_espera_ms),
+        "metricas": metricas,
+    })
+    return ServidorSpam((host, puerto), manejador)
+
+def main():
+    ap = argparse.ArgumentParser(description="Servicio HTTP local de detección de spam.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--puerto", type=int, default=8765)
+    ap.add_argument("--modelo", default=None, help="Modelo exportado con EmailSpamClassifier.exportar() (.npz) o guardado con guardar() (.pkl).")
+    ap.add_argument("--csv", default=None, help="Dataset de entrenamiento si no se usa --modelo (por defecto datasets/spam_ham_dataset2.csv).")
+    ap.add_argument("--max-lote", type=int, default=64, help="Máximo de correos por micro-lote.")
+    ap.add_argument("--max-espera-ms", type=float, default=5.0, help="Espera máxima para completar un micro-lote.")
+    ap.add_argument("--cache", type=int, default=0, help="Capacidad de la caché de campañas (0 = sin caché).")
+    ap.add_argument("--cache-hamming", type=int, default=2, help="Distancia de Hamming máxima entre huellas para reutilizar un resultado.")
+    ap.add_argument("--cache-verificar", type=float, default=0.0, help="Fracción de aciertos que se vuelve a puntuar para medir discrepancias.")
+    args = ap.parse_args()
+
+    print("Cargando modelo…")
+    if args.modelo:                                   # El modelo se carga una sola vez para todo el servicio
+        clf = cargar_modelo(args.modelo)
+    else:
+        from DeteccionDeSpam import EmailSpamClassifier  # scikit-learn solo si hay que entrenar
+        csv_path = args.csv or Path(__file__).resolve().parent / "datasets" / "spam_ham_dataset2.csv"
+        clf = EmailSpamClassifier(csv_path=csv_path)
+    if args.cache > 0:                                # Campañas de spam: responde lo casi repetido sin puntuar
+        clf = CacheCampanas(clf, capacidad=args.cache, max_hamming=args.cache_hamming, verificar=args.cache_verificar)
+    servidor = crear_servidor(clf, args.host, args.puerto, args.max_lote, args.max_espera_ms)
+    print(f"Escuchando en http://{args.host}:{args.puerto} (max_lote={args.max_lote}, max_espera_ms={args.max_espera_ms})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+
+# Pruebas del extractor de enlaces y adjuntos en una sola pasada (Config_regex.py)
+#
+# extraer_enlaces_y_adjuntos (TOKENS_RE + inicio_nombre_adjunto) debe devolver exactamente
+# lo mismo que la extracción anterior con dos expresiones (URL_RE y el ADJUNTO_RE original,
+# copiado en Benchmark_regex.extraer_anterior) en casos límite de URLs y nombres de archivo.
+#
+# Uso:
+#   python -m pytest -q tests
+
+import os, sys                                  # Importar los módulos de la carpeta superior
+import pytest                                   # Casos parametrizados
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Benchmark_regex import casos, extraer_anterior  # Implementación anterior (dos recorridos)
+from Config_regex import extraer_enlaces_y_adjuntos  # Implementación actual (un recorrido)
+
+CASOS = [
+    "",
+    "sin enlaces ni adjuntos",
+    "abre factura.pdf ya",
+    "Reporte Final Q3.xlsx, gracias",           # Nombre de varias palabras
+    "tab\tseparado\tinforme.docx",               # Palabras unidas por tabs
+    "línea\ninforme.doc",                        # El salto de línea corta el nombre
+    "  dos  espacios.doc",
+    "mi archivo.tar.gz",                         # Dos extensiones
+    "abc.def.ghi.jkl",
+    "a.b.c",
+    "archivo.extensionlarga",                    # Extensión de más de 6 caracteres
+    "archivo .pdf",
+    "archivo. pdf",
+    "fin con punto archivo.pdf.",
+    "file.PDF:",                                 # Extensión en mayúsculas (se devuelve en minúsculas)
+    "uno.exe;dos.bat",
+    "archivo.pdf)",
+    "¿archivo.pdf?",
+    "texto(nota).txt",
+    "(nota.txt)",
+    "[a].zip!",
+    "&amp.js",
+    "a - b.exe",
+    "niño_año.PDF",                              # Nombre con letras no ASCII
+    "x.y1 z.7z",
+    "v1.2 beta",
+    "correo@ejemplo.com",
+    "https://x.com/a.pdf y doc.pdf",             # El .pdf dentro de la URL no es un adjunto
+    "HTTPS://EJEMPLO.COM/Factura.PDF",           # Esquema en mayúsculas
+    "visita http://a.b/c?d=e.pdf&f=g.zip",
+    "urlpegada.pdfhttps://a.com",
+    "ftp://x.com/a.zip",
+    "http:/mal.com/a.zip",
+    "see invoice.pdſ now",                  # ſ (U+017F) no es una letra ASCII de extensión
+    "termometro.K",                         # Signo Kelvin (U+212A)
+]
+
+
+@pytest.mark.parametrize("texto", CASOS)
+def test_igual_que_dos_expresiones(texto):
+    assert extraer_enlaces_y_adjuntos(texto) == extraer_anterior(texto)
+
+
+@pytest.mark.parametrize("nombre, texto", sorted(casos(200).items()))
+def test_entradas_patologicas(nombre, texto):
+    assert extraer_enlaces_y_adjuntos(texto) == extraer_anterior(texto)
+
+
+def test_resultados_esperados():
+    assert extraer_enlaces_y_adjuntos("Hola, revisa https://ejemplo.com/factura y el reporte final.pdf gracias") == (
+        ["https://ejemplo.com/factura"], [("y el reporte final.pdf", "pdf")])
+    assert extraer_enlaces_y_adjuntos("see invoice.pdſ now") == ([], [])
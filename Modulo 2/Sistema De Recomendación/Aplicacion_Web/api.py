@@ -0,0 +1,317 @@
+
+# ------------------------------------------------------------
+# API HTTP/JSON de recomendaciones (sin Streamlit ni pósters)
+# ------------------------------------------------------------
+# Servidor local con la librería estándar (http.server) sobre el mismo motor y los mismos
+# artefactos mapeados en memoria que la app. Solo devuelve IDs, títulos y similitudes.
+#
+# Endpoints:
+#   GET  /recommend?movie_id=19995&k=5        → recomendaciones de una película
+#   GET  /recommend_many?movie_ids=1,2,3&k=5  → varias películas en una sola petición
+#   POST /recommend_many  {"movie_ids": [1, 2, 3], "k": 5}
+#   POST /recommend_profile   {"seeds": [[19995, 1.0], [285, 0.5]], "k": 10}  → historial de un usuario
+#   POST /recommend_profiles  {"profiles": [[[19995, 1.0]], [[285, 1.0], [206647, 2.0]]], "k": 10}
+#   GET  /metrics                              → histogramas de latencia por endpoint
+#   GET  /search?q=dark%20kn&limit=10          → títulos que empiezan por el texto (typeahead)
+#   GET  /health                               → estado y tamaño del catálogo
+#
+# Uso:
+#   python api.py [--host 127.0.0.1] [--port 8000]
+
+# Importamos las librerías necesarias
+import argparse                     # Argumentos de línea de comandos
+import bisect                       # Cubeta de cada latencia en el histograma
+import json                         # Peticiones y respuestas JSON
+import math                         # Pesos finitos (sin inf ni nan)
+import threading                    # Candado de los histogramas (un hilo por conexión)
+import time                         # Medición de latencia
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from engine import RecommendationEngine
+from artifacts import load_artifacts, load_embeddings, load_title_index
+
+# Límites de las peticiones
+MAX_K = 100
+MAX_BATCH = 1000
+MAX_BODY = 1 << 20
+
+# Rutas POST: método de RecommendationApi y campo del cuerpo con los datos
+POST_ROUTES = {
+    "/recommend_many": ("recommend_many", "movie_ids"),
+    "/recommend_profile": ("recommend_profile", "seeds"),
+    "/recommend_profiles": ("recommend_profiles", "profiles"),
+}
+
+# Límites superiores de las cubetas del histograma (segundos): 25 µs, 50 µs, ... ~13 s
+LATENCY_BUCKETS = tuple(25e-6 * 2 ** i for i in range(20))
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias con cubetas fijas (límites que se duplican), seguro entre hilos.
+    Los percentiles se aproximan con el límite superior de la cubeta donde caen.
+    """
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # Última cubeta: más que el mayor límite
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.total += seconds
+
+    def _percentile(self, counts, n, q):
+        target, seen = q * n, 0
+        for bound, count in zip(self.bounds + (float("inf"),), counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        """Resumen en un diccionario serializable a JSON (tiempos en milisegundos)."""
+        with self._lock:
+            counts, total = list(self.counts), self.total
+        n = sum(counts)
+        ms = lambda s: None if s == float("inf") else round(s * 1e3, 3)
+        return {
+            "count": n,
+            "mean_ms": round(total / n * 1e3, 3) if n else None,
+            "p50_ms": ms(self._percentile(counts, n, 0.50)) if n else None,
+            "p99_ms": ms(self._percentile(counts, n, 0.99)) if n else None,
+            # Cubetas no vacías: "le" = límite superior en ms (None = sin límite)
+            "buckets": [{"le": ms(b), "count": c}
+                        for b, c in zip(self.bounds + (float("inf"),), counts) if c],
+        }
+
+
+class ApiError(Exception):
+    """Error de la petición con su código HTTP."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RecommendationApi:
+    """Lógica de los endpoints (independiente del servidor HTTP, se puede llamar desde código)."""
+
+    def __init__(self, engine: RecommendationEngine):
+        self.engine = engine
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, endpoint):
+        with self._lock:
+            return self.histograms.setdefault(endpoint, LatencyHistogram())
+
+    # --------------------------------------------------------
+    # Validación de parámetros
+    # --------------------------------------------------------
+    @staticmethod
+    def _int(value, name):
+        if isinstance(value, bool):   # int(True) == 1: en JSON "k": true no es un entero
+            raise ApiError(400, f"'{name}' debe ser un entero.")
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ApiError(400, f"'{name}' debe ser un entero.") from None
+
+    def _k(self, value):
+        k = 5 if value is None else self._int(value, "k")
+        if not 1 <= k <= MAX_K:
+            raise ApiError(400, f"'k' debe estar entre 1 y {MAX_K}.")
+        return k
+
+    def _item(self, movie_id, k):
+        try:
+            row = self.engine.row_of_id(movie_id)
+        except KeyError:
+            return None
+        return {
+            "movie_id": int(movie_id),
+            "title": self.engine.titles[row],
+            "recommendations": [{"movie_id": m, "title": t, "score": round(s, 6)}
+                                for m, t, s in self.engine.recommend_row(row, k)],
+        }
+
+    # --------------------------------------------------------
+    # Endpoints
+    # --------------------------------------------------------
+    def recommend(self, movie_id, k=None):
+        item = self._item(self._int(movie_id, "movie_id"), self._k(k))
+        if item is None:
+            raise ApiError(404, f"Película no encontrada: {movie_id}")
+        return item
+
+    def recommend_many(self, movie_ids, k=None):
+        if not isinstance(movie_ids, list) or not movie_ids:
+            raise ApiError(400, "'movie_ids' debe ser una lista no vacía.")
+        if len(movie_ids) > MAX_BATCH:
+            raise ApiError(400, f"Como máximo {MAX_BATCH} películas por petición.")
+        k = self._k(k)
+        ids = [self._int(m, "movie_ids") for m in movie_ids]
+        results = [self._item(m, k) for m in ids]
+        return {
+            "results": [r for r in results if r is not None],
+            "not_found": [m for m, r in zip(ids, results) if r is None],
+        }
+
+    def _seeds(self, seeds):
+        """Valida una lista de semillas [[movie_id, peso], ...]."""
+        if not isinstance(seeds, list):
+            raise ApiError(400, "Cada perfil debe ser una lista de [movie_id, peso].")
+        try:
+            parsed = [(self._int(movie_id, "movie_id"), float(weight)) for movie_id, weight in seeds]
+        except (TypeError, ValueError):
+            raise ApiError(400, "Cada semilla debe ser [movie_id, peso].") from None
+        # "inf" daría similitudes infinitas (JSON inválido) y "nan" descartaría candidatos en silencio
+        if not all(math.isfinite(weight) for _, weight in parsed):
+            raise ApiError(400, "Los pesos deben ser números finitos.")
+        return parsed
+
+    def recommend_profile(self, seeds, k=None):
+        k = self._k(k)
+        return {"recommendations": [{"movie_id": m, "title": t, "score": round(s, 6)}
+                                    for m, t, s in self.engine.recommend_profile(self._seeds(seeds), k)]}
+
+    def recommend_profiles(self, profiles, k=None):
+        if not isinstance(profiles, list) or not profiles:
+            raise ApiError(400, "'profiles' debe ser una lista no vacía.")
+        if len(profiles) > MAX_BATCH:
+            raise ApiError(400, f"Como máximo {MAX_BATCH} perfiles por petición.")
+        k = self._k(k)
+        rows, scores = self.engine.profile_top_k([self._seeds(p) for p in profiles], k)
+        return {"results": [[{"movie_id": int(self.engine.movie_ids[r]), "score": round(float(s), 6)}
+                             for r, s in zip(row, score) if r >= 0]
+                            for row, score in zip(rows, scores)]}
+
+    def search(self, query, limit=None):
+        limit = 10 if limit is None else self._int(limit, "limit")
+        if not 1 <= limit <= MAX_K:
+            raise ApiError(400, f"'limit' debe estar entre 1 y {MAX_K}.")
+        return {"results": [{"movie_id": m, "title": t} for m, t in self.engine.search(query or "", limit)]}
+
+    def metrics(self):
+        with self._lock:
+            endpoints = dict(self.histograms)
+        return {name: h.snapshot() for name, h in sorted(endpoints.items())}
+
+    def health(self):
+        return {"status": "ok", "movies": len(self.engine)}
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Traduce las peticiones HTTP a RecommendationApi y mide la latencia de cada una."""
+
+    protocol_version = "HTTP/1.1"   # Conexiones persistentes (keep-alive) para clientes con mucho tráfico
+    disable_nagle_algorithm = True  # Cabeceras y cuerpo se envían por separado: sin TCP_NODELAY cada respuesta espera ~40 ms
+    api: RecommendationApi = None   # Se asigna en make_server()
+
+    def log_request(self, code="-", size="-"):
+        pass   # Sin una línea de log por petición (las métricas están en /metrics); los errores sí se registran
+
+    def _send(self, status, payload):
+        try:
+            # allow_nan=False: Infinity/NaN no son JSON válido para los clientes
+            body = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode("utf-8")
+        except ValueError:
+            status = 500
+            body = json.dumps({"error": "Error interno: resultado no finito."}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, route):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            status, payload = 200, route(url.path, query)
+        except ApiError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": f"Error interno: {e}"}
+        self._send(status, payload)
+        if url.path in ("/recommend", "/search") or url.path in POST_ROUTES:
+            self.api.histogram(url.path).observe(time.perf_counter() - start)
+
+    def _get(self, path, query):
+        if path == "/recommend":
+            return self.api.recommend(query.get("movie_id"), query.get("k"))
+        if path == "/recommend_many":
+            ids = [m for m in query.get("movie_ids", "").split(",") if m.strip()]
+            return self.api.recommend_many(ids, query.get("k"))
+        if path == "/search":
+            return self.api.search(query.get("q"), query.get("limit"))
+        if path == "/metrics":
+            return self.api.metrics()
+        if path == "/health":
+            return self.api.health()
+        raise ApiError(404, f"Ruta desconocida: {path}")
+
+    def _post(self, path, query):
+        # El cuerpo se lee siempre (aunque la ruta no exista) para no desincronizar la conexión
+        length = (self.headers.get("Content-Length") or "0").strip()
+        if not length.isdigit():
+            # No numérico o negativo: no se sabe cuánto leer, así que la conexión no se reutiliza
+            self.close_connection = True
+            raise ApiError(400, "Content-Length inválido.")
+        length = int(length)
+        if length > MAX_BODY:
+            self.close_connection = True
+            raise ApiError(413, "Cuerpo demasiado grande.")
+        raw = self.rfile.read(length)
+        if path not in POST_ROUTES:
+            raise ApiError(404, f"Ruta desconocida: {path}")
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            raise ApiError(400, "El cuerpo debe ser JSON.") from None
+        if not isinstance(body, dict):
+            raise ApiError(400, "El cuerpo debe ser un objeto JSON.")
+        method, field = POST_ROUTES[path]
+        return getattr(self.api, method)(body.get(field), body.get("k", query.get("k")))
+
+    def do_GET(self):
+        self._handle(self._get)
+
+    def do_POST(self):
+        self._handle(self._post)
+
+
+def make_server(engine, host="127.0.0.1", port=8000):
+    """Servidor HTTP (un hilo por conexión) sobre un motor ya construido."""
+    handler = type("Handler", (RequestHandler,), {"api": RecommendationApi(engine)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="API HTTP/JSON de recomendaciones.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    args = ap.parse_args()
+
+    # Artefactos mapeados en memoria: varios procesos de la API comparten las mismas páginas
+    movies, neighbors = load_artifacts()
+    engine = RecommendationEngine(movies, neighbors=neighbors, embeddings=load_embeddings(),
+                                  title_index=load_title_index(movies))
+    server = make_server(engine, args.host, args.port)
+    print(f"API de recomendaciones en http://{args.host}:{server.server_port} ({len(movies['movie_id'])} películas)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@
 # -------------------------------------------------------------
 import streamlit as st                                     # Librería principal para crear la interfaz web interactiva
 from styles import inject_css                              # Importa la función que aplica el estilo visual (CSS)
-from services import load_models, recommend, fetch_poster  # Importa las funciones de lógica: cargar modelos, recomendar y obtener pósters
+from services import load_engine, search_titles, session_recommendation, last_recommendation  # Motor compartido, búsqueda y recomendaciones memorizadas por sesión
 
 # -------------------------------------------------------------
 # Aplicación de estilos personalizados
@@ -12,14 +12,11 @@ from services import load_models, recommend, fetch_poster  # Importa las funcion
 inject_css()  # Llama a la función definida en styles.py para aplicar el diseño visual (colores, fondo, botones, etc.)
 
 # -------------------------------------------------------------
-# Carga de modelos (archivos .pkl con los datos y similitudes)
+# Carga del modelo (artefactos .npy mapeados en memoria: películas, vecinos top-K e índice de títulos)
 # -------------------------------------------------------------
-# Muestra un spinner (animación de carga) mientras se leen los archivos pickle
+# Muestra un spinner (animación de carga) mientras load_engine() abre los .npy con mmap (una vez por proceso)
 with st.spinner('Cargando la magia del cine... ⏳'):
-    movies, similarity = load_models()  # Carga el DataFrame de películas y la matriz de similitud
-
-# Obtiene la lista de títulos de películas para el menú desplegable
-movie_list = movies['title'].values
+    engine = load_engine()  # Carga películas e índice de vecinos y construye las búsquedas una sola vez
 
 # -------------------------------------------------------------
 # Interfaz principal de la aplicación
@@ -36,18 +33,35 @@ st.markdown("✨ **Encuentra tu próxima joya cinematográfica con un solo clic.
 # Otra línea divisora
 st.markdown("---")
 
-# Crea un selectbox (lista desplegable) con las películas disponibles
-selected_movie = st.selectbox("🔎 **Selecciona una película que te guste:**", movie_list)
+# Búsqueda por título: el navegador solo recibe las coincidencias (no el catálogo completo)
+query = st.text_input("🔎 **Busca una película que te guste:**", placeholder="Escribe parte del título...")
+matches = search_titles(query, engine) if query else []
+
+# Títulos repetidos en las coincidencias: se muestran con su ID para distinguirlos
+labels = {}
+titles = [title for _, title in matches]
+for movie_id, title in matches:
+    labels[movie_id] = f"{title} (ID {movie_id})" if titles.count(title) > 1 else title
+
+# Crea un selectbox (lista desplegable) con las coincidencias; el valor elegido es el movie_id
+selected_movie_id = st.selectbox("🎬 **Selecciona la película:**", list(labels), format_func=labels.get,
+                                 index=0 if labels else None, placeholder="Sin coincidencias")
 
 # -------------------------------------------------------------
 # Sección de Recomendaciones
 # -------------------------------------------------------------
-# Cuando el usuario presiona el botón “Obtener Recomendaciones”
-if st.button('🚀 Obtener Recomendaciones'):
+# Cuando el usuario presiona el botón “Obtener Recomendaciones” se calcula (o se reutiliza, si la
+# película no cambió) la recomendación; en las demás re-ejecuciones se vuelve a mostrar la última
+# de esta sesión mientras la película seleccionada sea la misma, sin recalcular nada
+if st.button('🚀 Obtener Recomendaciones', disabled=selected_movie_id is None):
     # Muestra un spinner mientras se calculan las recomendaciones
     with st.spinner('Buscando en la galaxia del cine... 🌌'):
-        # Llama a la función recommend() pasando la película elegida, el DataFrame y la matriz de similitud
-        recommended_movie_names, recommended_movie_posters = recommend(selected_movie, movies, similarity)
+        result = session_recommendation(selected_movie_id, engine)
+else:
+    result = last_recommendation(selected_movie_id)
+
+if result is not None:
+    recommended_movie_names, recommended_movie_posters = result['names'], result['posters']
 
     # Separador visual
     st.markdown("---")
@@ -55,13 +69,10 @@ if st.button('🚀 Obtener Recomendaciones'):
     # ---------------------------------------------------------
     # Mostrar la película seleccionada por el usuario
     # ---------------------------------------------------------
-    st.subheader(f'Has Seleccionado: {selected_movie} 🌟')  # Muestra el título de la película elegida
-
-    # Obtiene el ID de la película seleccionada desde el DataFrame
-    selected_movie_id = movies[movies['title'] == selected_movie].iloc[0].movie_id
+    st.subheader(f"Has Seleccionado: {result['title']} 🌟")  # Muestra el título de la película elegida
 
-    # Descarga el póster de la película usando la función fetch_poster()
-    selected_poster = fetch_poster(selected_movie_id)
+    # Póster de la película (se descargó junto a los de las recomendaciones y quedó en la sesión)
+    selected_poster = result['selected_poster']
 
     # Divide el espacio en dos columnas (1 para la imagen, 2 para texto)
     col_img_sel, col_info_sel = st.columns([1, 2])
@@ -73,7 +84,8 @@ if st.button('🚀 Obtener Recomendaciones'):
     # Muestra el texto informativo en la segunda columna
     with col_info_sel:
         st.write("¡Una excelente elección para inspirar tus próximas aventuras fílmicas!")
-        # Ejemplos de datos adicionales que podrían mostrarse si se agregan más columnas al DataFrame:
+        # Ejemplos de datos adicionales que podrían mostrarse si se agregan más columnas a los artefactos
+        # (mejor con la fila de engine.row_of_id(selected_movie_id) que filtrando el DataFrame completo):
         # st.write(f"**Géneros:** {movies[movies['title'] == selected_movie]['genres'].iloc[0]}")
         # st.write(f"**Año:** {movies[movies['title'] == selected_movie]['release_date'].iloc[0][:4]}")
 
@@ -0,0 +1,134 @@
+
+# Importamos las librerías necesarias
+import json                         # Lectura del manifiesto
+import mmap                         # Paquete de pósters mapeado en memoria
+import os                           # Variables de entorno y rutas
+from io import BytesIO              # Índice del paquete de pósters
+from pathlib import Path            # Rutas relativas a este archivo (no al directorio de trabajo)
+import numpy as np                  # np.load(mmap_mode='r')
+from search import TitleIndex, title_lengths  # Índice de títulos por prefijo (claves de DataCleaner/Titulos.py)
+
+# ------------------------------------------------------------
+# --- Artefactos del modelo (generados por DataCleaner/Artefactos.py) ---
+# ------------------------------------------------------------
+
+# Carpeta del modelo: variable de entorno RECSYS_MODEL_DIR o ../DataCleaner/model junto a este archivo
+MODEL_DIR = Path(os.environ.get(
+    "RECSYS_MODEL_DIR",
+    Path(__file__).resolve().parent.parent / "DataCleaner" / "model",
+))
+
+# Nombres de archivo (deben coincidir con DataCleaner/Artefactos.py)
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+MOVIE_IDS = "movie_ids.npy"
+TITLES = "titles.npy"
+NEIGHBOR_INDICES = "neighbors_indices.npy"
+NEIGHBOR_SCORES = "neighbors_scores.npy"
+EMBEDDINGS = "embeddings.npy"
+TITLE_KEYS = "title_keys.npy"
+TITLE_KEY_ROWS = "title_key_rows.npy"
+TITLE_KEY_POS = "title_key_pos.npy"
+TITLE_LENGTHS = "title_lengths.npy"
+POSTER_PACK = "posters.pack"
+POSTER_MAGIC = b"RSPOSTR1"
+
+
+def load_manifest(model_dir=MODEL_DIR) -> dict:
+    """Lee manifest.json y valida la versión del formato."""
+    with open(Path(model_dir) / MANIFEST, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Formato de artefactos no soportado: {manifest.get('format_version')}")
+    return manifest
+
+
+def load_array(name: str, model_dir=MODEL_DIR, mmap: bool = True):
+    """
+    Abre un .npy del modelo. Con mmap=True no se copia a memoria: el sistema operativo
+    comparte las mismas páginas entre todos los procesos que abren el archivo.
+    """
+    return np.load(Path(model_dir) / name, mmap_mode="r" if mmap else None, allow_pickle=False)
+
+
+def load_artifacts(model_dir=MODEL_DIR, mmap: bool = True):
+    """
+    Devuelve (movies, neighbors):
+      - movies → {'movie_id': (n,) int64, 'title': (n,) str}
+      - neighbors → {'indices': (n, K) int32, 'scores': (n, K) float32}
+    Los arreglos numéricos quedan mapeados en memoria (solo lectura).
+    """
+    load_manifest(model_dir)
+    movies = {
+        "movie_id": load_array(MOVIE_IDS, model_dir, mmap),
+        # Los títulos se decodifican una vez (necesarios para el diccionario título → fila)
+        "title": np.char.decode(load_array(TITLES, model_dir, mmap), "utf-8"),
+    }
+    neighbors = {
+        "indices": load_array(NEIGHBOR_INDICES, model_dir, mmap),
+        "scores": load_array(NEIGHBOR_SCORES, model_dir, mmap),
+    }
+    return movies, neighbors
+
+
+def load_embeddings(model_dir=MODEL_DIR, mmap: bool = True):
+    """
+    Embeddings SVD (n, dim) float32 normalizados, mapeados en memoria, o None si el modelo
+    se construyó sin ellos (solo se usan si el manifiesto los registra: no hay restos viejos).
+    """
+    if EMBEDDINGS not in load_manifest(model_dir).get("files", {}):
+        return None
+    return load_array(EMBEDDINGS, model_dir, mmap)
+
+
+def load_title_index(movies, model_dir=MODEL_DIR, mmap: bool = True) -> TitleIndex:
+    """
+    Índice de búsqueda de títulos generado con el modelo (claves mapeadas en memoria).
+    Con modelos anteriores que no lo incluyen, se construye en memoria a partir de los títulos.
+    """
+    files = load_manifest(model_dir).get("files", {})
+    if TITLE_KEYS not in files:
+        return TitleIndex.from_titles(movies["movie_id"], movies["title"])
+    # Los largos de los títulos normalizados se guardan desde que existe title_lengths.npy
+    lengths = (load_array(TITLE_LENGTHS, model_dir, mmap) if TITLE_LENGTHS in files
+               else title_lengths(movies["title"]))
+    return TitleIndex(load_array(TITLE_KEYS, model_dir, mmap), load_array(TITLE_KEY_ROWS, model_dir, mmap),
+                      load_array(TITLE_KEY_POS, model_dir, mmap), lengths, movies["movie_id"], movies["title"])
+
+
+class PosterPack:
+    """
+    Lector de posters.pack (generado por DataCleaner/Descarga_posters.py).
+
+    El archivo se mapea en memoria: las miniaturas JPEG van seguidas, al final está el
+    índice (movie_id, offset, bytes) ordenado por movie_id y un pie con el offset del índice.
+    Buscar un póster es un np.searchsorted sobre los IDs; no hay llamadas de red.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start, magic = int.from_bytes(self._mm[-16:-8], "little"), self._mm[-8:]
+        if magic != POSTER_MAGIC:
+            raise ValueError(f"{path} no es un paquete de pósters válido.")
+        index = np.load(BytesIO(self._mm[start:-16]), allow_pickle=False)
+        self.movie_ids = np.ascontiguousarray(index[:, 0])
+        self.offsets = index[:, 1]
+        self.sizes = index[:, 2]
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    def get(self, movie_id):
+        """Bytes JPEG del póster, b"" si la película no tiene póster o None si no está en el paquete."""
+        i = np.searchsorted(self.movie_ids, movie_id)
+        if i == len(self.movie_ids) or self.movie_ids[i] != movie_id:
+            return None
+        offset = int(self.offsets[i])
+        return self._mm[offset:offset + int(self.sizes[i])]
+
+
+def load_poster_pack(model_dir=MODEL_DIR):
+    """Abre model/posters.pack si existe (None si todavía no se ha generado)."""
+    path = Path(model_dir) / POSTER_PACK
+    return PosterPack(path) if path.exists() else None
@@ -0,0 +1,88 @@
+
+# ------------------------------------------------------------
+# Benchmark de latencia por consulta de recomendación
+# ------------------------------------------------------------
+# Compara, por consulta:
+#   - "original": escaneo booleano de la columna 'title' + sorted(enumerate(fila)) completo
+#   - "argpartition": diccionario título → fila + np.argpartition sobre la fila densa
+#   - "vecinos": diccionario título → fila + lectura del índice top-K precalculado
+#
+# Usa un catálogo sintético de n películas (la matriz densa n×n se genera solo aquí,
+# para poder medir el método original).
+#
+# Uso:
+#   python bench_recommend.py [--n 4800] [--consultas 500] [--k 5]
+
+import argparse                     # Argumentos de línea de comandos
+import time                         # Medición de tiempo
+import numpy as np                  # Datos sintéticos y percentiles
+import pandas as pd                 # DataFrame de películas (como movie_list.pkl)
+from engine import RecommendationEngine
+
+
+def original(movie_title, movies, similarity, k):
+    """Lógica anterior de services.recommend (sin pósters)."""
+    index = movies[movies['title'] == movie_title].index[0]
+    distances = sorted(list(enumerate(similarity[index])), reverse=True, key=lambda x: x[1])
+    return [movies.iloc[i[0]].movie_id for i in distances[1:k + 1]]
+
+
+def medir(fn, titulos):
+    """Latencias (µs) de fn(título) para cada título."""
+    lat = np.empty(len(titulos))
+    for i, t in enumerate(titulos):
+        t0 = time.perf_counter()
+        fn(t)
+        lat[i] = (time.perf_counter() - t0) * 1e6
+    return lat
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Latencia por consulta de recomendación.")
+    ap.add_argument("--n", type=int, default=4800, help="Películas del catálogo sintético.")
+    ap.add_argument("--consultas", type=int, default=500)
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--semilla", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.semilla)
+    movies = pd.DataFrame({'movie_id': np.arange(args.n) + 1, 'title': [f"Movie {i}" for i in range(args.n)]})
+
+    # Matriz de similitud sintética simétrica con diagonal 1 (float32 para no duplicar memoria)
+    similarity = rng.random((args.n, args.n), dtype=np.float32)
+    similarity = (similarity + similarity.T) / 2
+    np.fill_diagonal(similarity, 1.0)
+
+    # Índice top-K equivalente al que genera el constructor
+    k_index = max(20, args.k)
+    masked = similarity.copy()
+    np.fill_diagonal(masked, -np.inf)
+    top = np.argsort(-masked, axis=1)[:, :k_index].astype(np.int32)
+    neighbors = {'indices': top, 'scores': np.take_along_axis(masked, top, axis=1)}
+    del masked
+
+    engine_dense = RecommendationEngine(movies, similarity=similarity)
+    engine_nn = RecommendationEngine(movies, neighbors=neighbors)
+
+    titulos = list(rng.choice(movies['title'].to_numpy(), size=args.consultas))
+
+    # Los tres métodos deben devolver las mismas películas
+    for t in titulos[:20]:
+        esperado = original(t, movies, similarity, args.k)
+        assert [m for m, _, _ in engine_dense.recommend(t, args.k)] == esperado
+        assert [m for m, _, _ in engine_nn.recommend(t, args.k)] == esperado
+
+    metodos = {
+        "original": lambda t: original(t, movies, similarity, args.k),
+        "argpartition": lambda t: engine_dense.recommend(t, args.k),
+        "vecinos": lambda t: engine_nn.recommend(t, args.k),
+    }
+    print(f"n={args.n:,} | consultas={args.consultas} | k={args.k}")
+    print(f"{'método':<14}{'p50 (µs)':>12}{'p99 (µs)':>12}{'consultas/s':>14}")
+    for nombre, fn in metodos.items():
+        lat = medir(fn, titulos)
+        print(f"{nombre:<14}{np.percentile(lat, 50):>12.1f}{np.percentile(lat, 99):>12.1f}{1e6 / lat.mean():>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+
+# Importamos las librerías necesarias
+import numpy as np                  # Arreglos y selección top-K con argpartition
+import scipy.sparse as sp           # Matriz dispersa de pesos de los perfiles (perfil × semilla)
+from search import TitleIndex       # Búsqueda de títulos por prefijo
+
+# ------------------------------------------------------------
+# --- Motor de recomendaciones (sin Streamlit ni red) ---
+# ------------------------------------------------------------
+
+class RecommendationEngine:
+    """
+    Motor de recomendaciones con búsquedas O(1) y selección O(K).
+
+    - Construye una sola vez los diccionarios título → fila y movie_id → fila.
+    - Es inmutable (arreglos de solo lectura), así que una sola instancia por proceso
+      puede atender a todas las sesiones de Streamlit sin copias.
+    - Si hay índice de vecinos precalculado (neighbors_*.npy), lee los K vecinos directamente.
+    - Si solo hay una matriz de similitud densa, selecciona los K mejores con np.argpartition
+      sobre la fila NumPy, sin ordenar la fila completa.
+    - Cada motor responde siempre en un solo espacio de similitud: con índice de vecinos,
+      las peticiones de más de K vecinos devuelven los K precalculados (o, si también hay
+      matriz densa, del mismo espacio, la fila completa); los embeddings SVD (n, dim)
+      normalizados solo se usan cuando no hay índice, con un producto matriz-vector.
+    - Búsqueda de títulos por prefijo (search()) con movie_id, sin recorrer el catálogo.
+    - Perfiles con varias películas semilla (historial de un usuario): profile_top_k()
+      calcula miles de perfiles a la vez con operaciones vectorizadas por bloques.
+    """
+
+    def __init__(self, movies, neighbors=None, similarity=None, embeddings=None, title_index=None):
+        # Columnas como arreglos NumPy (acceso posicional directo)
+        self.movie_ids = np.asarray(movies['movie_id'])
+        self.titles = np.asarray(movies['title'], dtype=object)
+
+        # Diccionarios de búsqueda; con títulos duplicados se queda la primera aparición
+        self.title_to_row = {}
+        for row, title in enumerate(self.titles):
+            self.title_to_row.setdefault(title, row)
+        self.id_to_row = {}
+        for row, movie_id in enumerate(self.movie_ids):
+            self.id_to_row.setdefault(int(movie_id), row)
+
+        # Índice top-K precalculado: {'indices': (n, K) int32, 'scores': (n, K) float32}
+        self.neighbor_indices = None if neighbors is None else np.asarray(neighbors['indices'])
+        self.neighbor_scores = None if neighbors is None else np.asarray(neighbors['scores'])
+
+        # Matriz de similitud densa (opcional, formato anterior)
+        self.similarity = similarity
+
+        # Embeddings normalizados (opcional): similitud del coseno = producto punto
+        self.embeddings = None if embeddings is None else np.asarray(embeddings)
+
+        if self.neighbor_indices is None and self.similarity is None and self.embeddings is None:
+            raise ValueError("Se necesita el índice de vecinos, la matriz de similitud o los embeddings.")
+
+        # Índice de búsqueda de títulos (el del modelo o, si no hay, uno construido en memoria)
+        self.title_index = title_index if title_index is not None else TitleIndex.from_titles(self.movie_ids, self.titles)
+
+        # El motor se comparte entre todas las sesiones (st.cache_resource): vistas de solo lectura
+        # (sin copiar los datos ni cambiar los arreglos de quien construyó el motor)
+        for name in ("movie_ids", "titles", "neighbor_indices", "neighbor_scores", "embeddings"):
+            array = getattr(self, name)
+            if array is not None:
+                view = array.view()
+                view.setflags(write=False)
+                setattr(self, name, view)
+
+    def __len__(self):
+        return len(self.titles)
+
+    @property
+    def max_k(self):
+        """Vecinos máximos por consulta: K del índice si la respuesta sale de él, si no, n - 1."""
+        if self.neighbor_indices is not None and self.similarity is None:
+            return self.neighbor_indices.shape[1]
+        return len(self) - 1
+
+    def row_of_title(self, title):
+        """Fila de la película con ese título (KeyError si no existe)."""
+        return self.title_to_row[title]
+
+    def row_of_id(self, movie_id):
+        """Fila de la película con ese movie_id (KeyError si no existe)."""
+        return self.id_to_row[int(movie_id)]
+
+    def search(self, query, limit=10):
+        """Lista de (movie_id, título) de los títulos que empiezan (o tienen una palabra que empieza) por `query`."""
+        return self.title_index.search(query, limit)
+
+    def top_k(self, row, k=5):
+        """
+        Devuelve (filas, similitudes) de las k películas más similares a `row`,
+        de mayor a menor similitud y excluyendo a la propia película.
+        Con índice de vecinos y sin matriz densa devuelve como mucho K (max_k).
+        """
+        # Índice de vecinos: los primeros k (como mucho K). Para k > K solo se sigue si hay
+        # matriz densa, que es el mismo espacio de conteos; los embeddings SVD darían otro
+        # orden y una petición con k = K + 1 no empezaría por la de k = K
+        if self.neighbor_indices is not None and (k <= self.neighbor_indices.shape[1] or self.similarity is None):
+            return self.neighbor_indices[row, :k], self.neighbor_scores[row, :k]
+
+        # Fila de similitudes: matriz densa o, sin índice, embeddings (un producto (n, dim) · (dim,))
+        if self.similarity is not None:
+            scores = np.array(self.similarity[row], dtype=np.float32)
+        else:
+            scores = self.embeddings @ self.embeddings[row]
+
+        # Selección parcial O(n) + orden de solo K elementos
+        scores[row] = -np.inf
+        k = min(k, len(scores) - 1)
+        if k <= 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        order = np.lexsort((top, -scores[top]))   # Similitud descendente; en empate, fila ascendente
+        top = top[order]
+        return top.astype(np.int32), scores[top]
+
+    def recommend_row(self, row, k=5):
+        """Lista de (movie_id, título, similitud) de las k películas más parecidas a la fila `row`."""
+        rows, scores = self.top_k(row, k)
+        return [(int(self.movie_ids[r]), self.titles[r], float(s)) for r, s in zip(rows, scores)]
+
+    def recommend(self, movie_title, k=5):
+        """Lista de (movie_id, título, similitud) de las k películas más parecidas a `movie_title`."""
+        return self.recommend_row(self.row_of_title(movie_title), k)
+
+    def recommend_id(self, movie_id, k=5):
+        """Igual que recommend(), pero buscando la película por movie_id."""
+        return self.recommend_row(self.row_of_id(movie_id), k)
+
+    # --------------------------------------------------------
+    # Perfiles (varias películas semilla con peso)
+    # --------------------------------------------------------
+    def _flatten_profiles(self, profiles):
+        """
+        Convierte una lista de perfiles [[(movie_id, peso), ...], ...] en tres arreglos
+        (perfil, fila, peso). Los movie_id que no están en el catálogo se ignoran.
+        """
+        users, rows, weights = [], [], []
+        for user, seeds in enumerate(profiles):
+            for movie_id, weight in seeds:
+                row = self.id_to_row.get(int(movie_id))
+                if row is not None:
+                    users.append(user)
+                    rows.append(row)
+                    weights.append(weight)
+        return (np.array(users, dtype=np.int64), np.array(rows, dtype=np.int64),
+                np.array(weights, dtype=np.float32))
+
+    def _profile_scores(self, m, users, rows, weights):
+        """
+        Puntuación (m, n) float32 de cada película para m perfiles, sumando las similitudes
+        de sus semillas ponderadas con un producto disperso: W (m × semillas distintas, CSR,
+        los pesos repetidos se suman) por las filas de esas semillas:
+          - índice de vecinos → W · matriz dispersa (semillas × n) con los K vecinos de cada
+            semilla (mismas similitudes exactas que recommend());
+          - embeddings (sin índice) → vector del perfil = W · embeddings de las semillas,
+            normalizado, y un producto (m, dim) · (dim, n);
+          - matriz densa → W · filas de similitud de las semillas.
+        """
+        n = len(self)
+        seeds, seed_of = np.unique(rows, return_inverse=True)
+        W = sp.csr_matrix((weights, (users, seed_of)), shape=(m, len(seeds)), dtype=np.float32)
+
+        if self.neighbor_indices is None and self.embeddings is not None:
+            profile = np.asarray(W @ np.asarray(self.embeddings[seeds], dtype=np.float32))
+            norms = np.linalg.norm(profile, axis=1, keepdims=True)
+            np.divide(profile, norms, out=profile, where=norms > 0)
+            return profile @ self.embeddings.T
+
+        if self.neighbor_indices is not None:
+            K = self.neighbor_indices.shape[1]
+            neighbors = sp.csr_matrix((self.neighbor_scores[seeds].ravel(), self.neighbor_indices[seeds].ravel(),
+                                       np.arange(0, len(seeds) * K + 1, K)), shape=(len(seeds), n))
+            return (W @ neighbors).toarray()
+        return np.asarray(W @ np.asarray(self.similarity[seeds], dtype=np.float32))
+
+    def profile_top_k(self, profiles, k=10, block_size=1024):
+        """
+        Top-K de muchos perfiles a la vez (p. ej. precálculo nocturno para todos los usuarios).
+
+        `profiles` es una lista de perfiles, cada uno una lista de (movie_id, peso). Se procesan
+        por bloques de `block_size` perfiles: la memoria máxima es O(block_size · n).
+        Las películas del propio perfil (ya vistas) se excluyen con una máscara y solo se
+        devuelven películas con puntuación positiva.
+
+        Devuelve (filas, puntuaciones) de forma (len(profiles), k), de mayor a menor puntuación;
+        los huecos (perfiles sin semillas conocidas o con menos de k candidatas) son fila -1.
+        """
+        n_profiles, n = len(profiles), len(self)
+        k = max(0, min(int(k), n))
+        top_rows = np.full((n_profiles, k), -1, dtype=np.int32)
+        top_scores = np.zeros((n_profiles, k), dtype=np.float32)
+        if k == 0:
+            return top_rows, top_scores
+
+        for start in range(0, n_profiles, block_size):
+            block = profiles[start:start + block_size]
+            m = len(block)
+            users, rows, weights = self._flatten_profiles(block)
+            scores = self._profile_scores(m, users, rows, weights)
+
+            # Máscara de vistas: las semillas nunca se recomiendan
+            scores[users, rows] = -np.inf
+
+            # Selección parcial por fila y orden de solo los K elegidos (en empate, fila ascendente)
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            sc = np.take_along_axis(scores, top, axis=1)
+            order = np.lexsort((top, -sc), axis=1)
+            top, sc = np.take_along_axis(top, order, axis=1), np.take_along_axis(sc, order, axis=1)
+
+            valid = sc > 0
+            top_rows[start:start + m] = np.where(valid, top, -1)
+            top_scores[start:start + m] = np.where(valid, sc, 0)
+        return top_rows, top_scores
+
+    def recommend_profile(self, seeds, k=10):
+        """
+        Lista de (movie_id, título, puntuación) para un perfil con varias semillas
+        [(movie_id, peso), ...], excluyendo las películas del propio perfil.
+        """
+        rows, scores = self.profile_top_k([list(seeds)], k)
+        return [(int(self.movie_ids[r]), self.titles[r], float(s)) for r, s in zip(rows[0], scores[0]) if r >= 0]
@@ -0,0 +1,205 @@
+
+# Importamos las librerías necesarias
+import os                           # Rutas, tamaños y reemplazo atómico de archivos
+from contextlib import suppress     # Archivos que otro proceso ya borró
+import time                         # Antigüedad de los archivos de la caché (TTL)
+import threading                    # Candado para la limpieza de la caché
+from concurrent.futures import ThreadPoolExecutor  # Descargas en paralelo
+from io import BytesIO              # Imagen descargada en memoria
+from pathlib import Path            # Carpeta de la caché
+import requests                     # Session con conexiones reutilizables
+from requests.adapters import HTTPAdapter
+from PIL import Image, ImageDraw    # Miniaturas y placeholder local
+
+# ------------------------------------------------------------
+# --- Servicio de pósters (TMDB + caché en disco) ---
+# ------------------------------------------------------------
+
+# Clave personal de la API (se puede sobrescribir con la variable de entorno TMDB_API_KEY)
+API_KEY = os.environ.get("TMDB_API_KEY", "0f3ddfe0d97c97f7b1ecd5a5ba358fda")
+API_BASE = "https://api.themoviedb.org/3/movie"
+IMG_BASE = "https://image.tmdb.org/t/p/w500"
+
+# Carpeta por defecto de la caché: junto a este archivo (no depende del directorio de trabajo)
+CACHE_DIR = Path(__file__).resolve().parent / ".poster_cache"
+
+
+class PosterService:
+    """
+    Descarga pósters de TMDB en paralelo y los guarda como miniaturas JPEG en disco.
+
+    - Una sola requests.Session con un pool de conexiones del tamaño del pool de hilos
+      (la conexión TLS a TMDB se reutiliza entre películas).
+    - Caché persistente en `cache_dir`: <movie_id>.jpg con la miniatura, o <movie_id>.none
+      si la película no tiene póster (para no volver a preguntar a la API).
+    - Los archivos caducan a los `ttl` segundos; si la carpeta pasa de `max_bytes`,
+      se borran primero los más antiguos.
+    - Ante cualquier error se devuelve un placeholder generado localmente (sin red).
+    - Con `pack` (PosterPack de artifacts.py, generado por DataCleaner/Descarga_posters.py)
+      las películas precargadas se sirven desde el paquete sin tocar la red ni la caché.
+    """
+
+    def __init__(self, api_key=API_KEY, cache_dir=CACHE_DIR, ttl=7 * 24 * 3600, max_bytes=200 * 2**20,
+                 max_workers=8, thumb_size=(342, 513), timeout=10, api_base=API_BASE, img_base=IMG_BASE,
+                 pack=None):
+        self.api_key = api_key
+        self.pack = pack
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.thumb_size = thumb_size
+        self.timeout = timeout
+        self.api_base = api_base
+        self.img_base = img_base
+
+        # Session compartida por todos los hilos (el pool de urllib3 es seguro entre hilos)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="poster")
+        self._lock = threading.Lock()
+        self._placeholder = None
+
+        # Contadores simples (aciertos de caché, descargas, errores) y bytes escritos desde la última limpieza
+        self.stats = {"pack": 0, "hits": 0, "downloads": 0, "missing": 0, "errors": 0}
+        self._written = 0
+
+        # Limpia lo que haya caducado desde la última ejecución
+        self.evict()
+
+    def _count(self, key, written=0):
+        """Actualiza contadores desde varios hilos; limpia la caché cada ~10 % de max_bytes escritos."""
+        with self._lock:
+            self.stats[key] += 1
+            self._written += written
+            due = self._written > self.max_bytes // 10
+            if due:
+                self._written = 0
+        if due:
+            self.evict()
+
+    # --------------------------------------------------------
+    # Placeholder local
+    # --------------------------------------------------------
+    def placeholder(self) -> Image.Image:
+        """Imagen 'Sin póster' dibujada con PIL (se crea una sola vez)."""
+        if self._placeholder is None:
+            w, h = self.thumb_size
+            img = Image.new("RGB", (w, h), (38, 38, 46))
+            draw = ImageDraw.Draw(img)
+            draw.rectangle([6, 6, w - 7, h - 7], outline=(90, 90, 104), width=3)
+            text = "Sin póster"
+            box = draw.textbbox((0, 0), text)
+            draw.text(((w - (box[2] - box[0])) / 2, (h - (box[3] - box[1])) / 2), text, fill=(200, 200, 210))
+            self._placeholder = img
+        return self._placeholder.copy()
+
+    # --------------------------------------------------------
+    # Caché en disco
+    # --------------------------------------------------------
+    def _paths(self, movie_id):
+        base = self.cache_dir / str(int(movie_id))
+        return base.with_suffix(".jpg"), base.with_suffix(".none")
+
+    def _fresh(self, path):
+        """True si el archivo existe y no ha caducado."""
+        try:
+            return time.time() - path.stat().st_mtime < self.ttl
+        except OSError:
+            return False
+
+    def _write(self, path, data: bytes):
+        """Escritura atómica (temporal + os.replace) para que un lector nunca vea medio archivo."""
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def evict(self):
+        """Borra archivos caducados y, si la caché pasa de max_bytes, los más antiguos."""
+        with self._lock:
+            now = time.time()
+            files = []
+            for entry in os.scandir(self.cache_dir):
+                if not entry.is_file() or entry.name.endswith(".tmp"):
+                    continue
+                with suppress(OSError):
+                    st = entry.stat()
+                    if now - st.st_mtime >= self.ttl:
+                        os.remove(entry.path)
+                    else:
+                        files.append((st.st_mtime, st.st_size, entry.path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                with suppress(OSError):
+                    os.remove(path)
+                total -= size
+
+    # --------------------------------------------------------
+    # Descarga
+    # --------------------------------------------------------
+    def _download(self, movie_id):
+        """Pide los metadatos y la imagen; devuelve los bytes JPEG de la miniatura o None si no hay póster."""
+        response = self.session.get(f"{self.api_base}/{int(movie_id)}",
+                                    params={"api_key": self.api_key, "language": "en-US"}, timeout=self.timeout)
+        response.raise_for_status()
+        poster_path = response.json().get("poster_path")
+        if not poster_path:
+            return None
+
+        image = self.session.get(self.img_base + poster_path, timeout=self.timeout)
+        image.raise_for_status()
+
+        # Miniatura: conserva la proporción y se guarda como JPEG
+        img = Image.open(BytesIO(image.content)).convert("RGB")
+        img.thumbnail(self.thumb_size)
+        out = BytesIO()
+        img.save(out, format="JPEG", quality=85, optimize=True)
+        return out.getvalue()
+
+    def fetch(self, movie_id) -> Image.Image:
+        """Póster de una película: paquete precargado, caché en disco o descarga; placeholder si falla."""
+        jpg, none = self._paths(movie_id)
+        try:
+            packed = self.pack.get(int(movie_id)) if self.pack is not None else None
+            if packed is not None:
+                self._count("pack")
+                return Image.open(BytesIO(packed)).convert("RGB") if packed else self.placeholder()
+            if self._fresh(jpg):
+                self._count("hits")
+                with Image.open(jpg) as img:
+                    return img.convert("RGB")
+            if self._fresh(none):
+                self._count("hits")
+                return self.placeholder()
+
+            data = self._download(movie_id)
+            if data is None:
+                # Sin póster en TMDB: se recuerda para no volver a preguntar hasta que caduque
+                self._write(none, b"")
+                self._count("missing")
+                return self.placeholder()
+            self._write(jpg, data)
+            self._count("downloads", len(data))
+            return Image.open(BytesIO(data)).convert("RGB")
+
+        # Si ocurre algún error en la solicitud o descarga (no se guarda nada en la caché)
+        except Exception as e:
+            self._count("errors")
+            print(f"⚠️ Error al obtener el póster (ID {movie_id}): {e}")
+            return self.placeholder()
+
+    def fetch_many(self, movie_ids) -> list:
+        """Pósters de varias películas en paralelo, en el mismo orden que `movie_ids`."""
+        movie_ids = [int(m) for m in movie_ids]
+        unique = list(dict.fromkeys(movie_ids))
+        images = dict(zip(unique, self.pool.map(self.fetch, unique)))
+        return [images[m] for m in movie_ids]
+
+    def close(self):
+        self.pool.shutdown(wait=False)
+        self.session.close()
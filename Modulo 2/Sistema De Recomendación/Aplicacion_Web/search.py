@@ -0,0 +1,100 @@
+# Importamos las librerías necesarias
+import sys                          # Importar las claves de títulos desde ../DataCleaner
+from pathlib import Path            # Carpeta DataCleaner junto a esta carpeta
+import numpy as np                  # Claves ordenadas y búsqueda binaria (searchsorted)
+
+# La normalización y las claves son las del constructor (DataCleaner/Titulos.py, solo NumPy):
+# una sola implementación para las claves guardadas y para las búsquedas
+DATACLEANER_DIR = str(Path(__file__).resolve().parent.parent / "DataCleaner")
+if DATACLEANER_DIR not in sys.path:
+    sys.path.append(DATACLEANER_DIR)    # Al final: los módulos de la app tienen prioridad
+from Titulos import TITLE_KEY_BYTES as KEY_BYTES, normalize_title, title_keys, title_lengths
+
+# ------------------------------------------------------------
+# --- Búsqueda de títulos por prefijo (typeahead) ---
+# ------------------------------------------------------------
+
+
+class TitleIndex:
+    """
+    Índice de títulos por prefijo: claves normalizadas ordenadas + np.searchsorted.
+
+    Una búsqueda localiza el tramo [lo, hi) de claves que empiezan por el texto buscado
+    con dos búsquedas binarias (O(log n)) y ordena solo ese tramo:
+      1. título exactamente igual a la búsqueda,
+      2. título que empieza por la búsqueda,
+      3. alguna palabra del título que empieza por la búsqueda,
+    y dentro de cada grupo, títulos más cortos primero. Devuelve movie_id y título, así que
+    los títulos repetidos se distinguen (no hay ambigüedad al elegir).
+    """
+
+    def __init__(self, keys, rows, positions, lengths, movie_ids, titles):
+        self.keys = keys
+        self.rows = rows
+        self.positions = positions
+        # Largo de cada título normalizado (desempate: los más cortos primero); viene del
+        # modelo para no volver a normalizar todos los títulos en cada arranque
+        self.lengths = lengths
+        self.movie_ids = movie_ids
+        self.titles = titles
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    @classmethod
+    def from_titles(cls, movie_ids, titles):
+        """Construye el índice en memoria (modelos generados antes de existir title_keys.npy)."""
+        return cls(*title_keys(titles), movie_ids, titles)
+
+    def search_rows(self, query, limit=10):
+        """Filas de las mejores coincidencias para `query` (como mucho `limit`)."""
+        normalized = normalize_title(query)
+        encoded = normalized.encode("utf-8")
+        prefix = encoded[:KEY_BYTES]
+        if not prefix or limit <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        # Tramo de claves que empiezan por `prefix`; los límites se convierten al dtype de las
+        # claves (si no, NumPy convertiría el arreglo completo en cada búsqueda)
+        if len(prefix) < self.keys.dtype.itemsize:
+            lo, hi = np.searchsorted(self.keys, np.array([prefix, prefix + b"\xff"], dtype=self.keys.dtype))
+        else:
+            # Búsqueda del ancho de la clave: solo las claves iguales (con "\xff" al final se
+            # recortaría a los primeros itemsize - 1 bytes y entrarían claves de más)
+            key = np.array(prefix, dtype=self.keys.dtype)
+            lo = np.searchsorted(self.keys, key, side="left")
+            hi = np.searchsorted(self.keys, key, side="right")
+        if hi <= lo:
+            return np.empty(0, dtype=np.int64)
+        rows = self.rows[lo:hi].astype(np.int64)
+        positions = self.positions[lo:hi]
+
+        # Búsqueda más larga que la clave: la clave solo garantiza los primeros KEY_BYTES bytes,
+        # se comprueba el resto contra el título normalizado (solo en este tramo, que es pequeño)
+        if len(encoded) > KEY_BYTES:
+            keep = np.fromiter((" ".join(normalize_title(self.titles[r]).split()[p:]).startswith(normalized)
+                                for r, p in zip(rows.tolist(), positions.tolist())), dtype=bool, count=len(rows))
+            rows, positions = rows[keep], positions[keep]
+            if not len(rows):
+                return np.empty(0, dtype=np.int64)
+
+        # Orden compuesto en un solo int64: (no exacto, no empieza el título, largo, fila)
+        # (clave desde la primera palabra que empieza por la búsqueda y del mismo largo → título igual)
+        lengths = self.lengths[rows].astype(np.int64)
+        exact = (positions == 0) & (lengths == len(normalized))
+        rank = ((~exact).astype(np.int64) << 45) | ((positions > 0).astype(np.int64) << 44) \
+            | (np.minimum(lengths, 4095) << 32) | rows
+
+        # Selección parcial de los mejores (margen por si una película aparece con dos claves)
+        take = min(len(rank), 4 * limit)
+        if take < len(rank):
+            rank = rank[np.argpartition(rank, take - 1)[:take]]
+        rank.sort()
+        best = rank & 0xFFFFFFFF
+        # Una sola vez cada película (el merge por título puede repetir filas con el mismo movie_id)
+        _, first = np.unique(np.asarray(self.movie_ids)[best], return_index=True)
+        return best[np.sort(first)][:limit]
+
+    def search(self, query, limit=10):
+        """Lista de (movie_id, título) de las mejores coincidencias para `query`."""
+        return [(int(self.movie_ids[r]), str(self.titles[r])) for r in self.search_rows(query, limit)]
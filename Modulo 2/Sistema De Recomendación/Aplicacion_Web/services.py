@@ -1,119 +1,124 @@
 
 # Importamos las librerías necesarias
-import requests                     # Para realizar solicitudes HTTP a la API de TMDB
-import pandas as pd                 # Para manejar los DataFrames (lectura de archivos .pkl)
 from PIL import Image               # Para manejar imágenes (abrir, convertir, mostrar)
 import streamlit as st              # Librería principal para la app web
+from engine import RecommendationEngine  # Búsquedas O(1) y selección top-K
+from artifacts import load_artifacts, load_embeddings, load_poster_pack, load_title_index  # Artefactos .npy (mmap)
+from posters import PosterService          # Pósters en paralelo con caché en disco
 
 # ------------------------------------------------------------
 # --- Networking TMDB (The Movie Database) ---
 # ------------------------------------------------------------
 
-@st.cache_data(show_spinner=False)  # Cachea la función para no repetir solicitudes a la API
-def fetch_poster(movie_id: int) -> Image.Image:
+@st.cache_resource(show_spinner=False)  # Un solo servicio por proceso (Session, hilos y caché compartidos)
+def get_poster_service() -> PosterService:
     """
-    Devuelve el póster desde TMDB usando una API con key personal.
-    Si falla, regresa un placeholder para no romper la app.
+    Servicio de pósters: primero el paquete precargado (model/posters.pack, si existe),
+    luego la caché en disco y, para lo que falte, descargas en paralelo.
     """
+    return PosterService(pack=load_poster_pack())
 
-    # Clave personal de la API. Permite autenticar las solicitudes a TMDB
-    api_key = "0f3ddfe0d97c97f7b1ecd5a5ba358fda" 
-
-    # URL base para acceder a los detalles de una película por ID
-    base_url = f"https://api.themoviedb.org/3/movie/{movie_id}"
-
-    # URL base para obtener imágenes en tamaño w500 (500px de ancho)
-    img_base = "https://image.tmdb.org/t/p/w500"
-
-    # URL de una imagen temporal (placeholder) en caso de que no exista póster
-    placeholder_url = "https://via.placeholder.com/500x750?text=Sin+Poster"
 
-    try:
-        # Parámetros que se enviarán en la solicitud (API key + idioma)
-        params = {"api_key": api_key, "language": "en-US"}
+def fetch_poster(movie_id: int) -> Image.Image:
+    """
+    Devuelve el póster desde TMDB (o desde la caché en disco).
+    Si falla, regresa un placeholder local para no romper la app.
+    """
+    return get_poster_service().fetch(movie_id)
 
-        # Realiza la solicitud HTTP GET a la API de TMDB
-        response = requests.get(base_url, params=params, timeout=10)
 
-        # Lanza un error si la respuesta no fue exitosa 
-        response.raise_for_status()
+def fetch_posters(movie_ids) -> list[Image.Image]:
+    """Pósters de varias películas descargados en paralelo (mismo orden que movie_ids)."""
+    return get_poster_service().fetch_many(movie_ids)
 
-        # Convierte la respuesta en formato JSON (diccionario de Python)
-        data = response.json()
 
-        # Extrae la ruta del póster desde el JSON
-        poster_path = data.get("poster_path")
+# ------------------------------------------------------------
+# --- Carga de Modelos (artefactos .npy generados previamente) ---
+# ------------------------------------------------------------
 
-        # Si no hay póster, devuelve la imagen de placeholder
-        if not poster_path:
-            return Image.open(requests.get(placeholder_url, stream=True).raw).convert("RGB")
+def load_models():
+    """
+    Abre los artefactos del modelo mapeados en memoria (sin copiarlos).
+    No usa st.cache_data: esa caché serializa y copia el resultado, lo que anularía el mmap;
+    el motor que los envuelve ya se guarda una sola vez con st.cache_resource.
+    """
+    # movies → {'movie_id', 'title'}; neighbors → {'indices': (n, K) int32, 'scores': (n, K) float32}
+    movies, neighbors = load_artifacts()
 
-        # Si existe la ruta, se construye la URL completa del póster
-        img_url = img_base + poster_path
+    # Devuelve ambos objetos (columnas de películas e índice de vecinos)
+    return movies, neighbors
 
-        # Descarga la imagen y la convierte al formato RGB
-        image = Image.open(requests.get(img_url, stream=True).raw).convert("RGB")
 
-        # Devuelve la imagen del póster lista para mostrar en Streamlit
-        return image
+@st.cache_resource(show_spinner=False)  # Un solo motor por proceso (no se copia en cada ejecución)
+def load_engine() -> RecommendationEngine:
+    """Construye una vez el motor de recomendaciones (diccionarios título/ID → fila e índice de búsqueda)."""
+    movies, neighbors = load_models()
+    return RecommendationEngine(movies, neighbors=neighbors, embeddings=load_embeddings(),
+                                title_index=load_title_index(movies))
 
-    # Si ocurre algún error en la solicitud o descarga
-    except Exception as e:
-        # Imprime el error en consola
-        print(f"⚠️ Error al obtener el póster (ID {movie_id}): {e}")
 
-        # Devuelve el placeholder para evitar que la app se rompa
-        return Image.open(requests.get(placeholder_url, stream=True).raw).convert("RGB")
+def search_titles(query: str, engine: RecommendationEngine, limit: int = 20) -> list[tuple[int, str]]:
+    """
+    Títulos que coinciden con lo que escribe el usuario: (movie_id, título), mejores primero.
+    El navegador solo recibe estas coincidencias, no el catálogo completo.
+    """
+    return engine.search(query, limit)
 
 
 # ------------------------------------------------------------
-# --- Carga de Modelos (archivos .pkl generados previamente) ---
+# --- Generación de recomendaciones ---
 # ------------------------------------------------------------
 
-@st.cache_data(show_spinner=False)  # Cachea los datos para no recargar los .pkl en cada ejecución
-def load_models():
-    """Carga los pkl exactamente de las mismas rutas."""
-    # Carga el archivo con la lista de películas procesadas (DataFrame)
-    movies = pd.read_pickle('../DataCleaner/model/movie_list.pkl')
+def _recommend_with_selection(row: int, engine: RecommendationEngine, k: int):
+    """Recomendaciones más el póster de la película elegida (todos los pósters en una sola tanda)."""
+    # Las k películas más similares: (movie_id, título, similitud)
+    recommendations = engine.recommend_row(row, k)
 
-    # Carga el archivo con la matriz de similitud calculada con cosine similarity
-    similarity = pd.read_pickle('../DataCleaner/model/similarity.pkl')
+    # Nombres de las películas recomendadas
+    recommended_movie_names: list[str] = [title for _, title, _ in recommendations]
 
-    # Devuelve ambos objetos (DataFrame de películas y matriz de similitud)
-    return movies, similarity
+    # Pósters de la película elegida y de las recomendadas, todos a la vez
+    posters = fetch_posters([engine.movie_ids[row]] + [movie_id for movie_id, _, _ in recommendations])
+    return posters[0], recommended_movie_names, posters[1:]
 
 
-# ------------------------------------------------------------
-# --- Generación de recomendaciones ---
-# ------------------------------------------------------------
-
-def recommend(movie_title: str, movies: pd.DataFrame, similarity) -> tuple[list[str], list[Image.Image]]:
+def recommend(movie_title: str, engine: RecommendationEngine, k: int = 5) -> tuple[list[str], list[Image.Image]]:
     """
-    Misma lógica: top-5 más similares, excluyendo la propia.
+    Las `k` películas más similares (5 por defecto), excluyendo la propia, con sus pósters.
+    La película se busca en un diccionario (O(1)) y los vecinos se leen del índice
+    precalculado (O(k); con k mayor que el índice se devuelven los K guardados, ver
+    RecommendationEngine.top_k), sin recorrer ni ordenar todo el catálogo.
     """
-    
-    # Busca el índice de la película seleccionada en el DataFrame 'movies'
-    index = movies[movies['title'] == movie_title].index[0]
-
-    # Calcula las distancias de similitud (ordenadas de mayor a menor)
-    # enumerate() crea pares (índice, valor) para todas las películas
-    # Se ordena por similitud descendente (key=lambda x: x[1])
-    distances = sorted(list(enumerate(similarity[index])), reverse=True, key=lambda x: x[1])
+    row = engine.row_of_title(movie_title)
+    _, recommended_movie_names, recommended_movie_posters = _recommend_with_selection(row, engine, k)
 
-    # Listas vacías para almacenar los resultados
-    recommended_movie_names: list[str] = []       # Nombres de las películas recomendadas
-    recommended_movie_posters: list[Image.Image] = []  # Pósters correspondientes
-
-    # Recorre las 5 películas más similares (omitiendo la primera, que es la misma)
-    for i in distances[1:6]:
-        # Obtiene el ID de la película similar
-        movie_id = movies.iloc[i[0]].movie_id
+    # Devuelve una tupla con las listas (nombres, imágenes)
+    return recommended_movie_names, recommended_movie_posters
 
-        # Obtiene el póster de esa película usando la API TMDB
-        recommended_movie_posters.append(fetch_poster(movie_id))
 
-        # Agrega el nombre de la película a la lista
-        recommended_movie_names.append(movies.iloc[i[0]].title)
+def session_recommendation(movie_id: int, engine: RecommendationEngine, k: int = 5) -> dict:
+    """
+    Recomendación memorizada en la sesión del usuario (st.session_state).
 
-    # Devuelve una tupla con las listas (nombres, imágenes)
-    return recommended_movie_names, recommended_movie_posters
+    La película se identifica por movie_id (los títulos pueden repetirse).
+    Streamlit vuelve a ejecutar app.py completo en cada interacción; si la película y k
+    no cambiaron, se devuelve el último resultado sin consultar el motor ni los pósters.
+    Devuelve {'movie_id', 'title', 'selected_poster', 'names', 'posters'}.
+    """
+    key = (int(movie_id), k, id(engine))   # id(engine): el motor compartido del proceso
+    last = st.session_state.get("last_recommendation")
+    if last is not None and last["key"] == key:
+        return last
+
+    row = engine.row_of_id(movie_id)
+    selected_poster, names, posters = _recommend_with_selection(row, engine, k)
+    last = {"key": key, "movie_id": int(movie_id), "title": engine.titles[row],
+            "selected_poster": selected_poster, "names": names, "posters": posters}
+    st.session_state["last_recommendation"] = last
+    return last
+
+
+def last_recommendation(movie_id: int | None) -> dict | None:
+    """Último resultado de la sesión si corresponde a `movie_id` (None en otro caso)."""
+    last = st.session_state.get("last_recommendation")
+    return last if last is not None and movie_id is not None and last["movie_id"] == int(movie_id) else None
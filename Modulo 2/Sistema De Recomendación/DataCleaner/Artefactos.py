@@ -0,0 +1,205 @@
+
+# ------------------------------------------------------------
+# Importación de librerías necesarias
+# ------------------------------------------------------------
+import hashlib                       # Huella (sha256) de los datasets de entrada
+import json                          # Manifiesto legible con la descripción de los artefactos
+import os                            # Rutas, tamaños y reemplazo atómico de archivos
+import numpy as np                   # Formato .npy (se puede abrir con mmap_mode='r')
+import scipy.sparse as sp            # Matriz de conteos (.npz) para reconstrucciones incrementales
+from Titulos import TITLE_KEY_BYTES, normalize_title, title_keys  # Claves del índice de títulos (las comparte la app)
+
+# ------------------------------------------------------------
+# Nombres de archivo (deben coincidir con Aplicacion_Web/artifacts.py)
+# ------------------------------------------------------------
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+MOVIE_IDS = "movie_ids.npy"               # (n,) int64
+TITLES = "titles.npy"                     # (n,) bytes UTF-8 de ancho fijo ('S')
+NEIGHBOR_INDICES = "neighbors_indices.npy"  # (n, K) int32
+NEIGHBOR_SCORES = "neighbors_scores.npy"    # (n, K) float32
+EMBEDDINGS = "embeddings.npy"             # (n, dim) float32 normalizados (opcional, ver Embeddings.py)
+TITLE_KEYS = "title_keys.npy"             # (m,) claves de búsqueda ordenadas ('S40', ver Titulos.py)
+TITLE_KEY_ROWS = "title_key_rows.npy"     # (m,) int32, fila de la película de cada clave
+TITLE_KEY_POS = "title_key_pos.npy"       # (m,) int16, palabra del título donde empieza la clave
+TITLE_LENGTHS = "title_lengths.npy"       # (n,) int32, largo de cada título normalizado (desempate)
+
+# Solo para el constructor (reconstrucción incremental); la app no los lee
+VECTORS = "vectors.npz"                   # (n, vocabulario) conteos dispersos
+VOCABULARY = "vocabulary.json"            # Términos del CountVectorizer en orden de columna
+SVD_COMPONENTS = "svd_components.npy"     # (dim, vocabulario) float32, base de los embeddings
+
+# Pósters precargados (Descarga_posters.py): un solo archivo con las miniaturas JPEG seguidas,
+# el índice (movie_id, offset, bytes) ordenado por movie_id y un pie de 16 bytes
+# (offset del índice int64 + marca). Bytes = 0 → la película no tiene póster en TMDB.
+POSTER_PACK = "posters.pack"
+POSTER_MAGIC = b"RSPOSTR1"
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """sha256 del contenido de un archivo (se lee por bloques de 1 MB)."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_manifest(model_dir):
+    """Devuelve el manifest.json del modelo o None si no existe o es de otra versión."""
+    try:
+        with open(os.path.join(model_dir, MANIFEST), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('format_version') == FORMAT_VERSION else None
+
+
+def load_vectors(model_dir):
+    """Matriz de conteos guardada por save_vectors()."""
+    return sp.load_npz(os.path.join(model_dir, VECTORS)).tocsr()
+
+
+def load_vocabulary(model_dir):
+    """Lista de términos del vocabulario congelado."""
+    with open(os.path.join(model_dir, VOCABULARY), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_embeddings(model_dir):
+    """Arreglos (embeddings, componentes de la SVD), o None si el modelo se construyó sin embeddings."""
+    path = os.path.join(model_dir, EMBEDDINGS)
+    if not os.path.exists(path):
+        return None
+    return np.load(path), np.load(os.path.join(model_dir, SVD_COMPONENTS))
+
+
+def load_neighbors(model_dir):
+    """Arreglos (indices, scores) del índice de vecinos, cargados en memoria (se van a modificar)."""
+    return (np.load(os.path.join(model_dir, NEIGHBOR_INDICES)),
+            np.load(os.path.join(model_dir, NEIGHBOR_SCORES)))
+
+
+def iter_poster_pack(path):
+    """Recorre un posters.pack existente: (movie_id, bytes JPEG) por película. No hace nada si no existe."""
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return
+    with f:
+        f.seek(-16, os.SEEK_END)
+        start, magic = int.from_bytes(f.read(8), 'little'), f.read(8)
+        if magic != POSTER_MAGIC:
+            raise ValueError(f"{path} no es un paquete de pósters válido.")
+        f.seek(start)
+        index = np.load(f, allow_pickle=False)
+        for movie_id, offset, size in index:
+            f.seek(offset)
+            yield int(movie_id), f.read(size)
+
+
+def write_poster_pack(path, entries):
+    """
+    Escribe posters.pack a partir de pares (movie_id, bytes JPEG), que pueden llegar de uno en uno
+    (solo el índice queda en memoria). Si un movie_id se repite, gana el último.
+    Se escribe en un temporal y se renombra: la app nunca ve un paquete a medias.
+    Devuelve el número de películas guardadas.
+    """
+    tmp = path + ".tmp"
+    rows = {}
+    with open(tmp, 'wb') as f:
+        for movie_id, data in entries:
+            rows[int(movie_id)] = (f.tell(), len(data))
+            f.write(data)
+        start = f.tell()
+        index = np.array([(m, off, size) for m, (off, size) in sorted(rows.items())], dtype=np.int64).reshape(-1, 3)
+        np.save(f, index, allow_pickle=False)
+        f.write(start.to_bytes(8, 'little') + POSTER_MAGIC)
+    os.replace(tmp, path)
+    print(f"✔ Guardado: {path} ({os.path.getsize(path)} bytes, {len(rows)} películas)")
+    return len(rows)
+
+
+class ArtifactWriter:
+    """
+    Guarda el modelo en archivos que la app puede mapear en memoria.
+
+    - La tabla de películas se guarda por columnas (un .npy por columna).
+    - El índice de vecinos se guarda como dos .npy (índices y similitudes).
+    - manifest.json describe el contenido (versión, n, K, archivos y bytes).
+
+    Cada archivo se escribe primero con un nombre temporal y luego se renombra,
+    de modo que un proceso que esté leyendo nunca ve un archivo a medias.
+    """
+
+    def __init__(self, model_dir):
+        # Carpeta donde se escriben los artefactos
+        self.model_dir = model_dir
+        os.makedirs(self.model_dir, exist_ok=True)
+        self.files = {}
+
+    def _path(self, name):
+        return os.path.join(self.model_dir, name)
+
+    def _save(self, name, write, mode='wb'):
+        """Escribe con write(f) en un temporal, lo renombra y registra su tamaño."""
+        final = self._path(name)
+        tmp = final + ".tmp"
+        with open(tmp, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            write(f)
+        os.replace(tmp, final)
+        size = os.path.getsize(final)
+        self.files[name] = size
+        print(f"✔ Guardado: {final} ({size} bytes)")
+        return size
+
+    def save_array(self, name, array):
+        """Escribe un .npy de forma atómica y devuelve su tamaño en bytes."""
+        return self._save(name, lambda f: np.save(f, np.ascontiguousarray(array), allow_pickle=False))
+
+    def save_movies(self, movies):
+        """Guarda las columnas movie_id (int64) y title (UTF-8 de ancho fijo) de la tabla de películas."""
+        self.save_array(MOVIE_IDS, movies['movie_id'].to_numpy(dtype=np.int64))
+        encoded = [str(t).encode('utf-8') for t in movies['title']]
+        width = max((len(t) for t in encoded), default=1) or 1
+        self.save_array(TITLES, np.array(encoded, dtype=f"S{width}"))
+
+    def save_title_index(self, titles):
+        """
+        Índice de búsqueda por prefijo (ver title_keys) y el largo de cada título normalizado,
+        para que la app no tenga que normalizar todos los títulos al arrancar.
+        """
+        keys, rows, positions, lengths = title_keys(titles)
+        self.save_array(TITLE_KEYS, keys)
+        self.save_array(TITLE_KEY_ROWS, rows)
+        self.save_array(TITLE_KEY_POS, positions)
+        self.save_array(TITLE_LENGTHS, lengths)
+
+    def save_neighbors(self, neighbors):
+        """Guarda el índice top-K (NeighborIndex)."""
+        self.save_array(NEIGHBOR_INDICES, neighbors.indices.astype(np.int32, copy=False))
+        self.save_array(NEIGHBOR_SCORES, neighbors.scores.astype(np.float32, copy=False))
+
+    def save_embeddings(self, embeddings, components):
+        """Guarda los embeddings (para la app) y la base de la SVD (para los deltas)."""
+        self.save_array(EMBEDDINGS, embeddings.astype(np.float32, copy=False))
+        self.save_array(SVD_COMPONENTS, components.astype(np.float32, copy=False))
+
+    def save_vectors(self, vectors):
+        """Guarda la matriz de conteos dispersa (CSR comprimida)."""
+        return self._save(VECTORS, lambda f: sp.save_npz(f, sp.csr_matrix(vectors), compressed=True))
+
+    def save_vocabulary(self, terms):
+        """Guarda el vocabulario del CountVectorizer (lista de términos en orden de columna)."""
+        return self._save(VOCABULARY, lambda f: json.dump([str(t) for t in terms], f, ensure_ascii=False), mode='w')
+
+    def write_manifest(self, **extra):
+        """Escribe manifest.json al final, cuando todos los archivos ya están completos."""
+        manifest = {'format_version': FORMAT_VERSION, 'files': self.files}
+        manifest.update(extra)
+        final = self._path(MANIFEST)
+        tmp = final + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, final)
+        return manifest
@@ -0,0 +1,116 @@
+
+# ------------------------------------------------------------
+# Benchmark: embeddings SVD frente a los conteos de CountVectorizer
+# ------------------------------------------------------------
+# Compara, para varias dimensiones de la SVD truncada (Embeddings.py):
+#   - tiempo de construcción (SVD + vecinos top-K sobre los embeddings)
+#   - tamaño del artefacto (n × dim float32) frente a la matriz de similitud n×n float64
+#     del script original y al índice de vecinos (n × K)
+#   - solapamiento@K: fracción de los K vecinos exactos en el espacio de conteos (los mismos
+#     que daba la matriz cosine_similarity original) que también salen con los embeddings
+#   - latencia de una consulta al vuelo (producto matriz-vector + argpartition)
+#
+# Datos: las 'tags' de model/movie_list.pkl (generado por Main.py) o, con --sintetico N,
+# un catálogo sintético de N películas con temas.
+#
+# Uso:
+#   python Benchmark_embeddings.py [--sintetico 20000] [--dims 100,200,300] [--k 20]
+
+import argparse                     # Argumentos de línea de comandos
+import time                         # Medición de tiempo
+import numpy as np                  # Percentiles y selección top-K
+import pandas as pd                 # Lectura de movie_list.pkl
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from Config_paths import PathResolver
+from Embeddings import SvdEmbedding
+from Vecinos import NeighborIndex
+
+
+def tags_sinteticas(n, semilla=0, temas=200, palabras_tema=30, vocabulario=20000, largo=40):
+    """Documentos sintéticos: cada película mezcla 2 temas y algo de ruido del vocabulario."""
+    rng = np.random.default_rng(semilla)
+    tema_palabras = rng.integers(0, vocabulario, size=(temas, palabras_tema))
+    docs = []
+    for _ in range(n):
+        t1, t2 = rng.integers(0, temas, size=2)
+        pool = np.concatenate([tema_palabras[t1], tema_palabras[t2]])
+        palabras = np.concatenate([rng.choice(pool, size=largo - 5), rng.integers(0, vocabulario, size=5)])
+        docs.append(" ".join(f"w{p}" for p in palabras))
+    return pd.Series(docs)
+
+
+MB = 2 ** 20
+
+
+def latencias(fn, filas):
+    """Latencias (ms) de fn(fila) para cada fila."""
+    lat = []
+    for f in filas:
+        t0 = time.perf_counter()
+        fn(f)
+        lat.append((time.perf_counter() - t0) * 1e3)
+    return np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+def top_k(sim, fila, k):
+    sim[fila] = -np.inf
+    return np.argpartition(-sim, k - 1)[:k]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Embeddings SVD vs conteos: tiempo, tamaño y solapamiento de vecinos.")
+    ap.add_argument("--sintetico", type=int, default=0, help="Usar N películas sintéticas en lugar de movie_list.pkl.")
+    ap.add_argument("--dims", default="100,200,300", help="Dimensiones a probar, separadas por comas.")
+    ap.add_argument("--k", type=int, default=20)
+    ap.add_argument("--consultas", type=int, default=200)
+    ap.add_argument("--semilla", type=int, default=0)
+    args = ap.parse_args()
+
+    if args.sintetico:
+        tags = tags_sinteticas(args.sintetico, args.semilla)
+    else:
+        tags = pd.read_pickle(PathResolver().paths()[0])['tags']
+
+    # Misma vectorización que Constructor.py
+    X = CountVectorizer(max_features=5000, stop_words='english', dtype=np.float32).fit_transform(tags)
+    n, k = X.shape[0], args.k
+    filas = np.random.default_rng(args.semilla).choice(n, size=min(args.consultas, n), replace=False)
+    print(f"n={n:,} | vocabulario={X.shape[1]:,} | k={k}")
+
+    print(f"\n{'método':<22}{'build (s)':>10}{'artefacto (MB)':>16}{'solap.@k':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+
+    # Original: matriz de similitud completa n×n (solo se calcula si cabe sin problemas)
+    if n <= 20000:
+        t0 = time.perf_counter()
+        cosine_similarity(X)
+        build = f"{time.perf_counter() - t0:.2f}"
+    else:
+        build = "-"
+    print(f"{'similitud n×n':<22}{build:>10}{n * n * 8 / MB:>16,.1f}{1.0:>10.3f}{'-':>10}{'-':>10}")
+
+    # Referencia: índice top-K exacto sobre los conteos (lo que hoy genera Constructor.py)
+    t0 = time.perf_counter()
+    exacto = NeighborIndex.build(X, k=k)
+    build = time.perf_counter() - t0
+    Xn, XT = NeighborIndex._normalize(X)
+    p50, p99 = latencias(lambda f: top_k((Xn[f] @ XT).toarray().ravel(), f, k), filas)
+    print(f"{'conteos (índice K)':<22}{build:>10.2f}{exacto.indices.nbytes / MB + exacto.scores.nbytes / MB:>16,.1f}"
+          f"{1.0:>10.3f}{p50:>10.2f}{p99:>10.2f}")
+
+    for dim in (int(d) for d in args.dims.split(",")):
+        t0 = time.perf_counter()
+        E = SvdEmbedding(dim=dim, seed=args.semilla).fit_transform(X)
+        vecinos = NeighborIndex.build(E, k=k)
+        build = time.perf_counter() - t0
+
+        # Solapamiento con los vecinos exactos de los conteos
+        comunes = sum(len(np.intersect1d(a, b, assume_unique=True)) for a, b in zip(exacto.indices, vecinos.indices))
+        p50, p99 = latencias(lambda f: top_k(E @ E[f], f, k), filas)
+        print(f"{f'SVD dim={E.shape[1]}':<22}{build:>10.2f}{E.nbytes / MB:>16,.1f}"
+              f"{comunes / (n * k):>10.3f}{p50:>10.2f}{p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+
+# ------------------------------------------------------------
+# Benchmark del pipeline completo: construcción del modelo y consultas
+# ------------------------------------------------------------
+# Para cada tamaño de catálogo sintético con la forma de TMDB (por defecto 5k, 50k y 500k):
+#   1. genera (o reutiliza) los CSVs movies/credits (Benchmark_preparacion.csv_sinteticos)
+#   2. construye el modelo con ModelBuilder midiendo por etapa (lectura y merge, limpieza,
+#      vectorización, vecinos, guardado) el tiempo de reloj, el de CPU, el pico de RSS y
+#      los bytes de los artefactos (Metricas.StageReport)
+#   3. abre los artefactos como la app (Aplicacion_Web/artifacts.py) y mide la latencia
+#      de una recomendación (recommend_row) y de una búsqueda de títulos
+# y guarda todo en un JSON con el commit y las versiones, para comparar entre versiones:
+#
+#   python Benchmark_pipeline.py --salida antes.json
+#   ... cambios ...
+#   python Benchmark_pipeline.py --salida despues.json --comparar antes.json
+#
+# El cálculo de vecinos crece con n²: 500k películas tarda horas con pocos núcleos
+# (ajustar --tamanos y --workers).
+#
+# Uso:
+#   python Benchmark_pipeline.py [--tamanos 5000,50000,500000] [--workers 4] [--datos DIR] [--salida F.json]
+
+import argparse                     # Argumentos de línea de comandos
+import json                         # Resultados y comparación
+import os                           # Rutas y tamaños de archivo
+import sys                          # Importar el motor de la app (Aplicacion_Web)
+import tempfile                     # Carpeta de datos por defecto
+import time                         # Medición de tiempo
+import numpy as np                  # Percentiles y consultas aleatorias
+
+from Benchmark_preparacion import csv_sinteticos
+from Constructor import ModelBuilder
+from Metricas import environment, MB
+
+# Carpeta de la app: el benchmark consulta los artefactos con el mismo código que la app
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Aplicacion_Web")
+
+
+def datos_sinteticos(n, carpeta, semilla, max_crew):
+    """CSVs de n películas en carpeta/n<n>_s<semilla>_c<max_crew> (se reutilizan si ya existen)."""
+    destino = os.path.join(carpeta, f"n{n}_s{semilla}_c{max_crew}")
+    movies_path = os.path.join(destino, "movies.csv")
+    credits_path = os.path.join(destino, "credits.csv")
+    if os.path.exists(movies_path) and os.path.exists(credits_path):
+        return movies_path, credits_path, 0.0
+    os.makedirs(destino, exist_ok=True)
+    t0 = time.perf_counter()
+    csv_sinteticos(n, destino, semilla, max_cast=max(1, max_crew // 2), max_crew=max_crew)
+    return movies_path, credits_path, time.perf_counter() - t0
+
+
+def percentiles_us(fn, args):
+    """p50/p99/media (µs) de fn(a) para cada a."""
+    lat = np.empty(len(args))
+    for i, a in enumerate(args):
+        t0 = time.perf_counter()
+        fn(a)
+        lat[i] = (time.perf_counter() - t0) * 1e6
+    return {'p50_us': float(np.percentile(lat, 50)), 'p99_us': float(np.percentile(lat, 99)),
+            'mean_us': float(lat.mean())}
+
+
+def consultas_app(model_dir, consultas, k, semilla):
+    """Abre el modelo como la app y mide la carga, recommend_row y la búsqueda de títulos."""
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    from artifacts import load_artifacts, load_title_index
+    from engine import RecommendationEngine
+
+    t0 = time.perf_counter()
+    movies, neighbors = load_artifacts(model_dir)
+    engine = RecommendationEngine(movies, neighbors=neighbors, title_index=load_title_index(movies, model_dir))
+    carga = time.perf_counter() - t0
+
+    rng = np.random.default_rng(semilla)
+    filas = rng.integers(0, len(engine), size=consultas)
+    # Búsquedas: prefijos de títulos existentes ("movie 12", "movie 4031"...)
+    textos = [str(engine.titles[f])[:rng.integers(3, len(str(engine.titles[f])) + 1)] for f in filas]
+    return {
+        'load_s': carga,
+        'recommend': percentiles_us(lambda f: engine.recommend_row(int(f), k), filas),
+        'search': percentiles_us(lambda q: engine.search(q, 10), textos),
+    }
+
+
+def medir(n, args):
+    """Genera los datos de n películas, construye el modelo y mide las consultas."""
+    movies_path, credits_path, generacion = datos_sinteticos(n, args.datos, args.semilla, args.max_crew)
+    model_dir = os.path.join(os.path.dirname(movies_path), "model")
+    os.makedirs(model_dir, exist_ok=True)
+    print(f"\n===== {n:,} películas ({(os.path.getsize(movies_path) + os.path.getsize(credits_path)) / MB:,.0f} MB"
+          f" de CSV) =====")
+
+    builder = ModelBuilder(k=args.k_vecinos, workers=args.workers, max_rss_mb=args.max_rss_mb,
+                           paths=(os.path.join(model_dir, "movie_list.pkl"), model_dir, movies_path, credits_path))
+    builder.build_and_save(force=True)
+    return {
+        'n_movies': n,
+        'csv_bytes': os.path.getsize(movies_path) + os.path.getsize(credits_path),
+        'generation_s': generacion,
+        'params': builder.params(),
+        'build': builder.report.to_dict(),
+        'online': consultas_app(model_dir, args.consultas, args.k, args.semilla),
+    }
+
+
+def comparar(actual, anterior):
+    """Imprime la razón actual/anterior de tiempo y pico por etapa (mismos tamaños)."""
+    previos = {r['n_movies']: r for r in anterior['results']}
+    print(f"\nComparación con {anterior['environment'].get('commit')} (actual/anterior; < 1 es mejor)")
+    print(f"{'n':>9}  {'etapa':<22}{'reloj':>8}{'pico':>8}")
+    for r in actual['results']:
+        p = previos.get(r['n_movies'])
+        if p is None:
+            continue
+        etapas = {s['stage']: s for s in p['build']['stages']}
+        filas = [(s['stage'], s, etapas.get(s['stage'])) for s in r['build']['stages']]
+        filas.append(("total", r['build']['total'], p['build']['total']))
+        for nombre, a, b in filas:
+            if b is None:
+                continue
+            reloj = a['wall_s'] / b['wall_s'] if b['wall_s'] else float('nan')
+            pico = a['peak_rss_bytes'] / b['peak_rss_bytes'] if a['peak_rss_bytes'] and b['peak_rss_bytes'] else float('nan')
+            print(f"{r['n_movies']:>9,}  {nombre:<22}{reloj:>8.2f}{pico:>8.2f}")
+        for consulta in ("recommend", "search"):
+            a, b = r['online'][consulta]['p50_us'], p['online'][consulta]['p50_us']
+            print(f"{r['n_movies']:>9,}  {consulta + ' p50':<22}{a / b:>8.2f}{'':>8}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tiempo, memoria y bytes por etapa del pipeline en catálogos sintéticos.")
+    ap.add_argument("--tamanos", default="5000,50000,500000", help="Tamaños de catálogo, separados por comas.")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--max-rss-mb", type=int, default=None)
+    ap.add_argument("--k-vecinos", type=int, default=20, help="Vecinos guardados por película.")
+    ap.add_argument("--k", type=int, default=5, help="Recomendaciones por consulta.")
+    ap.add_argument("--consultas", type=int, default=1000)
+    ap.add_argument("--max-crew", type=int, default=60, help="Máximo de personas en el crew sintético.")
+    ap.add_argument("--semilla", type=int, default=0)
+    ap.add_argument("--datos", default=os.path.join(tempfile.gettempdir(), "recsys_benchmark"),
+                    help="Carpeta de los CSVs y modelos sintéticos (se reutilizan entre ejecuciones).")
+    ap.add_argument("--salida", default="benchmark_pipeline.json")
+    ap.add_argument("--comparar", default=None, help="JSON de una ejecución anterior.")
+    args = ap.parse_args()
+
+    resultado = {'environment': environment(), 'workers': args.workers, 'results': []}
+    for n in (int(t) for t in args.tamanos.split(",")):
+        resultado['results'].append(medir(n, args))
+        # Se guarda después de cada tamaño: los resultados parciales no se pierden
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+    print(f"\n{'n':>9}{'build (s)':>11}{'pico (MB)':>11}{'artef. (MB)':>13}{'rec p50 (µs)':>14}{'busq. p50 (µs)':>16}")
+    for r in resultado['results']:
+        total, online = r['build']['total'], r['online']
+        print(f"{r['n_movies']:>9,}{total['wall_s']:>11.1f}{(total['peak_rss_bytes'] or 0) / MB:>11.0f}"
+              f"{total['artifact_bytes'] / MB:>13.1f}{online['recommend']['p50_us']:>14.1f}{online['search']['p50_us']:>16.1f}")
+    print(f"\n📊 Resultados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            comparar(resultado, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+
+# ------------------------------------------------------------
+# Benchmark: MoviePreprocessor (implementación original vs. actual)
+# ------------------------------------------------------------
+# Compara el tiempo de lectura de los CSV + merge + preprocesado con:
+#   - "original": ast.literal_eval sobre cada celda, .apply por columna y .apply(axis=1)
+#   - "json": lectura JSON/orjson, 3 primeros actores con raw_decode y búsqueda dirigida
+#     del director; limpieza con comprensiones por columna (MoviePreprocessor.apply_all)
+#   - "json xN": lo mismo repartido en N procesos por bloques
+#   - "por bloques": MoviePreprocessor.iter_tags (lectura y proceso por bloques de filas)
+# y comprueba que las 'tags' resultantes sean idénticas.
+#
+# Datos: los CSV de TMDB (PathResolver) o, con --sintetico N, celdas sintéticas con el
+# mismo formato y tamaño típico (crew de decenas a cientos de personas); una de cada
+# `cada_python` celdas de crew se escribe con formato de Python (comillas simples), que los
+# caminos rápidos no reconocen y deben resolver igual que la versión original.
+#
+# Uso:
+#   python Benchmark_preparacion.py [--sintetico 20000] [--workers 4]
+
+import argparse                     # Argumentos de línea de comandos
+import ast                          # Implementación original (literal_eval)
+import json                         # Celdas sintéticas
+import os                           # Número de CPUs
+import random                       # Datos sintéticos
+import tempfile                     # CSV sintéticos temporales
+import time                         # Medición de tiempo
+import pandas as pd
+
+from Preparacion import MoviePreprocessor
+
+
+class OriginalPreprocessor(MoviePreprocessor):
+    """MoviePreprocessor original: ast.literal_eval por celda y .apply fila a fila."""
+
+    @staticmethod
+    def safe_literal_list(text):
+        try:
+            if pd.isna(text):
+                return []
+            return [str(it['name']) for it in ast.literal_eval(text) if isinstance(it, dict) and it.get('name')]
+        except Exception:
+            return []
+
+    @staticmethod
+    def safe_literal_top3_cast(text):
+        try:
+            if pd.isna(text):
+                return []
+            return [str(it['name']) for it in ast.literal_eval(text)[:3] if isinstance(it, dict) and it.get('name')]
+        except Exception:
+            return []
+
+    @staticmethod
+    def safe_literal_director(text):
+        try:
+            if pd.isna(text):
+                return []
+            return [str(it['name']) for it in ast.literal_eval(text)
+                    if isinstance(it, dict) and it.get('job') == 'Director' and it.get('name')]
+        except Exception:
+            return []
+
+    @classmethod
+    def apply_all(cls, movies_df, workers=1):
+        movies = movies_df.copy()
+        movies['overview'] = movies['overview'].fillna('')
+        movies['genres'] = movies['genres'].apply(cls.safe_literal_list)
+        movies['keywords'] = movies['keywords'].apply(cls.safe_literal_list)
+        movies['cast'] = movies['cast'].apply(cls.safe_literal_top3_cast)
+        movies['crew'] = movies['crew'].apply(cls.safe_literal_director)
+        movies['overview'] = movies['overview'].apply(lambda x: str(x).split())
+        for c in ['cast', 'crew', 'genres', 'keywords']:
+            movies[c] = movies[c].apply(cls.collapse)
+        movies = movies[~movies.apply(cls.empty_row, axis=1)].copy()
+        movies['tags'] = (movies['overview'] + movies['genres'] +
+                          movies['keywords'] + movies['cast'] + movies['crew'])
+        new = movies[['movie_id', 'title', 'tags']].copy()
+        new['tags'] = new['tags'].apply(lambda x: " ".join(x))
+        return movies, new
+
+
+def csv_sinteticos(n, carpeta, semilla=0, max_cast=80, max_crew=200, bloque=10000, cada_python=50):
+    """
+    Escribe movies/credits sintéticos (celdas JSON del tamaño de las de TMDB) y devuelve sus rutas.
+    Se escriben por bloques de `bloque` películas: la memoria no crece con n.
+    """
+    rng = random.Random(semilla)
+    jobs = ["Director", "Producer", "Screenplay", "Editor", "Director of Photography",
+            "Original Music Composer", "Casting", "Sound Designer"]
+
+    def persona(i):
+        return f"Person {rng.randrange(50000)}"
+
+    movies_path = os.path.join(carpeta, "movies.csv")
+    credits_path = os.path.join(carpeta, "credits.csv")
+    for inicio in range(0, n, bloque):
+        movies, credits = [], []
+        for i in range(inicio, min(n, inicio + bloque)):
+            movies.append({
+                'id': i + 1,
+                'title': f"Movie {i}",
+                'overview': " ".join(f"w{rng.randrange(3000)}" for _ in range(rng.randint(0, 60))),
+                'genres': json.dumps([{"id": g, "name": rng.choice(["Action", "Drama", "Science Fiction", "Comedy"])}
+                                      for g in range(rng.randint(0, 4))]),
+                'keywords': json.dumps([{"id": k, "name": f"keyword {rng.randrange(2000)}"}
+                                        for k in range(rng.randint(0, 15))]),
+            })
+            credits.append({
+                'movie_id': i + 1,
+                'title': f"Movie {i}",
+                'cast': json.dumps([{"cast_id": c, "character": f"Character {c}",
+                                     "credit_id": f"52fe{rng.randrange(10**8)}", "gender": rng.randint(0, 2),
+                                     "id": rng.randrange(10**6), "name": persona(c), "order": c}
+                                    for c in range(rng.randint(0, max_cast))]),
+                'crew': [{"credit_id": f"52fe{rng.randrange(10**8)}", "department": "Crew",
+                          "gender": rng.randint(0, 2), "id": rng.randrange(10**6),
+                          "job": rng.choice(jobs), "name": persona(c)}
+                         for c in range(rng.randint(0, max_crew))],
+            })
+            # Formato de Python (repr) en algunas celdas; el resto, JSON como en TMDB
+            crew = credits[-1]['crew']
+            credits[-1]['crew'] = str(crew) if cada_python and i % cada_python == 0 else json.dumps(crew)
+        modo = 'w' if inicio == 0 else 'a'
+        pd.DataFrame(movies).to_csv(movies_path, index=False, mode=modo, header=inicio == 0)
+        pd.DataFrame(credits).to_csv(credits_path, index=False, mode=modo, header=inicio == 0)
+    return movies_path, credits_path
+
+
+def completo(preprocessor, movies_path, credits_path, workers=1):
+    """Lectura completa + merge por ID + apply_all (como ModelBuilder.load_movies)."""
+    movies = MoviePreprocessor.read_movies(movies_path, credits_path)
+    if preprocessor is OriginalPreprocessor:
+        movies['genres'] = movies['genres'].astype(object)   # La versión original no conoce las categorías
+    return preprocessor.apply_all(movies, workers=workers)[1]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tiempo de MoviePreprocessor.apply_all.")
+    ap.add_argument("--sintetico", type=int, default=0, help="Usar N películas sintéticas en lugar de los CSV.")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunksize", type=int, default=2000, help="Filas por bloque en la variante por bloques.")
+    args = ap.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    if args.sintetico:
+        movies_path, credits_path = csv_sinteticos(args.sintetico, tmp.name)
+    else:
+        from Config_paths import PathResolver
+        _, _, movies_path, credits_path = PathResolver().paths()
+
+    variantes = {
+        "original": lambda: completo(OriginalPreprocessor, movies_path, credits_path),
+        "json": lambda: completo(MoviePreprocessor, movies_path, credits_path),
+        f"json x{args.workers}": lambda: completo(MoviePreprocessor, movies_path, credits_path, args.workers),
+        "por bloques": lambda: pd.concat(list(MoviePreprocessor.iter_tags(movies_path, credits_path, args.chunksize)),
+                                         ignore_index=True),
+    }
+    resultados = {}
+    for nombre, fn in variantes.items():
+        t0 = time.perf_counter()
+        new = fn()
+        resultados[nombre] = (time.perf_counter() - t0, new)
+    tmp.cleanup()
+
+    base_t, base_new = resultados["original"]
+    print(f"Películas: {len(base_new):,}")
+    print(f"\n{'variante':<16}{'tiempo (s)':>12}{'aceleración':>13}{'tags iguales':>14}")
+    for nombre, (t, new) in resultados.items():
+        iguales = new.reset_index(drop=True).equals(base_new.reset_index(drop=True))
+        print(f"{nombre:<16}{t:>12.2f}{base_t / t:>12.1f}x{str(iguales):>14}")
+
+
+if __name__ == "__main__":
+    main()
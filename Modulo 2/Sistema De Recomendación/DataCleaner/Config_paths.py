@@ -10,7 +10,7 @@ class PathResolver:
     para el sistema de recomendación de películas.
 
     - Identifica el directorio base donde se ejecuta el código.
-    - Crea (si no existe) la carpeta 'model' para guardar archivos .pkl.
+    - Crea (si no existe) la carpeta 'model' para guardar los artefactos del modelo.
     - Busca las rutas relativas de los datasets (movies y credits).
     - Muestra mensajes informativos sobre las rutas detectadas.
     """
@@ -37,9 +37,9 @@ class PathResolver:
         # Crea la carpeta 'model' si no existe
         os.makedirs(self.MODEL_DIR, exist_ok=True)
 
-        # Define las rutas completas para los archivos pickle del modelo
+        # Ruta del pickle con la tabla completa (movie_id, title, tags) para el propio constructor;
+        # la app lee los artefactos .npy de esta misma carpeta (ver Artefactos.py)
         self.movie_list_pkl = os.path.join(self.MODEL_DIR, "movie_list.pkl")
-        self.similarity_pkl = os.path.join(self.MODEL_DIR, "similarity.pkl")
 
         # Muestra en consola la ruta donde se guardarán los modelos
         print(f"Carpeta 'model': {self.MODEL_DIR}")
@@ -82,9 +82,9 @@ class PathResolver:
         """
         Devuelve las rutas en el mismo orden lógico usado por el script original:
         1. movie_list_pkl   → archivo .pkl con la lista de películas procesadas.
-        2. similarity_pkl   → archivo .pkl con la matriz de similitudes.
+        2. MODEL_DIR        → carpeta de artefactos (.npy mapeables en memoria + manifest.json).
         3. movies_path      → ruta del dataset tmdb_5000_movies.csv.
         4. credits_path     → ruta del dataset tmdb_5000_credits.csv.
         """
         # Retorna las cuatro rutas como tupla en el orden establecido
-        return self.movie_list_pkl, self.similarity_pkl, self.movies_path, self.credits_path
+        return self.movie_list_pkl, self.MODEL_DIR, self.movies_path, self.credits_path
@@ -3,16 +3,23 @@
 # Importación de librerías necesarias
 # ------------------------------------------------------------
 import os                           # Para manejo de rutas y tamaños de archivos
+from contextlib import nullcontext  # Etapas sin medir (load_movies sin StageReport)
 import pickle                       # Para guardar y cargar objetos serializados (.pkl)
+import numpy as np                  # Traducción de filas en la actualización incremental
 import pandas as pd                 # Para manipulación de datos en estructuras tipo DataFrame
+import scipy.sparse as sp           # Unión de la matriz de conteos anterior con las filas nuevas
 from sklearn.feature_extraction.text import CountVectorizer  # Convierte texto a vectores numéricos
-from sklearn.metrics.pairwise import cosine_similarity       # Calcula similitud entre vectores
 
 # ------------------------------------------------------------
 # Importación de módulos personalizados del proyecto
 # ------------------------------------------------------------
 from Config_paths import PathResolver         # Gestiona rutas de archivos y directorios
 from Preparacion import MoviePreprocessor     # Encapsula la limpieza y preparación de datos
+from Vecinos import NeighborIndex, block_size_for  # Índice top-K de vecinos (reemplaza la matriz n×n)
+from Metricas import StageReport, current_rss, MB  # Tiempo y memoria por etapa
+from Embeddings import SvdEmbedding           # Embeddings densos opcionales (SVD truncada)
+from Artefactos import ArtifactWriter         # Escritura de artefactos .npy mapeables en memoria
+import Artefactos                             # Lectura del manifiesto y de los artefactos del constructor
 
 
 class ModelBuilder:
@@ -23,79 +30,289 @@ class ModelBuilder:
     pero de manera modular y estructurada en una clase.
     """
 
-    def __init__(self):
+    def __init__(self, k=20, block_size=1024, max_features=5000, workers=1, chunksize=None, max_rss_mb=None,
+                 embedding_dim=None, paths=None):
+        # Número de vecinos guardados por película y filas por bloque al calcular similitudes
+        self.k = k
+        self.block_size = block_size
+        # Tamaño del vocabulario del CountVectorizer
+        self.max_features = max_features
+        # Procesos para leer las columnas JSON y calcular los bloques de similitud (1 = sin paralelismo)
+        self.workers = workers
+        # Límite aproximado de memoria residente (MB) durante el cálculo de vecinos: reduce block_size
+        self.max_rss_mb = max_rss_mb
+        # Filas por bloque al leer los CSVs (None = todo de una vez; ver MoviePreprocessor.iter_tags)
+        self.chunksize = chunksize
+        # Dimensiones de los embeddings SVD que se guardan junto al índice (None = sin embeddings)
+        self.embedding_dim = embedding_dim
+
+        # Tiempo y memoria por etapa de la última ejecución (ver Metricas.StageReport)
+        self.report = None
+
         # Crea una instancia de PathResolver para obtener las rutas necesarias
-        self.resolver = PathResolver()
+        # (paths permite usar otras rutas, p. ej. los CSVs sintéticos de Benchmark_pipeline.py)
+        self.resolver = PathResolver() if paths is None else None
 
         # Desempaqueta las rutas devueltas por el método paths():
         # - movie_list_pkl: ruta donde se guardará el archivo .pkl de películas
-        # - similarity_pkl: ruta donde se guardará el archivo .pkl de similitud
+        # - model_dir: carpeta donde se guardan los artefactos .npy que lee la app
         # - movies_path: ruta del CSV de películas (tmdb_5000_movies.csv)
         # - credits_path: ruta del CSV de créditos (tmdb_5000_credits.csv)
         (self.movie_list_pkl,
-         self.similarity_pkl,
+         self.model_dir,
          self.movies_path,
-         self.credits_path) = self.resolver.paths()
+         self.credits_path) = self.resolver.paths() if paths is None else paths
+
+
+    # --------------------------------------------------------
+    # Funciones auxiliares
+    # --------------------------------------------------------
+
+    def load_movies(self, movies_path, credits_path, report=None):
+        """
+        Carga los CSVs (solo las columnas necesarias, tipos compactos), los une por ID
+        (movies.id = credits.movie_id) y aplica MoviePreprocessor.
+        Devuelve el DataFrame reducido (movie_id, title, tags) con índice 0..n-1.
+        Con chunksize (o un chunksize calculado a partir de max_rss_mb), los CSVs se leen
+        y procesan por bloques.
+        Con report (StageReport), la lectura y la limpieza se miden como etapas separadas.
+        """
+        stage = report.stage if report is not None else (lambda name: nullcontext())
+        chunksize = self.read_chunksize(movies_path, credits_path)
+        if chunksize:
+            with stage("lectura y limpieza"):
+                chunks = MoviePreprocessor.iter_tags(movies_path, credits_path, chunksize, self.workers)
+                return pd.concat(list(chunks), ignore_index=True)
+
+        # Carga ambos datasets y los une por ID (unir por 'title' duplicaba los títulos repetidos)
+        with stage("lectura y merge"):
+            movies = MoviePreprocessor.read_movies(movies_path, credits_path)
 
+        # Aplica la preparación definida en MoviePreprocessor (procesa campos de texto, listas, etc.)
+        # Devuelve dos DataFrames: uno limpio (movies_clean) y otro reducido (new) con 'tags' combinadas
+        with stage("limpieza"):
+            movies_clean, new = MoviePreprocessor.apply_all(movies, workers=self.workers)
+
+        # Índice posicional 0..n-1: la fila i del índice de vecinos es la película i
+        return new.reset_index(drop=True)
+
+    def read_chunksize(self, movies_path, credits_path):
+        """
+        Filas por bloque al leer los CSVs. Sin chunksize explícito, con max_rss_mb se leen
+        por bloques solo si los archivos (una vez en memoria ocupan unas 3 veces su tamaño
+        en disco: texto de Python + listas) no caben en la mitad del límite.
+        """
+        if self.chunksize or self.max_rss_mb is None:
+            return self.chunksize
+        disk = os.path.getsize(movies_path) + os.path.getsize(credits_path)
+        budget = self.max_rss_mb * MB / 2 - (current_rss() or 0)
+        if 3 * disk <= budget:
+            return None
+        rows = sum(1 for _ in open(movies_path, 'rb'))   # Aproximado (sinopsis con saltos de línea)
+        chunksize = max(1000, int(rows * max(budget, 0) / (3 * disk)))
+        print(f"Límite {self.max_rss_mb} MB → CSVs por bloques de {chunksize} filas")
+        return chunksize
 
-    def build_and_save(self):
+    def neighbor_block_size(self, vector):
+        """
+        Filas por bloque para el cálculo de vecinos. Sin max_rss_mb es self.block_size;
+        con límite, se descuenta la memoria ya usada (y la copia de la matriz que recibe
+        cada proceso trabajador) y se reparte el resto entre los bloques en curso.
+        """
+        if self.max_rss_mb is None:
+            return self.block_size
+        n = vector.shape[0]
+        # Matriz normalizada y su traspuesta (datos float32 + índices int32)
+        matrix_bytes = 2 * (vector.nnz * 8 + (n + vector.shape[1]) * 4)
+        copies = self.workers if self.workers > 1 else 1
+        budget = self.max_rss_mb * MB - (current_rss() or 0) - copies * matrix_bytes
+        block_size = min(self.block_size, block_size_for(n, budget, self.workers))
+        print(f"Límite {self.max_rss_mb} MB → bloques de {block_size} filas")
+        return block_size
+
+    def params(self):
+        """Parámetros que, si cambian, obligan a reconstruir el modelo completo."""
+        return {'k': self.k, 'max_features': self.max_features, 'embedding_dim': self.embedding_dim}
+
+    def sources(self):
+        """Huella sha256 de los datasets de entrada."""
+        return {'movies': Artefactos.file_hash(self.movies_path),
+                'credits': Artefactos.file_hash(self.credits_path)}
+
+    def save(self, new, vector, vocabulary, neighbors, embedding=None, **manifest):
+        """
+        Guarda movie_list.pkl, los artefactos .npy de la app y los del constructor.
+        Devuelve el total de bytes escritos.
+        """
+        # Guarda el DataFrame reducido (new) con movie_id, title y tags (uso interno del constructor)
+        with open(self.movie_list_pkl, 'wb') as f:
+            pickle.dump(new, f)
+        # Muestra confirmación con el tamaño del archivo
+        print(f"✔ Guardado: {self.movie_list_pkl} ({os.path.getsize(self.movie_list_pkl)} bytes)")
+
+        # Guarda la tabla de películas por columnas y el índice de vecinos como .npy;
+        # la app los abre con np.load(mmap_mode='r') y los procesos comparten las páginas
+        writer = ArtifactWriter(self.model_dir)
+        writer.save_movies(new)
+        writer.save_title_index(new['title'])
+        writer.save_neighbors(neighbors)
+        if embedding is not None:
+            # (embeddings normalizados, componentes de la SVD)
+            writer.save_embeddings(*embedding)
+
+        # Conteos y vocabulario congelado para las actualizaciones incrementales
+        writer.save_vectors(vector)
+        writer.save_vocabulary(vocabulary)
+        writer.write_manifest(n_movies=len(new), k=neighbors.k, params=self.params(), **manifest)
+        return os.path.getsize(self.movie_list_pkl) + sum(writer.files.values())
+
+    def build_and_save(self, force=False):
         """
         Ejecuta paso a paso la construcción del modelo:
+        0. Si los datasets y parámetros no cambiaron desde la última construcción, no hace nada
+           (salvo con force=True).
         1. Carga los datasets.
-        2. Realiza el merge entre movies y credits.
+        2. Realiza el merge entre movies y credits por ID.
         3. Aplica limpieza y transformación con MoviePreprocessor.
-        4. Vectoriza los textos y calcula la matriz de similitud.
-        5. Guarda los resultados en archivos .pkl.
+        4. Vectoriza los textos y calcula el índice top-K de vecinos por bloques
+           (y, con embedding_dim, los embeddings SVD).
+        5. Guarda los artefactos: .npy por columna/índice (para la app) y movie_list.pkl.
         """
 
         # --------------------------------------------------------
-        # 1) Cargar CSVs originales (películas y créditos)
+        # 0) Comprobación de cambios (huella de los CSVs)
         # --------------------------------------------------------
-        movies = pd.read_csv(self.movies_path)   # Carga el dataset principal de películas
-        credits = pd.read_csv(self.credits_path) # Carga el dataset de créditos
-        print("Películas:", movies.shape, " | Créditos:", credits.shape)  # Imprime tamaño de ambos
+        sources = self.sources()
+        manifest = Artefactos.read_manifest(self.model_dir)
+        if (not force and manifest is not None
+                and manifest.get('sources') == sources
+                and manifest.get('params') == self.params()
+                and all(os.path.exists(os.path.join(self.model_dir, name)) for name in manifest.get('files', {}))
+                and os.path.exists(self.movie_list_pkl)):
+            print("\n✅ Datasets sin cambios: el modelo ya está actualizado (usa force=True para reconstruir).")
+            return False
 
-        # --------------------------------------------------------
-        # 2) Merge entre ambos datasets por la columna 'title'
-        # --------------------------------------------------------
-        movies = movies.merge(credits, on='title', how='inner')  # Une ambos datasets
-        # Selecciona solo las columnas relevantes para el modelo
-        movies = movies[['movie_id', 'title', 'overview', 'genres', 'keywords', 'cast', 'crew']].copy()
+        # Tiempo y memoria de cada etapa
+        report = self.report = StageReport(budget_mb=self.max_rss_mb)
 
         # --------------------------------------------------------
-        # 3) Limpieza y transformación de datos
+        # 1-3) Carga, merge por ID y limpieza de los CSVs
         # --------------------------------------------------------
-        # Aplica la preparación definida en MoviePreprocessor (procesa campos de texto, listas, etc.)
-        # Devuelve dos DataFrames: uno limpio (movies_clean) y otro reducido (new) con 'tags' combinadas
-        movies_clean, new = MoviePreprocessor.apply_all(movies)
+        new = self.load_movies(self.movies_path, self.credits_path, report)
 
         # --------------------------------------------------------
-        # 4) Vectorización y cálculo de similitud
+        # 4) Vectorización y vecinos más cercanos
         # --------------------------------------------------------
-        # Convierte los textos en vectores numéricos de conteo de palabras
-        cv = CountVectorizer(max_features=5000, stop_words='english')
-        vector = cv.fit_transform(new['tags']).toarray()  # Matriz de características
+        with report.stage("vectorización"):
+            # Convierte los textos en vectores de conteo (matriz dispersa float32, nunca densa)
+            cv = CountVectorizer(max_features=self.max_features, stop_words='english', dtype=np.float32)
+            vector = cv.fit_transform(new['tags'])
+
+        with report.stage("vecinos"):
+            # Calcula, por bloques de filas (en paralelo con workers > 1), los K vecinos más similares
+            neighbors = NeighborIndex.build(vector, k=self.k, block_size=self.neighbor_block_size(vector),
+                                            workers=self.workers)
+        print("Vector shape:", vector.shape, " | Neighbors shape:", neighbors.indices.shape)
 
-        # Calcula la similitud entre las películas usando la similitud del coseno
-        similarity = cosine_similarity(vector)
-        print("Vector shape:", vector.shape, " | Similarity shape:", similarity.shape)
+        # Embeddings densos (opcional): vecinos al vuelo con un producto matriz-vector en la app
+        embedding = None
+        if self.embedding_dim:
+            with report.stage("embeddings"):
+                svd = SvdEmbedding(dim=self.embedding_dim)
+                embedding = (svd.fit_transform(vector), svd.components)
+            print("Embeddings shape:", embedding[0].shape)
 
         # --------------------------------------------------------
-        # 5) Guardado de modelos en archivos pickle
+        # 5) Guardado de artefactos
         # --------------------------------------------------------
-        # Guarda el DataFrame reducido (new) con movie_id, title y tags
-        with open(self.movie_list_pkl, 'wb') as f:
-            pickle.dump(new, f)
-        # Muestra confirmación con el tamaño del archivo
-        print(f"✔ Guardado: {self.movie_list_pkl} ({os.path.getsize(self.movie_list_pkl)} bytes)")
-
-        # Guarda la matriz de similitud para uso en la app Streamlit
-        with open(self.similarity_pkl, 'wb') as f:
-            pickle.dump(similarity, f)
-        print(f"✔ Guardado: {self.similarity_pkl} ({os.path.getsize(self.similarity_pkl)} bytes)")
+        with report.stage("guardado") as stage:
+            stage['artifact_bytes'] = self.save(new, vector, cv.get_feature_names_out(), neighbors, embedding,
+                                                sources=sources, deltas=[])
+        report.summary()
 
         # --------------------------------------------------------
         # 6) Mensaje final de éxito
         # --------------------------------------------------------
         print("\n✅ Archivos generados correctamente.")
         print("Importante: en tu app lee usando la MISMA ruta absoluta mostrada arriba.")
+        return True
+
+    def update_from_delta(self, delta_movies_path, delta_credits_path):
+        """
+        Agrega o actualiza películas a partir de CSVs delta (mismo formato que los de TMDB,
+        solo con las filas nuevas o modificadas), sin reconstruir el modelo completo:
+
+        1. Preprocesa solo las filas del delta.
+        2. Las vectoriza con el vocabulario congelado de la última construcción completa.
+        3. Reemplaza las películas con el mismo movie_id (o las agrega al final).
+        4. Actualiza solo las listas de vecinos afectadas (NeighborIndex.update).
+
+        Un delta ya aplicado (misma huella) se ignora.
+        """
+        manifest = Artefactos.read_manifest(self.model_dir)
+        if manifest is None or manifest.get('params') != self.params():
+            raise RuntimeError("No hay un modelo compatible: ejecuta primero la construcción completa.")
+
+        delta = {'movies': Artefactos.file_hash(delta_movies_path),
+                 'credits': Artefactos.file_hash(delta_credits_path)}
+        if delta in manifest.get('deltas', []):
+            print("\n✅ Este delta ya fue aplicado: el modelo ya está actualizado.")
+            return False
+
+        report = self.report = StageReport(budget_mb=self.max_rss_mb)
+
+        # --------------------------------------------------------
+        # 1) Modelo actual
+        # --------------------------------------------------------
+        with report.stage("lectura del modelo"):
+            old = pd.read_pickle(self.movie_list_pkl)
+            old_vector = Artefactos.load_vectors(self.model_dir)
+            vocabulary = Artefactos.load_vocabulary(self.model_dir)
+            neighbors = NeighborIndex(*Artefactos.load_neighbors(self.model_dir))
+            old_embedding = Artefactos.load_embeddings(self.model_dir) if self.embedding_dim else None
+
+        # --------------------------------------------------------
+        # 2) Preprocesado y vectorización (vocabulario congelado) del delta
+        # --------------------------------------------------------
+        with report.stage("delta"):
+            delta_new = self.load_movies(delta_movies_path, delta_credits_path)
+            cv = CountVectorizer(vocabulary=vocabulary, stop_words='english', dtype=np.float32)
+            delta_vector = cv.transform(delta_new['tags'])
+
+        # --------------------------------------------------------
+        # 3) Tabla nueva: películas sin cambios + películas del delta al final
+        # --------------------------------------------------------
+        replaced = old['movie_id'].isin(delta_new['movie_id']).to_numpy()
+        kept = np.flatnonzero(~replaced)
+        old_to_new = np.full(len(old), -1, dtype=np.int64)
+        old_to_new[kept] = np.arange(len(kept))
+
+        new = pd.concat([old.iloc[kept], delta_new], ignore_index=True)
+        vector = sp.vstack([old_vector[kept], delta_vector], format='csr', dtype=np.float32)
+        changed = np.arange(len(kept), len(new))
+        print(f"Delta: {len(delta_new)} filas ({int(replaced.sum())} reemplazadas) | Total: {len(new)}")
+
+        # --------------------------------------------------------
+        # 4) Vecinos: solo las listas afectadas
+        # --------------------------------------------------------
+        with report.stage("vecinos"):
+            neighbors = neighbors.update(vector, old_to_new, changed, k=self.k,
+                                         block_size=self.neighbor_block_size(vector), workers=self.workers)
+
+        # Embeddings: las filas del delta se proyectan con la base SVD ya guardada
+        embedding = None
+        if old_embedding is not None:
+            old_embeddings, components = old_embedding
+            svd = SvdEmbedding.from_components(components)
+            embedding = (np.vstack([old_embeddings[kept], svd.transform(delta_vector)]), components)
+
+        # --------------------------------------------------------
+        # 5) Guardado (las huellas de los CSVs base se conservan)
+        # --------------------------------------------------------
+        with report.stage("guardado") as stage:
+            stage['artifact_bytes'] = self.save(new, vector, vocabulary, neighbors, embedding,
+                                                sources=manifest.get('sources'),
+                                                deltas=manifest.get('deltas', []) + [delta])
+        report.summary()
+        print("\n✅ Modelo actualizado con el delta.")
+        return True
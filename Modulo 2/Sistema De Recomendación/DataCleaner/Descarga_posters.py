@@ -0,0 +1,194 @@
+
+# ------------------------------------------------------------
+# Precarga de pósters de todo el catálogo (trabajo por lotes)
+# ------------------------------------------------------------
+# Recorre todos los movie_id de model/movie_list.pkl, descarga su póster de TMDB con
+# concurrencia limitada y reintentos con espera exponencial, y guarda las miniaturas
+# JPEG en un solo archivo model/posters.pack (ver Artefactos.py). La app sirve los
+# pósters desde ese archivo sin ninguna llamada de red al atender a un usuario.
+#
+# Se puede relanzar: las películas que ya están en el paquete no se vuelven a descargar
+# (salvo con --force) y las que fallaron se reintentan en la siguiente ejecución.
+#
+# Uso:
+#   python Descarga_posters.py [--workers 8] [--reintentos 5] [--limite 100] [--force]
+
+import argparse                     # Argumentos de línea de comandos
+import os                           # Variables de entorno y rutas
+import random                       # Variación aleatoria (jitter) de las esperas
+import threading                    # Una Session por hilo
+import time                         # Esperas entre reintentos y duración total
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from io import BytesIO              # Imagen descargada en memoria
+import pandas as pd                 # Lectura de movie_list.pkl
+import requests                     # Peticiones HTTP a TMDB
+from PIL import Image               # Miniaturas JPEG
+
+from Config_paths import PathResolver
+from Artefactos import POSTER_PACK, iter_poster_pack, write_poster_pack
+
+# Clave de la API (la misma que usa la app; se puede sobrescribir con TMDB_API_KEY)
+API_KEY = os.environ.get("TMDB_API_KEY", "0f3ddfe0d97c97f7b1ecd5a5ba358fda")
+API_BASE = "https://api.themoviedb.org/3/movie"
+IMG_BASE = "https://image.tmdb.org/t/p/w342"
+
+# Miniatura: mismo tamaño que la caché de la app (Aplicacion_Web/posters.py)
+THUMB_SIZE = (342, 513)
+
+# Respuestas que vale la pena reintentar: límite de peticiones y errores del servidor
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class PosterDownloader:
+    """
+    Descarga miniaturas de pósters de TMDB con reintentos.
+
+    - Cada hilo usa su propia requests.Session (conexiones reutilizadas).
+    - Los errores de red, 429 y 5xx se reintentan hasta `retries` veces con espera
+      exponencial (base · 2^intento, máximo `max_backoff`) con jitter; si el servidor
+      envía Retry-After se respeta.
+    - fetch() devuelve los bytes JPEG, b"" si la película no tiene póster, o lanza la
+      excepción del último intento.
+    """
+
+    def __init__(self, api_key=API_KEY, retries=5, backoff=0.5, max_backoff=30.0, timeout=10,
+                 api_base=API_BASE, img_base=IMG_BASE, thumb_size=THUMB_SIZE):
+        self.api_key = api_key
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.api_base = api_base
+        self.img_base = img_base
+        self.thumb_size = thumb_size
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _wait(self, attempt, response=None):
+        """Espera antes del reintento `attempt` (0, 1, 2...)."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+        time.sleep(delay)
+
+    def _get(self, url, **params):
+        """GET con reintentos; devuelve la respuesta (None si es 404)."""
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                response = self.session.get(url, params=params or None, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if last:
+                    raise
+                self._wait(attempt)
+                continue
+            if response.status_code in RETRY_STATUS and not last:
+                self._wait(attempt, response)
+                continue
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response
+
+    def fetch(self, movie_id):
+        """Miniatura JPEG del póster de una película (b"" si TMDB no tiene póster)."""
+        meta = self._get(f"{self.api_base}/{int(movie_id)}", api_key=self.api_key, language="en-US")
+        poster_path = meta.json().get("poster_path") if meta is not None else None
+        if not poster_path:
+            return b""
+        image = self._get(self.img_base + poster_path)
+        if image is None:
+            return b""
+
+        img = Image.open(BytesIO(image.content)).convert("RGB")
+        img.thumbnail(self.thumb_size)
+        out = BytesIO()
+        img.save(out, format="JPEG", quality=85, optimize=True)
+        return out.getvalue()
+
+
+def prefetch(movie_ids, pack_path, downloader, workers=8, force=False):
+    """
+    Escribe pack_path con los pósters de `movie_ids`: conserva los que ya estaban en el
+    paquete anterior (salvo force) y descarga el resto con `workers` hilos. Como mucho hay
+    2 · workers descargas en curso, así que la memoria no crece con el tamaño del catálogo.
+    Devuelve un diccionario con los contadores.
+    """
+    wanted = list(dict.fromkeys(int(m) for m in movie_ids))
+    wanted_set = set(wanted)
+    stats = {"reused": 0, "downloaded": 0, "missing": 0, "failed": 0}
+    done = set()
+
+    # El paquete anterior se lee mientras se escribe el nuevo (temporal aparte)
+    def entries():
+        if not force:
+            for movie_id, data in iter_poster_pack(pack_path):
+                if movie_id in wanted_set and movie_id not in done:
+                    done.add(movie_id)
+                    stats["reused"] += 1
+                    yield movie_id, data
+
+        pending_ids = iter([m for m in wanted if m not in done])
+        total = len(wanted) - len(done)
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poster") as pool:
+            running, next_report = {}, 500
+            while True:
+                # Mantiene acotado el número de descargas en curso
+                for movie_id in pending_ids:
+                    running[pool.submit(downloader.fetch, movie_id)] = movie_id
+                    if len(running) >= 2 * workers:
+                        break
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    movie_id = running.pop(future)
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        # No se guarda: se reintenta en la próxima ejecución
+                        stats["failed"] += 1
+                        print(f"⚠️ Error al obtener el póster (ID {movie_id}): {e}")
+                        continue
+                    stats["downloaded" if data else "missing"] += 1
+                    yield movie_id, data
+
+                processed = stats["downloaded"] + stats["missing"] + stats["failed"]
+                if processed >= next_report:
+                    next_report += 500
+                    print(f"  {processed}/{total} pósters ({time.perf_counter() - t0:.0f} s)")
+
+    write_poster_pack(pack_path, entries())
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Descarga los pósters de todo el catálogo a model/posters.pack.")
+    ap.add_argument("--workers", type=int, default=8, help="Descargas simultáneas.")
+    ap.add_argument("--reintentos", type=int, default=5, help="Reintentos por petición (errores de red, 429 y 5xx).")
+    ap.add_argument("--timeout", type=float, default=10, help="Tiempo máximo por petición (s).")
+    ap.add_argument("--limite", type=int, default=None, help="Solo las primeras N películas (pruebas).")
+    ap.add_argument("--force", action="store_true", help="Volver a descargar aunque ya estén en el paquete.")
+    args = ap.parse_args()
+
+    movie_list_pkl, model_dir, _, _ = PathResolver().paths()
+    movie_ids = pd.read_pickle(movie_list_pkl)['movie_id'].tolist()[:args.limite]
+
+    downloader = PosterDownloader(retries=args.reintentos, timeout=args.timeout)
+    t0 = time.perf_counter()
+    stats = prefetch(movie_ids, os.path.join(model_dir, POSTER_PACK), downloader,
+                     workers=args.workers, force=args.force)
+    print(f"Pósters en {time.perf_counter() - t0:.1f} s: {stats['reused']} reutilizados, "
+          f"{stats['downloaded']} descargados, {stats['missing']} sin póster, {stats['failed']} con error")
+
+
+if __name__ == "__main__":
+    main()
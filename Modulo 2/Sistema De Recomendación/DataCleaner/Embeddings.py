@@ -0,0 +1,53 @@
+
+# ------------------------------------------------------------
+# Importación de librerías necesarias
+# ------------------------------------------------------------
+import numpy as np                                   # Matrices densas float32
+from sklearn.decomposition import TruncatedSVD       # LSA: SVD truncada de la matriz de conteos dispersa
+from sklearn.preprocessing import normalize          # Normalización L2 (producto punto = coseno)
+
+
+class SvdEmbedding:
+    """
+    Embeddings densos de las películas con SVD truncada (LSA) sobre los conteos de 'tags'.
+
+    Proyecta la matriz dispersa (n × vocabulario) a `dim` dimensiones (100-300) y normaliza
+    cada fila (L2) en float32: la similitud del coseno entre dos películas es el producto
+    punto de sus filas, y los vecinos de una película salen de un solo producto
+    matriz-vector (n × dim) · (dim,).
+
+    `components` (dim × vocabulario) se guarda para proyectar películas nuevas (deltas)
+    con la misma base, sin volver a ajustar la SVD.
+    """
+
+    def __init__(self, dim=200, seed=0, n_iter=5):
+        self.dim = dim
+        self.seed = seed
+        self.n_iter = n_iter
+        self.components = None       # (dim, vocabulario) float32, se llena en fit()
+
+    @staticmethod
+    def _normalize(X):
+        return normalize(np.asarray(X, dtype=np.float32), norm='l2', axis=1)
+
+    def fit_transform(self, vectors):
+        """Ajusta la SVD sobre la matriz de conteos y devuelve los embeddings (n, dim) normalizados."""
+        # No puede haber más componentes que columnas (ni que filas) menos una
+        dim = max(1, min(self.dim, vectors.shape[1] - 1, vectors.shape[0] - 1))
+        svd = TruncatedSVD(n_components=dim, algorithm='randomized', n_iter=self.n_iter, random_state=self.seed)
+        embeddings = svd.fit_transform(vectors.astype(np.float32, copy=False))
+        self.components = svd.components_.astype(np.float32)
+        return self._normalize(embeddings)
+
+    def transform(self, vectors):
+        """Proyecta conteos nuevos (mismo vocabulario) con la base ya ajustada."""
+        if self.components is None:
+            raise ValueError("La SVD no está ajustada: llama primero a fit_transform().")
+        return self._normalize(vectors.astype(np.float32, copy=False) @ self.components.T)
+
+    @classmethod
+    def from_components(cls, components):
+        """Reconstruye el modelo a partir de los componentes guardados."""
+        model = cls(dim=components.shape[0])
+        model.components = np.asarray(components, dtype=np.float32)
+        return model
@@ -2,6 +2,7 @@
 # ------------------------------------------------------------
 # Importaciones
 # ------------------------------------------------------------
+import argparse      # Argumentos de línea de comandos (delta incremental, reconstrucción forzada)
 import pandas as pd  # (Opcional) Librería útil si más adelante se agregan validaciones o análisis
 from Constructor import ModelBuilder  # Importa la clase principal que construye el modelo de recomendación
 
@@ -12,18 +13,52 @@ def main():
     """
     Función principal del programa.
     Se encarga de crear una instancia de la clase ModelBuilder y
-    ejecutar el proceso completo de construcción y guardado de los modelos (.pkl).
+    ejecutar el proceso completo de construcción y guardado de los modelos.
+
+    Uso:
+      python Main.py                      → construcción completa (se omite si los CSVs no cambiaron)
+      python Main.py --force              → construcción completa aunque no haya cambios
+      python Main.py --delta-movies M.csv --delta-credits C.csv
+                                          → agrega/actualiza solo las películas del delta
+      python Main.py --metricas m.json    → además guarda tiempo, memoria y bytes por etapa en JSON
     """
+    parser = argparse.ArgumentParser(description="Construye el modelo de recomendación.")
+    parser.add_argument("--force", action="store_true", help="Reconstruir aunque los datasets no hayan cambiado.")
+    parser.add_argument("--delta-movies", help="CSV con películas nuevas o modificadas (formato tmdb_5000_movies).")
+    parser.add_argument("--delta-credits", help="CSV con los créditos de esas películas (formato tmdb_5000_credits).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Procesos para leer las columnas JSON y calcular los vecinos (1 = secuencial).")
+    parser.add_argument("--max-rss-mb", type=int, default=None,
+                        help="Límite aproximado de memoria (MB) al calcular vecinos (reduce el tamaño de bloque).")
+    parser.add_argument("--chunksize", type=int, default=None, help="Leer los CSVs por bloques de N filas (volcados grandes).")
+    parser.add_argument("--embedding-dim", type=int, default=None,
+                        help="Guardar también embeddings SVD de D dimensiones (100-300) para vecinos al vuelo.")
+    parser.add_argument("--metricas", default=None,
+                        help="Archivo JSON donde guardar tiempo, memoria y bytes de cada etapa.")
+    args = parser.parse_args()
+    if bool(args.delta_movies) != bool(args.delta_credits):
+        parser.error("--delta-movies y --delta-credits se usan juntos.")
+
     # Crea una instancia del constructor del modelo
-    builder = ModelBuilder()
+    builder = ModelBuilder(workers=args.workers, chunksize=args.chunksize, max_rss_mb=args.max_rss_mb,
+                           embedding_dim=args.embedding_dim)
+
+    # Modo incremental: solo las filas del delta y las listas de vecinos afectadas
+    if args.delta_movies:
+        builder.update_from_delta(args.delta_movies, args.delta_credits)
+    else:
+        # Llama al método que ejecuta todo el pipeline:
+        #  - Carga de datos
+        #  - Limpieza y preprocesamiento
+        #  - Vectorización
+        #  - Cálculo de vecinos más similares (top-K)
+        #  - Guardado de archivos
+        builder.build_and_save(force=args.force)
 
-    # Llama al método que ejecuta todo el pipeline:
-    #  - Carga de datos
-    #  - Limpieza y preprocesamiento
-    #  - Vectorización
-    #  - Cálculo de similitud
-    #  - Guardado de archivos
-    builder.build_and_save()
+    # Métricas por etapa (solo si se ejecutó algo: un modelo al día no tiene etapas)
+    if args.metricas and builder.report is not None:
+        builder.report.write_json(args.metricas, params=builder.params(), workers=args.workers)
+        print(f"📊 Métricas guardadas en {args.metricas}")
 
 # ------------------------------------------------------------
 # Punto de entrada del script
@@ -0,0 +1,207 @@
+
+# ------------------------------------------------------------
+# Importación de librerías necesarias
+# ------------------------------------------------------------
+import importlib                     # Versiones de las librerías en los resultados
+import json                          # Resultados en JSON (comparación entre versiones)
+import os                            # Lectura de /proc (Linux)
+import platform                      # Descripción de la máquina en los resultados
+import sys                           # Plataforma (unidades de ru_maxrss)
+import time                          # Tiempo de reloj y de CPU
+from contextlib import contextmanager
+
+# resource no existe en Windows; psutil es opcional
+try:
+    import resource
+except ImportError:
+    resource = None
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MB = 2 ** 20
+
+
+def current_rss():
+    """Memoria residente actual del proceso en bytes (None si no se puede medir)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def reset_peak():
+    """
+    Reinicia el pico de memoria residente del proceso (Linux: escribir 5 en
+    /proc/self/clear_refs reinicia VmHWM). Devuelve False si no se puede.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _vm_hwm():
+    """VmHWM de /proc/self/status en bytes (pico desde el último reset_peak), o None."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def peak_rss(children=False):
+    """
+    Pico de memoria residente en bytes del proceso (o, con children=True, del mayor
+    de sus procesos hijos ya terminados). None si no se puede medir.
+    En Linux el pico del proceso es el de /proc (se puede reiniciar con reset_peak).
+    """
+    if not children:
+        hwm = _vm_hwm()
+        if hwm is not None:
+            return hwm
+    if resource is not None:
+        who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+        peak = resource.getrusage(who).ru_maxrss
+        # Linux informa en KB, macOS en bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    if psutil is not None and not children:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)   # Windows: peak working set
+    return None
+
+
+def git_commit():
+    """
+    Commit actual del repositorio (leído de .git, sin lanzar git: un proceso hijo
+    alteraría el pico de memoria de los hijos que se mide). None si no se encuentra.
+    """
+    folder = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.isdir(os.path.join(folder, ".git")):
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+    git = os.path.join(folder, ".git")
+    try:
+        with open(os.path.join(git, "HEAD")) as f:
+            head = f.read().strip()
+        if not head.startswith("ref: "):
+            return head[:12]
+        ref = head[5:]
+        if os.path.exists(os.path.join(git, ref)):
+            with open(os.path.join(git, ref)) as f:
+                return f.read().strip()[:12]
+        with open(os.path.join(git, "packed-refs")) as f:
+            for line in f:
+                if line.rstrip().endswith(" " + ref):
+                    return line.split()[0][:12]
+    except OSError:
+        pass
+    return None
+
+
+def environment():
+    """Versión del código y de las librerías, y máquina donde se midió (para comparar resultados)."""
+    commit = git_commit()
+    versions = {}
+    for name in ("numpy", "pandas", "scipy", "sklearn"):
+        try:
+            versions[name] = importlib.import_module(name).__version__
+        except ImportError:
+            versions[name] = None
+    return {
+        'commit': commit,
+        'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'libraries': versions,
+    }
+
+
+def _mb(value):
+    return "   ?" if value is None else f"{value / MB:6.0f}"
+
+
+class StageReport:
+    """
+    Registro de tiempo y memoria por etapa del pipeline.
+
+        report = StageReport()
+        with report.stage("vectorización"):
+            ...
+        report.summary()
+
+    Por etapa guarda: tiempo de reloj, tiempo de CPU, RSS al terminar y pico de RSS
+    del proceso durante la etapa (en Linux; en otros sistemas, hasta ese momento) y de
+    los procesos trabajadores hasta ese momento. Con budget_mb avisa de las etapas cuyo
+    pico supera el presupuesto.
+
+    stage() entrega la fila de la etapa: quien escribe archivos registra su tamaño con
+    row['artifact_bytes'] = ... (se muestra en el resumen y se guarda en el JSON).
+    """
+
+    def __init__(self, budget_mb=None):
+        self.stages = []
+        self.budget_mb = budget_mb
+
+    @contextmanager
+    def stage(self, name):
+        reset_peak()   # El pico que se mide es el de esta etapa
+        row = {'stage': name, 'artifact_bytes': None}
+        t0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield row
+        finally:
+            row.update({
+                'wall_s': time.perf_counter() - t0,
+                'cpu_s': time.process_time() - c0,
+                'rss_bytes': current_rss(),
+                'peak_rss_bytes': peak_rss(),
+                'peak_rss_children_bytes': peak_rss(children=True),
+            })
+            self.stages.append(row)
+            print(f"⏱ {name}: {row['wall_s']:.2f} s (CPU {row['cpu_s']:.2f} s) | "
+                  f"RSS {_mb(row['rss_bytes']).strip()} MB | pico {_mb(row['peak_rss_bytes']).strip()} MB")
+            peak = row['peak_rss_bytes']
+            if self.budget_mb is not None and peak is not None and peak > self.budget_mb * MB:
+                print(f"⚠️ {name}: el pico ({peak / MB:.0f} MB) supera el límite de {self.budget_mb} MB")
+
+    def summary(self):
+        """Imprime la tabla de todas las etapas registradas."""
+        print(f"\n{'etapa':<24}{'reloj (s)':>10}{'CPU (s)':>9}{'RSS (MB)':>10}{'pico (MB)':>11}{'pico hijos':>12}"
+              f"{'archivos (MB)':>15}")
+        for row in self.stages:
+            files = "" if row['artifact_bytes'] is None else f"{row['artifact_bytes'] / MB:.1f}"
+            print(f"{row['stage']:<24}{row['wall_s']:>10.2f}{row['cpu_s']:>9.2f}{_mb(row['rss_bytes']):>10}"
+                  f"{_mb(row['peak_rss_bytes']):>11}{_mb(row['peak_rss_children_bytes']):>12}{files:>15}")
+
+    def to_dict(self):
+        """Etapas y totales como diccionario serializable a JSON."""
+        peaks = [row['peak_rss_bytes'] for row in self.stages if row['peak_rss_bytes'] is not None]
+        return {
+            'stages': [dict(row) for row in self.stages],
+            'total': {
+                'wall_s': sum(row['wall_s'] for row in self.stages),
+                'cpu_s': sum(row['cpu_s'] for row in self.stages),
+                'peak_rss_bytes': max(peaks, default=None),
+                'artifact_bytes': sum(row['artifact_bytes'] or 0 for row in self.stages),
+            },
+        }
+
+    def write_json(self, path, **extra):
+        """Guarda las etapas, el entorno (commit, versiones) y `extra` en un archivo JSON."""
+        result = {'environment': environment(), **extra, **self.to_dict()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        return result
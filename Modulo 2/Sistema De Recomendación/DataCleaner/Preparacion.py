@@ -3,8 +3,87 @@
 # Importación de librerías necesarias
 # ------------------------------------------------------------
 import ast                    # Permite evaluar cadenas que contienen estructuras Python (listas, dicts, etc.)
+import gc                     # Pausa del recolector cíclico mientras se crean millones de listas
+import json                   # Las columnas de TMDB son JSON: json.loads es mucho más rápido que literal_eval
+from concurrent.futures import ProcessPoolExecutor  # Procesado de celdas en paralelo por bloques
+import numpy as np            # Tipos numéricos compactos (int32)
 import pandas as pd           # Librería para manipulación de datos en DataFrames
 
+# orjson (opcional) es aún más rápido que json; si no está instalado se usa json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_decoder = json.JSONDecoder()  # raw_decode: lee un objeto JSON sin procesar el resto de la cadena
+
+
+# ------------------------------------------------------------
+# Lectura de celdas (JSON con respaldo a literal_eval)
+# ------------------------------------------------------------
+def _parse_cell(text):
+    """
+    Convierte una celda tipo lista de diccionarios en objeto Python.
+    Intenta JSON (formato de los CSV de TMDB) y, si falla, usa ast.literal_eval
+    (celdas con comillas simples, estilo Python). Lanza excepción si ninguno sirve.
+    """
+    try:
+        return _json_loads(text)
+    except (ValueError, TypeError):
+        return ast.literal_eval(text)
+
+
+def _first_items(text, n):
+    """
+    Lee solo los primeros n elementos de una lista JSON (el reparto completo no hace falta).
+    Lanza ValueError si la celda no empieza como una lista JSON.
+    """
+    i = text.index('[') + 1
+    out = []
+    while len(out) < n:
+        # Salta separadores hasta el siguiente elemento
+        while text[i] in ' \t\r\n,':
+            i += 1
+        if text[i] == ']':
+            break
+        item, i = _decoder.raw_decode(text, i)
+        out.append(item)
+    return out
+
+
+def _directors(text):
+    """
+    Busca los directores sin leer toda la lista 'crew': localiza cada "Director" y
+    decodifica solo el diccionario que lo contiene. Lanza ValueError si algún
+    fragmento no es un diccionario JSON válido o si no hay ningún "Director" entre
+    comillas dobles (celda con formato de Python): entonces se lee la celda completa.
+    """
+    out = []
+    seen = set()
+    pos = text.find('"Director"')
+    if pos < 0:
+        raise ValueError("Sin \"Director\" entre comillas dobles")
+    while pos >= 0:
+        start = text.rfind('{', 0, pos)
+        end = text.find('}', pos)
+        if start < 0 or end < 0:
+            raise ValueError("Fragmento sin llaves")
+        if start not in seen:
+            seen.add(start)
+            it = _json_loads(text[start:end + 1])
+            if isinstance(it, dict) and it.get('job') == 'Director' and it.get('name'):
+                out.append(str(it['name']))
+        pos = text.find('"Director"', pos + 10)
+    return out
+
+
+def _parse_chunk(task):
+    """Procesa un bloque de celdas en un proceso trabajador: task = (columnas, valores por columna)."""
+    columns, values = task
+    return [[getattr(MoviePreprocessor, MoviePreprocessor.PARSERS[c])(t) for t in vals]
+            for c, vals in zip(columns, values)]
+
 
 class MoviePreprocessor:
     """
@@ -15,6 +94,25 @@ class MoviePreprocessor:
     de películas para que sea utilizable en el modelo de recomendación.
     """
 
+    # Columna de texto → método que la convierte en lista de nombres
+    PARSERS = {
+        'genres': 'safe_literal_list',
+        'keywords': 'safe_literal_list',
+        'cast': 'safe_literal_top3_cast',
+        'crew': 'safe_literal_director',
+    }
+
+    # Columnas que forman 'tags', en este orden
+    TAG_COLUMNS = ['overview', 'genres', 'keywords', 'cast', 'crew']
+
+    # Lectura de los CSVs: solo las columnas que se usan y tipos compactos.
+    # 'genres' se repite muchísimo (combinaciones de unos 20 géneros): como categoría se guarda
+    # y se interpreta una sola vez cada texto distinto (ver parse_columns)
+    MOVIE_COLUMNS = ['id', 'title', 'overview', 'genres', 'keywords']
+    MOVIE_DTYPES = {'id': np.int32, 'title': str, 'genres': 'category'}
+    CREDIT_COLUMNS = ['movie_id', 'cast', 'crew']
+    CREDIT_DTYPES = {'movie_id': np.int32}
+
     # --------------------------------------------------------
     # Funciones auxiliares (estáticas)
     # --------------------------------------------------------
@@ -30,8 +128,8 @@ class MoviePreprocessor:
             # Si el valor es NaN, devuelve lista vacía
             if pd.isna(text):
                 return []
-            # Convierte el texto a lista de Python usando ast.literal_eval
-            data = ast.literal_eval(text)
+            # Convierte el texto a lista de Python (JSON; si falla, ast.literal_eval)
+            data = _parse_cell(text)
             out = []
             # Extrae los valores de la clave 'name' de cada diccionario
             for it in data:
@@ -53,7 +151,11 @@ class MoviePreprocessor:
         try:
             if pd.isna(text):
                 return []
-            data = ast.literal_eval(text)
+            try:
+                # Camino rápido: decodifica solo los 3 primeros elementos de la lista JSON
+                data = _first_items(text, 3)
+            except (ValueError, IndexError, AttributeError):
+                data = _parse_cell(text)
             out = []
             # Recorre hasta 3 actores como máximo
             for i, it in enumerate(data):
@@ -76,7 +178,14 @@ class MoviePreprocessor:
         try:
             if pd.isna(text):
                 return []
-            data = ast.literal_eval(text)
+            # Sin la palabra 'Director' no puede haber director (evita leer la celda)
+            if 'Director' not in text:
+                return []
+            try:
+                # Camino rápido: solo los diccionarios que contienen "Director"
+                return _directors(text)
+            except ValueError:
+                data = _parse_cell(text)
             out = []
             # Busca en cada elemento del crew al director
             for it in data:
@@ -94,6 +203,23 @@ class MoviePreprocessor:
         """
         return [str(i).replace(" ", "") for i in L]
 
+    @classmethod
+    def collapse_joined(cls, L):
+        """
+        Igual que collapse(L), pero en tres operaciones de C sobre la lista unida:
+        une con '\\0', quita los espacios y vuelve a separar. Si algún elemento no es
+        texto o contiene '\\0', usa collapse().
+        """
+        if not L:
+            return []
+        try:
+            joined = "\0".join(L)
+        except TypeError:
+            return cls.collapse(L)
+        if joined.count("\0") != len(L) - 1:
+            return cls.collapse(L)
+        return joined.replace(" ", "").split("\0")
+
     @staticmethod
     def empty_row(r):
         """
@@ -109,10 +235,96 @@ class MoviePreprocessor:
     # Método principal de limpieza y transformación
     # --------------------------------------------------------
     @classmethod
-    def apply_all(cls, movies_df):
+    def parse_columns(cls, movies, workers=1, chunk_size=1000, columns=None):
+        """
+        Convierte las columnas de texto (genres, keywords, cast, crew, o solo `columns`)
+        en listas de nombres. Con workers > 1 reparte las celdas en bloques de
+        `chunk_size` filas entre procesos.
+        """
+        columns = [c for c in (columns or cls.PARSERS) if c in movies]
+
+        # Columnas categóricas: se interpreta cada texto distinto una sola vez y se reparte
+        # por código (las filas con el mismo texto comparten la lista, que no se modifica)
+        for c in [c for c in columns if isinstance(movies[c].dtype, pd.CategoricalDtype)]:
+            parser = getattr(cls, cls.PARSERS[c])
+            parsed = [parser(t) for t in movies[c].cat.categories] + [[]]   # código -1 (NaN) → []
+            movies[c] = pd.Series([parsed[i] for i in movies[c].cat.codes.tolist()], index=movies.index, dtype=object)
+            columns.remove(c)
+
+        if workers <= 1 or len(movies) <= chunk_size:
+            for c in columns:
+                parser = getattr(cls, cls.PARSERS[c])
+                movies[c] = pd.Series([parser(t) for t in movies[c]], index=movies.index, dtype=object)
+            return movies
+
+        # Bloques de celdas (listas simples: se envían al trabajador sin el DataFrame)
+        values = [movies[c].tolist() for c in columns]
+        chunks = [(columns, [v[i:i + chunk_size] for v in values]) for i in range(0, len(movies), chunk_size)]
+        results = {c: [] for c in columns}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for parsed in pool.map(_parse_chunk, chunks):
+                for c, part in zip(columns, parsed):
+                    results[c].extend(part)
+        for c in columns:
+            movies[c] = pd.Series(results[c], index=movies.index, dtype=object)
+        return movies
+
+    @classmethod
+    def finish(cls, movies):
+        """
+        Pasos posteriores a la lectura de las columnas JSON (ya convertidas en listas):
+        tokeniza la sinopsis, quita espacios, filtra filas vacías y arma 'tags'.
+
+        Todo se hace con comprensiones de listas sobre columnas completas, sin
+        .apply(axis=1) (que crea una Serie por fila). Devuelve (movies, new).
+        """
+        # Columnas como listas de Python (iterar una Serie es bastante más lento)
+        lists = {}
+
+        # Estas listas no forman ciclos: el recolector cíclico solo recorrería una y otra vez
+        # el montón creciente (en 50k filas, más de la mitad del tiempo), así que se pausa
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # Tokeniza la sinopsis (overview) dividiéndola por espacios
+            lists['overview'] = [str(x).split() for x in movies['overview'].fillna('').tolist()]
+
+            # ----------------------------------------------------
+            # Normaliza los textos: elimina espacios dentro de las palabras
+            # ----------------------------------------------------
+            for c in ['cast', 'crew', 'genres', 'keywords']:
+                lists[c] = [cls.collapse_joined(L) for L in movies[c].tolist()]
+
+            # ----------------------------------------------------
+            # Genera 'tags' (una sola pasada por fila: concatena las cinco listas)
+            # ----------------------------------------------------
+            tags = [o + g + k + c + cr for o, g, k, c, cr in zip(*(lists[col] for col in cls.TAG_COLUMNS))]
+        finally:
+            if gc_enabled:
+                gc.enable()
+        for c in cls.TAG_COLUMNS:
+            movies[c] = pd.Series(lists[c], index=movies.index, dtype=object)
+        movies['tags'] = pd.Series(tags, index=movies.index, dtype=object)
+
+        # ----------------------------------------------------
+        # Filtra filas vacías para evitar vectores nulos
+        # ----------------------------------------------------
+        # Una fila está vacía si las cinco listas lo están, es decir, si 'tags' está vacía
+        movies = movies[movies['tags'].str.len() > 0].copy()
+
+        # Crea un nuevo DataFrame con solo las columnas necesarias
+        new = movies[['movie_id', 'title']].copy()
+
+        # Une los elementos de cada lista en una sola cadena separada por espacios
+        new['tags'] = [" ".join(x) for x in movies['tags'].tolist()]
+        return movies, new
+
+    @classmethod
+    def apply_all(cls, movies_df, workers=1):
         """
         Ejecuta toda la secuencia de limpieza y transformación sobre
-        el DataFrame original de películas.
+        el DataFrame original de películas (con workers > 1, la lectura de las
+        columnas JSON se hace en paralelo).
 
         Devuelve:
           - movies_clean → DataFrame con las columnas originales limpias (listas).
@@ -121,47 +333,70 @@ class MoviePreprocessor:
         # Crea una copia del DataFrame original para no modificarlo directamente
         movies = movies_df.copy()
 
-        # Rellena los valores faltantes (NaN) en la columna 'overview' con cadena vacía
-        movies['overview'] = movies['overview'].fillna('')
-
         # ----------------------------------------------------
         # Aplica las funciones de conversión seguras a cada columna
         # ----------------------------------------------------
-        movies['genres']   = movies['genres'].apply(cls.safe_literal_list)
-        movies['keywords'] = movies['keywords'].apply(cls.safe_literal_list)
-        movies['cast']     = movies['cast'].apply(cls.safe_literal_top3_cast)
-        movies['crew']     = movies['crew'].apply(cls.safe_literal_director)
-
-        # Tokeniza la sinopsis (overview) dividiéndola por espacios
-        movies['overview'] = movies['overview'].apply(lambda x: str(x).split())
-
-        # ----------------------------------------------------
-        # Normaliza los textos: elimina espacios dentro de las palabras
-        # ----------------------------------------------------
-        movies['cast']     = movies['cast'].apply(cls.collapse)
-        movies['crew']     = movies['crew'].apply(cls.collapse)
-        movies['genres']   = movies['genres'].apply(cls.collapse)
-        movies['keywords'] = movies['keywords'].apply(cls.collapse)
+        movies = cls.parse_columns(movies, workers)
 
-        # ----------------------------------------------------
-        # Filtra filas vacías para evitar vectores nulos
-        # ----------------------------------------------------
+        # Tokenización, limpieza, filtrado y 'tags'
         before = len(movies)  # Número de filas antes del filtrado
-        movies = movies[~movies.apply(cls.empty_row, axis=1)].copy()  # Elimina las filas vacías
+        movies, new = cls.finish(movies)
         after = len(movies)   # Número de filas después
         print(f"Filas totales: {before} | Filas útiles tras limpieza: {after}")
 
-        # ----------------------------------------------------
-        # Genera la columna 'tags' combinando todas las listas de información
-        # ----------------------------------------------------
-        movies['tags'] = (movies['overview'] + movies['genres'] +
-                          movies['keywords'] + movies['cast'] + movies['crew'])
+        # Devuelve ambos DataFrames: el completo y el simplificado
+        return movies, new
 
-        # Crea un nuevo DataFrame con solo las columnas necesarias
-        new = movies[['movie_id', 'title', 'tags']].copy()
+    @classmethod
+    def join_credits(cls, movies, credits):
+        """
+        Une películas y créditos por ID (movies.id = credits.movie_id), en el orden de `movies`.
+        Unir por 'title' multiplicaba las filas de los títulos repetidos; con el ID cada
+        película aparece una sola vez (`credits` no debe repetir movie_id).
+        """
+        movies = movies.rename(columns={'id': 'movie_id'})
+        movies = movies.merge(credits, on='movie_id', how='inner')
+        return movies[['movie_id', 'title', 'overview', 'genres', 'keywords', 'cast', 'crew']]
 
-        # Une los elementos de cada lista en una sola cadena separada por espacios
-        new['tags'] = new['tags'].apply(lambda x: " ".join(x))
+    @classmethod
+    def read_movies(cls, movies_path, credits_path):
+        """Lee los dos CSVs completos (solo las columnas necesarias, tipos compactos) y los une por ID."""
+        movies = pd.read_csv(movies_path, usecols=cls.MOVIE_COLUMNS, dtype=cls.MOVIE_DTYPES)
+        credits = pd.read_csv(credits_path, usecols=cls.CREDIT_COLUMNS, dtype=cls.CREDIT_DTYPES)
+        print("Películas:", movies.shape, " | Créditos:", credits.shape)  # Imprime tamaño de ambos
+        # Si un ID está repetido en un CSV se usa su primera fila
+        return cls.join_credits(movies.drop_duplicates('id'), credits.drop_duplicates('movie_id'))
 
-        # Devuelve ambos DataFrames: el completo y el simplificado
-        return movies, new
+    @classmethod
+    def iter_tags(cls, movies_path, credits_path, chunksize=10000, workers=1):
+        """
+        Variante por bloques para volcados de TMDB que no caben en un solo DataFrame.
+        Genera DataFrames ['movie_id', 'title', 'tags'] con el mismo contenido y orden
+        que apply_all sobre read_movies().
+
+        1. Lee credits por bloques y reduce cast/crew a listas de nombres (el texto
+           completo del crew nunca se guarda entero en memoria).
+        2. Lee movies por bloques (solo las columnas necesarias), une cada bloque por ID
+           con los créditos reducidos y termina la limpieza bloque a bloque.
+        """
+        # 1) Créditos reducidos: movie_id y listas de nombres
+        parts = []
+        for chunk in pd.read_csv(credits_path, usecols=cls.CREDIT_COLUMNS, dtype=cls.CREDIT_DTYPES,
+                                 chunksize=chunksize):
+            parts.append(cls.parse_columns(chunk, workers, columns=['cast', 'crew']))
+        credits = pd.concat(parts, ignore_index=True).drop_duplicates('movie_id')
+
+        # 2) Películas por bloques (un ID repetido en distintos bloques se usa una sola vez)
+        before = after = 0
+        seen = set()
+        for chunk in pd.read_csv(movies_path, usecols=cls.MOVIE_COLUMNS, dtype=cls.MOVIE_DTYPES,
+                                 chunksize=chunksize):
+            chunk = chunk[~chunk['id'].isin(seen)].drop_duplicates('id')
+            seen.update(chunk['id'].tolist())
+            chunk = cls.join_credits(chunk, credits)
+            chunk = cls.parse_columns(chunk, workers, columns=['genres', 'keywords'])
+            before += len(chunk)
+            chunk, new = cls.finish(chunk)
+            after += len(chunk)
+            yield new
+        print(f"Filas totales: {before} | Filas útiles tras limpieza: {after}")
@@ -0,0 +1,50 @@
+
+# ------------------------------------------------------------
+# Claves del índice de búsqueda de títulos
+# ------------------------------------------------------------
+# Única implementación de la normalización y de las claves: la usan el constructor
+# (Artefactos.save_title_index) y la app (Aplicacion_Web/search.py la importa desde
+# ../DataCleaner), así las búsquedas se normalizan igual que las claves guardadas.
+# Solo depende de NumPy (la app no carga scipy ni scikit-learn por importarlo).
+import unicodedata                   # Títulos sin tildes para el índice de búsqueda
+import numpy as np                   # Claves de ancho fijo ('S') ordenadas
+
+# Bytes máximos de cada clave (las búsquedas más largas se recortan igual)
+TITLE_KEY_BYTES = 40
+
+
+def normalize_title(title):
+    """
+    Título normalizado para buscar: minúsculas, sin tildes y con cualquier signo
+    convertido en espacio ("Amélie (2001)" → "amelie 2001").
+    """
+    text = unicodedata.normalize("NFKD", str(title).lower())
+    text = "".join(c if c.isalnum() else " " for c in text if not unicodedata.combining(c))
+    return " ".join(text.split())
+
+
+def title_keys(titles):
+    """
+    Claves del índice: por cada título, el texto normalizado desde cada palabra
+    ("the dark knight", "dark knight", "knight"), recortado a TITLE_KEY_BYTES, así "knight"
+    encuentra "The Dark Knight". Devuelve (claves ordenadas 'S', fila de cada clave int32,
+    posición de la palabra int16, largo de cada título normalizado int32).
+    """
+    keys, rows, positions, lengths = [], [], [], []
+    for row, title in enumerate(titles):
+        normalized = normalize_title(title)
+        lengths.append(len(normalized))
+        words = normalized.split()
+        for pos in range(len(words)):
+            keys.append(" ".join(words[pos:]).encode('utf-8')[:TITLE_KEY_BYTES])
+            rows.append(row)
+            positions.append(pos)
+    keys = np.array(keys, dtype=f"S{TITLE_KEY_BYTES}")
+    order = np.argsort(keys, kind='stable')
+    return (keys[order], np.array(rows, dtype=np.int32)[order], np.array(positions, dtype=np.int16)[order],
+            np.array(lengths, dtype=np.int32))
+
+
+def title_lengths(titles):
+    """Largo de cada título normalizado (int32), para modelos sin title_lengths.npy."""
+    return np.fromiter((len(normalize_title(t)) for t in titles), dtype=np.int32, count=len(titles))
@@ -0,0 +1,225 @@
+
+# ------------------------------------------------------------
+# Importación de librerías necesarias
+# ------------------------------------------------------------
+from concurrent.futures import ProcessPoolExecutor   # Bloques de similitud repartidos entre procesos
+import numpy as np                                   # Arreglos compactos (int32 / float32) para el índice
+import scipy.sparse as sp                            # Conteos dispersos o embeddings densos
+from sklearn.preprocessing import normalize          # Normalización L2 de la matriz dispersa
+
+# Bytes por celda (fila del bloque × película) en el pico de un bloque: producto disperso
+# (valor float32 + índice int32), matriz densa float32 y posiciones int64 de argpartition
+BYTES_PER_CELL = 24
+
+# Estado de cada proceso trabajador (se envía una sola vez en el initializer)
+_worker = {}
+
+
+def _init_worker(X, XT, k):
+    _worker['X'], _worker['XT'], _worker['k'] = X, XT, k
+
+
+def _worker_block(block):
+    """Top-K de un bloque de filas dentro de un proceso trabajador."""
+    return NeighborIndex._block_top_k(_worker['X'], _worker['XT'], block, _worker['k'])
+
+
+def block_size_for(n, max_bytes, workers=1):
+    """
+    Filas por bloque para que los bloques en curso (uno por proceso) no pasen de `max_bytes`.
+    Lanza MemoryError si ni siquiera cabe una fila.
+    """
+    block_size = int(max_bytes // (BYTES_PER_CELL * max(n, 1) * max(workers, 1)))
+    if block_size < 1:
+        raise MemoryError(f"El límite de memoria ({max_bytes / 2**20:.0f} MB) no alcanza para un bloque de 1 fila × {n} películas.")
+    return block_size
+
+
+class NeighborIndex:
+    """
+    Índice de vecinos más cercanos top-K por película.
+
+    En lugar de guardar la matriz de similitud completa n×n (float64, crece
+    de forma cuadrática), guarda solo los K vecinos más similares de cada
+    película:
+
+    - indices → matriz (n, K) int32 con las filas de los vecinos, de mayor a menor similitud.
+    - scores  → matriz (n, K) float32 con la similitud del coseno de cada vecino.
+
+    La propia película nunca aparece entre sus vecinos.
+
+    Se probó un índice aproximado (LSH de proyecciones aleatorias, consultas por vector):
+    con 20 000 películas el producto exacto X·q tardaba 0.24 ms (conteos dispersos) o
+    0.41 ms (128 dimensiones densas) por consulta, y el LSH necesitaba 1.2–3 ms para un
+    recall@10 de 0.91–0.96. La búsqueda exacta queda como único camino.
+    """
+
+    def __init__(self, indices, scores):
+        # Guarda las matrices con tipos compactos
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.scores = np.asarray(scores, dtype=np.float32)
+
+    @property
+    def k(self):
+        """Número de vecinos guardados por película."""
+        return self.indices.shape[1]
+
+    def __len__(self):
+        return self.indices.shape[0]
+
+    # --------------------------------------------------------
+    # Funciones auxiliares
+    # --------------------------------------------------------
+
+    @staticmethod
+    def _normalize(vectors):
+        """
+        Normaliza cada fila (L2) para que el producto punto sea la similitud del coseno.
+        Acepta conteos dispersos o embeddings densos (ver Embeddings.py).
+        """
+        if not sp.issparse(vectors):
+            X = normalize(np.asarray(vectors, dtype=np.float32), norm='l2', axis=1)
+            return X, np.ascontiguousarray(X.T)
+        X = normalize(vectors.astype(np.float32, copy=False), norm='l2', axis=1).tocsr()
+        return X, X.T.tocsc()
+
+    @staticmethod
+    def _select(candidates, sim, k):
+        """
+        Selecciona por fila los k mayores de `sim` (m × c) y devuelve (índices, similitudes)
+        ordenados: similitud descendente y, en empate, índice ascendente.
+        `candidates` (m × c) indica a qué película corresponde cada columna de `sim`.
+        """
+        # Selección O(c) de los K mayores por fila (sin ordenar toda la fila);
+        # se niega `sim` en el sitio para no crear otra matriz del tamaño del bloque
+        np.negative(sim, out=sim)
+        top = np.argpartition(sim, k - 1, axis=1)[:, :k]
+        top_scores = -np.take_along_axis(sim, top, axis=1)
+        top_idx = np.take_along_axis(candidates, top, axis=1)
+
+        # Ordena solo los K elegidos
+        order = np.lexsort((top_idx, -top_scores), axis=1)
+        return np.take_along_axis(top_idx, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    @classmethod
+    def _block_top_k(cls, X, XT, block, k):
+        """Lista top-K exacta de las filas `block` contra todas las películas."""
+        # Similitudes del bloque contra todas las películas (denso, float32)
+        sim = X[block] @ XT
+        sim = (sim.toarray() if sp.issparse(sim) else sim).astype(np.float32, copy=False)
+
+        # Excluye a cada película de su propia lista de vecinos
+        sim[np.arange(len(block)), block] = -np.inf
+
+        columns = np.arange(X.shape[0], dtype=np.int32)
+        return cls._select(np.broadcast_to(columns, sim.shape), sim, k)
+
+    @classmethod
+    def _search(cls, X, XT, rows, k, block_size, indices, scores, workers=1):
+        """
+        Calcula la lista top-K exacta de las filas `rows` contra todas las películas
+        y la escribe en indices[rows] / scores[rows]. Trabaja por bloques de filas;
+        con workers > 1 los bloques se reparten entre procesos (cada uno recibe una
+        copia de la matriz normalizada al arrancar).
+        """
+        blocks = [rows[start:start + block_size] for start in range(0, len(rows), block_size)]
+        if workers <= 1 or len(blocks) <= 1:
+            for block in blocks:
+                indices[block], scores[block] = cls._block_top_k(X, XT, block, k)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(X, XT, k)) as pool:
+            for block, (idx, sc) in zip(blocks, pool.map(_worker_block, blocks)):
+                indices[block], scores[block] = idx, sc
+
+    # --------------------------------------------------------
+    # Construcción completa e incremental
+    # --------------------------------------------------------
+
+    @classmethod
+    def build(cls, vectors, k=20, block_size=1024, workers=1):
+        """
+        Construye el índice a partir de la matriz dispersa de conteos (n × vocabulario)
+        o de embeddings densos (n × dim).
+
+        Las similitudes se calculan por bloques de `block_size` filas: cada bloque
+        produce una matriz densa (block_size × n) en float32 de la que se extraen los
+        top-K con np.argpartition, y luego se descarta. La memoria máxima es
+        O(block_size · n) en lugar de O(n²) (ver block_size_for()). Con workers > 1
+        los bloques se calculan en paralelo en varios procesos.
+        """
+        X, XT = cls._normalize(vectors)
+        n = X.shape[0]
+
+        # No puede haber más vecinos que películas distintas de la propia
+        k = max(0, min(int(k), n - 1))
+        indices = np.empty((n, k), dtype=np.int32)
+        scores = np.empty((n, k), dtype=np.float32)
+
+        if k > 0:
+            cls._search(X, XT, np.arange(n), k, block_size, indices, scores, workers)
+        return cls(indices, scores)
+
+    def update(self, vectors, old_to_new, changed, k=20, block_size=1024, workers=1):
+        """
+        Devuelve el índice actualizado tras agregar o modificar películas, sin recalcular
+        todas las similitudes.
+
+        - vectors    → matriz de conteos completa ya actualizada (n × vocabulario).
+        - old_to_new → para cada fila del índice actual, su fila nueva (-1 si se eliminó).
+        - changed    → filas nuevas cuyo vector es nuevo o cambió.
+
+        Las filas cambiadas se recalculan completas. Para el resto, sus similitudes con
+        las películas que no cambiaron siguen siendo las mismas, así que basta con mezclar
+        su lista anterior con las similitudes contra las filas cambiadas. Solo hay que
+        recalcular completa la lista de una película si contenía alguna fila cambiada o
+        eliminada (su similitud bajó o desapareció y no sabemos cuál la reemplaza).
+        """
+        X, XT = self._normalize(vectors)
+        n = X.shape[0]
+        k = max(0, min(int(k), n - 1))
+        old_to_new = np.asarray(old_to_new, dtype=np.int64)
+        changed = np.unique(np.asarray(changed, dtype=np.int64))
+
+        indices = np.empty((n, k), dtype=np.int32)
+        scores = np.empty((n, k), dtype=np.float32)
+        if k == 0:
+            return NeighborIndex(indices, scores)
+
+        is_changed = np.zeros(n, dtype=bool)
+        is_changed[changed] = True
+
+        # Listas anteriores de las películas que siguen en el catálogo, con filas ya traducidas
+        kept_old = np.flatnonzero(old_to_new >= 0)
+        kept_new = old_to_new[kept_old]
+        old_lists = old_to_new[self.indices[kept_old]]
+        old_scores = self.scores[kept_old]
+
+        # Se recalculan completas: las cambiadas, las que apuntaban a una fila cambiada o
+        # eliminada y todas si las listas anteriores son más cortas que k
+        if self.k < k:
+            dirty = np.ones(len(kept_new), dtype=bool)
+        else:
+            dirty = is_changed[kept_new] | (old_lists < 0).any(axis=1) | is_changed[np.maximum(old_lists, 0)].any(axis=1)
+        clean_new = kept_new[~dirty]
+        clean_lists = old_lists[~dirty]
+        clean_scores = old_scores[~dirty]
+
+        recompute = np.ones(n, dtype=bool)
+        recompute[clean_new] = False
+        self._search(X, XT, np.flatnonzero(recompute), k, block_size, indices, scores, workers)
+
+        # Mezcla: lista anterior + similitudes contra las filas cambiadas
+        changed_T = X[changed].T
+        for start in range(0, len(clean_new), block_size):
+            stop = min(start + block_size, len(clean_new))
+            block = clean_new[start:stop]
+            sim_changed = X[block] @ changed_T
+            sim_changed = (sim_changed.toarray() if sp.issparse(sim_changed) else sim_changed).astype(np.float32, copy=False)
+            candidates = np.hstack([clean_lists[start:stop, :self.k],
+                                    np.broadcast_to(changed, sim_changed.shape)])
+            sim = np.hstack([clean_scores[start:stop, :self.k], sim_changed])
+            indices[block], scores[block] = self._select(candidates, sim, k)
+
+        print(f"Vecinos: {int(recompute.sum())} listas recalculadas, {len(clean_new)} mezcladas")
+        return NeighborIndex(indices, scores)
@@ -0,0 +1,172 @@
+# ------------------------------------------------------------
+# PosterService (Aplicacion_Web/posters.py) contra un servidor HTTP local que imita
+# la API de TMDB: sin red ni clave real.
+#
+#   GET /movie/<id>     → {"poster_path": "/<id>.jpg"}; sin póster para NO_POSTER, 500 para BROKEN
+#   GET /img/<id>.jpg   → JPEG de un solo color (COLORS[id])
+#
+# Uso:
+#   python -m pytest -q tests
+# ------------------------------------------------------------
+import json                         # Respuestas de la API simulada
+import os                           # Rutas y fechas de modificación (TTL)
+import sys                          # Importar los módulos de la app
+import threading                    # Servidor en segundo plano
+import time                         # Antigüedad de los archivos de la caché
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+import pytest
+from PIL import Image
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Aplicacion_Web")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from posters import PosterService
+
+NO_POSTER = 2
+BROKEN = 3
+COLORS = {1: (200, 30, 30), 4: (30, 200, 30), 5: (30, 30, 200)}
+
+
+class StubTMDB(BaseHTTPRequestHandler):
+    """API de TMDB simulada; guarda cada ruta pedida en `requests`."""
+
+    requests = []
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        self.requests.append(path)
+        kind, _, name = path.strip("/").partition("/")
+        movie_id = int(name.split(".")[0])
+        if kind == "movie" and movie_id == BROKEN:
+            self._send(500, b"error", "text/plain")
+        elif kind == "movie":
+            poster = None if movie_id == NO_POSTER else f"/{movie_id}.jpg"
+            self._send(200, json.dumps({"id": movie_id, "poster_path": poster}).encode(), "application/json")
+        else:
+            out = BytesIO()
+            Image.new("RGB", (60, 90), COLORS[movie_id]).save(out, format="JPEG")
+            self._send(200, out.getvalue(), "image/jpeg")
+
+
+@pytest.fixture
+def stub():
+    StubTMDB.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTMDB)   # Puerto 0: lo elige el sistema
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_service(stub, cache_dir, **kwargs):
+    return PosterService(api_key="test", cache_dir=cache_dir, api_base=f"{stub}/movie", img_base=f"{stub}/img",
+                         max_workers=4, thumb_size=(60, 90), timeout=5, **kwargs)
+
+
+def color(img):
+    """Color del centro de la imagen (JPEG: aproximado)."""
+    return img.getpixel((img.width // 2, img.height // 2))
+
+
+def near(a, b, tol=12):
+    return all(abs(x - y) <= tol for x, y in zip(a, b))
+
+
+def is_placeholder(service, img):
+    return img.tobytes() == service.placeholder().tobytes()
+
+
+def test_disk_cache_hit_on_second_fetch(stub, tmp_path):
+    service = make_service(stub, tmp_path)
+    assert near(color(service.fetch(1)), COLORS[1])
+    assert StubTMDB.requests == ["/movie/1", "/img/1.jpg"]
+    assert (tmp_path / "1.jpg").exists()
+    service.close()
+
+    # Otro proceso (otro servicio sobre la misma carpeta): se sirve del disco sin pedir nada
+    again = make_service(stub, tmp_path)
+    assert near(color(again.fetch(1)), COLORS[1])
+    assert StubTMDB.requests == ["/movie/1", "/img/1.jpg"]
+    assert again.stats["hits"] == 1 and again.stats["downloads"] == 0
+    again.close()
+
+
+def test_missing_poster_writes_none_marker(stub, tmp_path):
+    service = make_service(stub, tmp_path)
+    assert is_placeholder(service, service.fetch(NO_POSTER))
+    assert (tmp_path / f"{NO_POSTER}.none").exists()
+    assert not (tmp_path / f"{NO_POSTER}.jpg").exists()
+    assert service.stats["missing"] == 1
+
+    # El marcador evita volver a preguntar a la API
+    assert is_placeholder(service, service.fetch(NO_POSTER))
+    assert StubTMDB.requests == [f"/movie/{NO_POSTER}"]
+    service.close()
+
+
+def test_server_error_returns_placeholder(stub, tmp_path):
+    service = make_service(stub, tmp_path)
+    assert is_placeholder(service, service.fetch(BROKEN))
+    assert service.stats["errors"] == 1
+    assert list(tmp_path.iterdir()) == []              # Los errores no se guardan en la caché
+    service.close()
+
+
+def test_expired_files_are_evicted_and_downloaded_again(stub, tmp_path):
+    service = make_service(stub, tmp_path, ttl=3600)
+    service.fetch(1)
+    old = time.time() - 7200
+    os.utime(tmp_path / "1.jpg", (old, old))           # Pasa del TTL
+    service.evict()
+    assert not (tmp_path / "1.jpg").exists()
+
+    service.fetch(1)
+    assert StubTMDB.requests.count("/img/1.jpg") == 2
+    service.close()
+
+
+def test_size_eviction_removes_oldest_first(stub, tmp_path):
+    service = make_service(stub, tmp_path)
+    for movie_id in (1, 4, 5):
+        service.fetch(movie_id)
+    sizes = {m: (tmp_path / f"{m}.jpg").stat().st_size for m in (1, 4, 5)}
+    now = time.time()
+    for age, movie_id in ((300, 1), (200, 4), (100, 5)):  # 1 es el más antiguo, 5 el más reciente
+        os.utime(tmp_path / f"{movie_id}.jpg", (now - age, now - age))
+
+    service.max_bytes = sizes[4] + sizes[5]             # Caben los dos más recientes
+    service.evict()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["4.jpg", "5.jpg"]
+
+    service.max_bytes = sizes[5]
+    service.evict()
+    assert [p.name for p in tmp_path.iterdir()] == ["5.jpg"]
+    service.close()
+
+
+def test_fetch_many_keeps_order_with_duplicates(stub, tmp_path):
+    service = make_service(stub, tmp_path)
+    ids = [4, 5, 4, NO_POSTER, 1, 5]
+    images = service.fetch_many(ids)
+    assert len(images) == len(ids)
+    for movie_id, img in zip(ids, images):
+        if movie_id == NO_POSTER:
+            assert is_placeholder(service, img)
+        else:
+            assert near(color(img), COLORS[movie_id])
+    # Cada película se pide una sola vez aunque se repita
+    assert sorted(StubTMDB.requests) == sorted(["/movie/4", "/img/4.jpg", "/movie/5", "/img/5.jpg",
+                                                f"/movie/{NO_POSTER}", "/movie/1", "/img/1.jpg"])
+    service.close()
@@ -0,0 +1,98 @@
+# ------------------------------------------------------------
+# Índice de títulos: lo construye DataCleaner/Artefactos.py y lo lee la app
+# (Aplicacion_Web/search.py); ambos usan las claves de DataCleaner/Titulos.py.
+#
+# Uso:
+#   python -m pytest -q tests
+# ------------------------------------------------------------
+import os                           # Rutas de DataCleaner y Aplicacion_Web
+import sys                          # Importar los módulos de ambas carpetas
+import numpy as np
+import pandas as pd
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for folder in ("DataCleaner", "Aplicacion_Web"):
+    if os.path.join(BASE, folder) not in sys.path:
+        sys.path.insert(0, os.path.join(BASE, folder))
+
+import Artefactos                   # Constructor (DataCleaner)
+import Titulos
+import artifacts                    # App (Aplicacion_Web)
+import search
+
+# 39 bytes ASCII + "日" (3 bytes en UTF-8): la clave de 40 bytes corta el carácter a la mitad
+TRUNCATED = "a" * 39 + "日本語"
+
+TITLES = [
+    "The Dark Knight",
+    "Amélie (2001)",
+    "Léon: The Professional",
+    "WALL·E",
+    "Ｆｕｌｌ Ｗｉｄｔｈ",               # NFKD: formas de ancho completo → ASCII
+    "straße",
+    "",
+    "!!!",
+    TRUNCATED,
+    "Crouching Tiger, Hidden Dragon: " + "ñandú " * 10,
+    "The Dark Knight",                 # Título repetido
+]
+
+
+def test_constants_match():
+    for name in ("TITLE_KEYS", "TITLE_KEY_ROWS", "TITLE_KEY_POS", "TITLE_LENGTHS"):
+        assert getattr(Artefactos, name) == getattr(artifacts, name)
+
+
+def test_single_implementation():
+    # El constructor y la app usan las mismas funciones (no copias)
+    assert Artefactos.title_keys is search.title_keys is Titulos.title_keys
+    assert Artefactos.normalize_title is search.normalize_title is Titulos.normalize_title
+    assert search.KEY_BYTES == Titulos.TITLE_KEY_BYTES == Titulos.TITLE_KEY_BYTES
+
+
+def test_normalize_title():
+    assert Titulos.normalize_title("Amélie (2001)") == "amelie 2001"
+    assert Titulos.normalize_title("Léon: The Professional") == "leon the professional"
+    assert Titulos.normalize_title("Ｆｕｌｌ Ｗｉｄｔｈ") == "full width"
+    assert Titulos.normalize_title("!!!") == ""
+
+
+def test_key_truncated_mid_character():
+    keys, rows, positions, lengths = Titulos.title_keys([TRUNCATED])
+    key = keys[positions == 0][0]
+    assert len(key) == Titulos.TITLE_KEY_BYTES
+    assert key == TRUNCATED.encode("utf-8")[:Titulos.TITLE_KEY_BYTES]   # Termina a mitad de "日"
+    assert lengths[0] == len(Titulos.normalize_title(TRUNCATED))
+    # La búsqueda con la misma longitud también se corta a mitad del carácter y lo encuentra
+    index = search.TitleIndex.from_titles(np.array([1]), np.array([TRUNCATED]))
+    assert index.search(TRUNCATED, 1) == [(1, TRUNCATED)]
+
+
+def test_saved_index_matches_in_memory(tmp_path):
+    writer = Artefactos.ArtifactWriter(str(tmp_path))
+    movies = pd.DataFrame({"movie_id": np.arange(1, len(TITLES) + 1), "title": TITLES})
+    writer.save_movies(movies)
+    writer.save_title_index(movies["title"])
+    writer.write_manifest()
+
+    ids = np.load(tmp_path / Artefactos.MOVIE_IDS)
+    titles = np.char.decode(np.load(tmp_path / Artefactos.TITLES), "utf-8")
+    saved = artifacts.load_title_index({"movie_id": ids, "title": titles}, tmp_path)
+    memory = search.TitleIndex.from_titles(ids, titles)
+    np.testing.assert_array_equal(saved.lengths, memory.lengths)
+    for query in ("dark", "the dark knight", "amelie", "leon", "full", "straße", "ñandú", TRUNCATED[:41]):
+        assert saved.search(query, 5) == memory.search(query, 5)
+
+
+def test_queries_longer_than_key():
+    # Las claves guardan 40 bytes: las búsquedas más largas no deben aceptar títulos que
+    # solo comparten esos primeros bytes (ni los primeros 39)
+    titles = np.array(["a" * 39 + "z end", "a" * 39 + "b", "a" * 39 + "bc more", "x " + "a" * 39 + "b tail",
+                       "a" * 40 + "q", "a" * 41 + " final"])
+    index = search.TitleIndex.from_titles(np.arange(len(titles)), titles)
+    assert [m for m, _ in index.search("a" * 39 + "b", 10)] == [1, 2, 3]
+    assert [m for m, _ in index.search("a" * 39 + "bc", 10)] == [2]
+    assert [m for m, _ in index.search("a" * 40, 10)] == [4, 5]
+    assert [m for m, _ in index.search("a" * 41, 10)] == [5]
+    assert [m for m, _ in index.search("a" * 40 + "q", 10)] == [4]
+    assert index.search("a" * 39 + "zz", 10) == []
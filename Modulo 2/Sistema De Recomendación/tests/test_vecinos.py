@@ -0,0 +1,89 @@
+# ------------------------------------------------------------
+# NeighborIndex (DataCleaner/Vecinos.py): la actualización incremental update()
+# debe dar el mismo índice que una construcción completa build() sobre la matriz nueva.
+#
+# Uso:
+#   python -m pytest -q tests
+# ------------------------------------------------------------
+import os                           # Ruta de DataCleaner
+import sys                          # Importar los módulos del constructor
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DataCleaner")
+if DATA_DIR not in sys.path:
+    sys.path.insert(0, DATA_DIR)
+
+from Vecinos import NeighborIndex
+
+K = 5
+
+
+def random_counts(n, vocab, seed):
+    """Matriz dispersa de pesos aleatorios (sin empates de similitud) y sin filas vacías."""
+    rng = np.random.default_rng(seed)
+    X = sp.random(n, vocab, density=0.3, format="lil", random_state=rng, dtype=np.float32)
+    for row in range(n):
+        X[row, rng.integers(vocab)] = rng.random() + 0.5
+    return X.tocsr()
+
+
+def assert_same(updated, built):
+    np.testing.assert_array_equal(updated.indices, built.indices)
+    np.testing.assert_allclose(updated.scores, built.scores, rtol=1e-5, atol=1e-6)
+
+
+def test_update_without_changes():
+    X = random_counts(40, 30, seed=0)
+    index = NeighborIndex.build(X, k=K)
+    assert_same(index.update(X, np.arange(40), [], k=K), index)
+
+
+def test_update_modified_rows():
+    X = random_counts(40, 30, seed=1)
+    index = NeighborIndex.build(X, k=K)
+    new = X.tolil()
+    changed = [3, 17, 29]
+    new[changed] = random_counts(3, 30, seed=2)
+    new = new.tocsr()
+    assert_same(index.update(new, np.arange(40), changed, k=K, block_size=7), NeighborIndex.build(new, k=K))
+
+
+def test_update_appended_rows():
+    X = random_counts(40, 30, seed=3)
+    index = NeighborIndex.build(X, k=K)
+    new = sp.vstack([X, random_counts(6, 30, seed=4)]).tocsr()
+    assert_same(index.update(new, np.arange(40), np.arange(40, 46), k=K, block_size=7),
+                NeighborIndex.build(new, k=K))
+
+
+@pytest.mark.parametrize("block_size", [1, 8, 1024])
+def test_update_deleted_reordered_and_changed(block_size):
+    X = random_counts(50, 30, seed=5)
+    index = NeighborIndex.build(X, k=K)
+
+    # Se eliminan 5 películas, las que quedan se barajan, una cambia y se agregan 4
+    rng = np.random.default_rng(6)
+    deleted = np.array([0, 12, 13, 30, 49])
+    kept = rng.permutation(np.setdiff1d(np.arange(50), deleted))
+    old_to_new = np.full(50, -1)
+    old_to_new[kept] = np.arange(len(kept))
+
+    new = X[kept].tolil()
+    new[10] = random_counts(1, 30, seed=7)
+    new = sp.vstack([new.tocsr(), random_counts(4, 30, seed=8)]).tocsr()
+    changed = [10] + list(range(len(kept), len(kept) + 4))
+
+    assert_same(index.update(new, old_to_new, changed, k=K, block_size=block_size),
+                NeighborIndex.build(new, k=K))
+
+
+def test_update_dense_embeddings():
+    rng = np.random.default_rng(9)
+    X = rng.standard_normal((30, 8)).astype(np.float32)
+    index = NeighborIndex.build(X, k=K)
+    new = np.vstack([X[1:], rng.standard_normal((3, 8)).astype(np.float32)])
+    new[4] = rng.standard_normal(8)
+    old_to_new = np.arange(-1, 29)                 # Se elimina la fila 0; el resto sube una posición
+    assert_same(index.update(new, old_to_new, [4, 29, 30, 31], k=K), NeighborIndex.build(new, k=K))